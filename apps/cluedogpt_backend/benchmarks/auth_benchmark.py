@@ -0,0 +1,60 @@
+"""
+Microbenchmark for JWT authentication: cached vs uncached get_current_user_from_jwt throughput.
+
+Usage:
+    python -m benchmarks.auth_benchmark [--iterations 20000]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+
+# Required settings without defaults; the benchmark never talks to the provider or the database
+os.environ.setdefault("API_HOST", "127.0.0.1")
+os.environ.setdefault("AI_MODEL_API_KEY", "benchmark")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-not-for-production")
+
+from starlette.requests import Request  # noqa: E402
+
+from cluedogpt_backend.auth.dependencies import get_current_user_from_jwt  # noqa: E402
+from cluedogpt_backend.auth.jwt_auth import create_access_token, verified_token_cache  # noqa: E402
+from cluedogpt_backend.dto.user import UserJwt  # noqa: E402
+
+
+def _request_with_token(token: str) -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": [(b"cookie", f"access_token={token}".encode())]})
+
+
+async def _measure(request: Request, iterations: int, cached: bool) -> float:
+    verified_token_cache.clear()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        if not cached:
+            verified_token_cache.clear()
+        await get_current_user_from_jwt(request, None)
+    elapsed = time.perf_counter() - start
+
+    return iterations / elapsed
+
+
+async def main(iterations: int) -> None:
+    token, _ = create_access_token(UserJwt(user_id="00000000-0000-0000-0000-000000000000", name="benchmark"))
+    request = _request_with_token(token)
+
+    uncached = await _measure(request, iterations, cached=False)
+    cached = await _measure(request, iterations, cached=True)
+
+    print(f"uncached: {uncached:>12,.0f} req/s")
+    print(f"cached:   {cached:>12,.0f} req/s")
+    print(f"speedup:  {cached / uncached:>12.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.iterations))
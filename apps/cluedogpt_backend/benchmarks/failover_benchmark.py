@@ -0,0 +1,171 @@
+"""
+Failover and hedging benchmark for the model provider routing, against two local fake providers.
+
+The primary provider gets injected faults (slow responses and 500s), the fallback is healthy. Each game setup
+runs the story and solution agents (both call a tool) and streams one game-master answer, entirely in memory.
+Every mode is run on fresh routing state:
+
+    single    the primary alone, as before provider routing existed
+    failover  primary then fallback, without hedging
+    hedged    primary then fallback, with hedging
+
+The report shows latency percentiles, failed setups, the calls each provider saw and the tool calls per setup,
+which must stay at exactly 2 however many providers were asked.
+
+Usage:
+    python -m benchmarks.failover_benchmark [--setups 100] [--concurrency 8] [--primary-slow-rate 0.1] [--primary-error-rate 0.05]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+
+from benchmarks.fake_provider import FakeProviderConfig, FakeProviderServer
+from benchmarks.load_test import _latency_summary
+
+
+MODES = ("single", "failover", "hedged")
+SETUP_REQUEST = "Write a short mystery set in a lighthouse."
+
+
+async def run_mode(mode: str, args: argparse.Namespace, primary: FakeProviderServer, fallback: FakeProviderServer) -> dict:
+    from cluedogpt_backend.ai.agents import solution_creator_agent, story_creator_agent, stream_game_master_answer
+    from cluedogpt_backend.ai.deps import GameAgentDeps
+    from cluedogpt_backend.ai.registry import agent_registry
+    from cluedogpt_backend.infrastructure.metrics import llm_hedged_requests_total, llm_provider_requests_total
+    from cluedogpt_backend.models.postgres_models import Game
+    from cluedogpt_backend.settings import ProviderSettings, settings
+
+    settings().ai_fallback_providers = [] if mode == "single" else [ProviderSettings(base_url=fallback.base_url, model_name="fake", api_key="benchmark", name="fallback")]
+    settings().ai_hedge_enabled = mode == "hedged"
+    settings().ai_hedge_min_delay_seconds = args.hedge_min_delay
+    settings().ai_hedge_max_delay_seconds = args.hedge_max_delay
+    # Rebuild the routed model, so circuit breakers and latency samples start empty
+    agent_registry.use_model(None)
+
+    primary_name = primary.base_url.split("/")[2]
+
+    def call_counts() -> dict[str, float]:
+        counts = {
+            f"{name}/{outcome}": llm_provider_requests_total.value(provider=provider, outcome=outcome)
+            for name, provider in (("primary", primary_name), ("fallback", "fallback"))
+            for outcome in ("success", "failure", "cancelled")
+        }
+        counts |= {f"hedge/{winner}": llm_hedged_requests_total.value(winner=winner) for winner in ("original", "hedge", "none")}
+        return counts
+
+    before = call_counts()
+
+    latencies_ms: list[float] = []
+    tool_calls: list[int] = []
+    failures = 0
+
+    async def setup() -> None:
+        nonlocal failures
+        deps = GameAgentDeps(game=Game(language="english", locale="us"))
+        start = time.perf_counter()
+        try:
+            await story_creator_agent().run(user_prompt=SETUP_REQUEST, deps=deps)
+            await solution_creator_agent().run(user_prompt=deps.game.story, deps=deps)
+            async for _ in stream_game_master_answer(deps.game, "Where was everyone at midnight?"):
+                pass
+        except Exception:  # noqa: BLE001
+            failures += 1
+            return
+        latencies_ms.append((time.perf_counter() - start) * 1000)
+        tool_calls.append(len(deps.tool_latencies_ms))
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def bounded() -> None:
+        async with semaphore:
+            await setup()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(bounded() for _ in range(args.setups)))
+    duration = time.perf_counter() - start
+
+    calls = {name: int(count - before[name]) for name, count in call_counts().items() if count != before[name]}
+
+    return {
+        "mode": mode,
+        "setups": args.setups,
+        "failures": failures,
+        "duration_s": round(duration, 3),
+        "latency_ms": _latency_summary(latencies_ms),
+        "tool_calls_per_setup": sorted(set(tool_calls)),
+        "calls": calls,
+    }
+
+
+async def main(args: argparse.Namespace) -> list[dict]:
+    primary = FakeProviderServer(
+        FakeProviderConfig(
+            latency_ms=args.latency_ms,
+            tokens_per_second=args.tokens_per_second,
+            completion_tokens=args.completion_tokens,
+            slow_rate=args.primary_slow_rate,
+            slow_latency_ms=args.primary_slow_latency_ms,
+            error_rate=args.primary_error_rate,
+        ),
+    )
+    fallback = FakeProviderServer(FakeProviderConfig(latency_ms=args.latency_ms, tokens_per_second=args.tokens_per_second, completion_tokens=args.completion_tokens))
+    primary.start()
+    fallback.start()
+
+    # Settings are read on first use, so the environment has to be in place before the app modules are used
+    os.environ["AI_PROVIDER_BASE_URL"] = primary.base_url
+    os.environ.setdefault("AI_MODEL_API_KEY", "benchmark")
+    os.environ.setdefault("API_HOST", "127.0.0.1")
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-not-for-production")
+
+    # Every injected fault logs a warning; the counts in the report say the same without the noise
+    logging.getLogger("cluedogpt").setLevel(logging.ERROR)
+
+    results = []
+    try:
+        for mode in args.modes:
+            result = await run_mode(mode, args, primary, fallback)
+            results.append(result)
+            print(
+                f"{mode:>9}  p50 {result['latency_ms']['p50']:>8.1f} ms  p95 {result['latency_ms']['p95']:>8.1f} ms  p99 {result['latency_ms']['p99']:>8.1f} ms  "
+                f"failures {result['failures']:>3}  tool calls/setup {result['tool_calls_per_setup']}",
+            )
+            for name, count in sorted(result["calls"].items()):
+                print(f"{'':>11}{name}: {count}")
+    finally:
+        primary.stop()
+        fallback.stop()
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modes", type=lambda value: [mode for mode in value.split(",") if mode], default=list(MODES), help=f"Comma-separated subset of {', '.join(MODES)}")
+    parser.add_argument("--setups", type=int, default=100, help="Game setups per mode")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Delay before the first token, for both providers")
+    parser.add_argument("--tokens-per-second", type=float, default=2000.0)
+    parser.add_argument("--completion-tokens", type=int, default=50)
+    parser.add_argument("--primary-slow-rate", type=float, default=0.1, help="Share of primary requests delayed by --primary-slow-latency-ms")
+    parser.add_argument("--primary-slow-latency-ms", type=float, default=3000.0)
+    parser.add_argument("--primary-error-rate", type=float, default=0.05, help="Share of primary requests answered with a 500")
+    parser.add_argument("--hedge-min-delay", type=float, default=0.2, help="Lower bound of the hedge delay, in seconds")
+    parser.add_argument("--hedge-max-delay", type=float, default=2.0, help="Hedge delay until enough latency samples exist, in seconds")
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    args = parser.parse_args()
+
+    unknown = set(args.modes) - set(MODES)
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(sorted(unknown))}")
+
+    results = asyncio.run(main(args))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+        print(f"Results written to {args.output}")
@@ -0,0 +1,216 @@
+"""
+Local stand-in for the OpenAI chat-completions API, for load tests that must not call a real model.
+
+Every response waits `latency_ms` before the first token and then emits tokens at `tokens_per_second`.
+Faults can be injected: a share of requests waits `slow_latency_ms` instead, and another share fails with a 500.
+When the request offers tools, the first tool is called with arguments generated from its JSON schema, cut to the
+maxLength of each string; once the conversation ends with a tool result, a short text answer closes the run.
+
+Usage:
+    python -m benchmarks.fake_provider [--port 8100] [--latency-ms 300] [--tokens-per-second 80] [--slow-rate 0.1] [--error-rate 0.05]
+
+Then point the backend at it with AI_PROVIDER_BASE_URL=http://127.0.0.1:8100/v1.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+import uuid
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+FILLER_WORDS = "the butler waited in the library while rain hit the windows of the old manor".split()
+
+
+@dataclass
+class FakeProviderConfig:
+    latency_ms: float = 300.0
+    tokens_per_second: float = 80.0
+    # Length of the first string argument of a tool call (the story, for create_story) and of plain text answers
+    completion_tokens: int = 200
+    tool_calls: bool = True
+    # Share of requests that wait slow_latency_ms instead of latency_ms, and share answered with a 500 after the latency
+    slow_rate: float = 0.0
+    slow_latency_ms: float = 5000.0
+    error_rate: float = 0.0
+
+
+def _filler(tokens: int) -> str:
+    return " ".join(FILLER_WORDS[i % len(FILLER_WORDS)] for i in range(tokens))
+
+
+def _arguments_from_schema(schema: dict[str, Any], config: FakeProviderConfig, definitions: dict[str, Any] | None = None) -> dict[str, Any]:
+    definitions = schema.get("$defs", {}) if definitions is None else definitions
+    arguments: dict[str, Any] = {}
+    long_field_used = False
+
+    for name, prop in schema.get("properties", {}).items():
+        if "$ref" in prop:
+            prop = definitions[prop["$ref"].rsplit("/", 1)[-1]]
+
+        match prop.get("type"):
+            case "string":
+                text = _filler(3 if long_field_used else config.completion_tokens)
+                arguments[name] = text[: prop["maxLength"]].rstrip() if "maxLength" in prop else text
+                long_field_used = True
+            case "integer" | "number":
+                arguments[name] = 1
+            case "boolean":
+                arguments[name] = True
+            case "array":
+                items = prop.get("items", {})
+                if "$ref" in items:
+                    items = definitions[items["$ref"].rsplit("/", 1)[-1]]
+                # One element: enough for structured outputs that wrap a list of objects
+                arguments[name] = [_arguments_from_schema(items, config, definitions)] if items.get("type") == "object" else []
+            case _:
+                arguments[name] = _arguments_from_schema(prop, config, definitions)
+
+    return arguments
+
+
+def _plan_reply(body: dict[str, Any], config: FakeProviderConfig) -> tuple[str | None, str]:
+    """Return (tool name, content): the tool to call with its JSON arguments, or (None, text) for a text answer."""
+    messages = body.get("messages", [])
+    tools = body.get("tools") or []
+
+    if config.tool_calls and tools and not (messages and messages[-1].get("role") == "tool"):
+        function = tools[0]["function"]
+        return function["name"], json.dumps(_arguments_from_schema(function.get("parameters", {}), config))
+
+    return None, "Done." if messages and messages[-1].get("role") == "tool" else _filler(config.completion_tokens)
+
+
+def _usage(body: dict[str, Any], completion: str) -> dict[str, int]:
+    prompt_tokens = sum(len(str(message.get("content") or "").split()) for message in body.get("messages", []))
+    completion_tokens = len(completion.split())
+
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens}
+
+
+def _chunks(content: str) -> list[str]:
+    """Split content into token-sized pieces that concatenate back to it."""
+    words = content.split(" ")
+    return [word + " " for word in words[:-1]] + [words[-1]]
+
+
+def create_app(config: FakeProviderConfig) -> FastAPI:
+    app = FastAPI(title="Fake OpenAI-compatible provider")
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        tool_name, content = _plan_reply(body, config)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+        model = body.get("model", "fake-model")
+        usage = _usage(body, content)
+        token_delay = 1 / config.tokens_per_second
+
+        await asyncio.sleep((config.slow_latency_ms if random.random() < config.slow_rate else config.latency_ms) / 1000)  # noqa: S311
+
+        if random.random() < config.error_rate:  # noqa: S311
+            return JSONResponse({"error": {"message": "Injected fault", "type": "server_error"}}, status_code=500)
+
+        if not body.get("stream"):
+            await asyncio.sleep(usage["completion_tokens"] * token_delay)
+            if tool_name:
+                message = {"role": "assistant", "content": None, "tool_calls": [{"id": f"call_{uuid.uuid4().hex}", "type": "function", "function": {"name": tool_name, "arguments": content}}]}
+            else:
+                message = {"role": "assistant", "content": content}
+
+            return JSONResponse(
+                {
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "message": message, "finish_reason": "tool_calls" if tool_name else "stop"}],
+                    "usage": usage,
+                },
+            )
+
+        def chunk(delta: dict[str, Any], finish_reason: str | None = None, **extra: Any) -> str:
+            payload = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model, "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}], **extra}
+            return f"data: {json.dumps(payload)}\n\n"
+
+        async def events() -> AsyncIterator[str]:
+            if tool_name:
+                yield chunk({"role": "assistant", "tool_calls": [{"index": 0, "id": f"call_{uuid.uuid4().hex}", "type": "function", "function": {"name": tool_name, "arguments": ""}}]})
+            else:
+                yield chunk({"role": "assistant", "content": ""})
+
+            for piece in _chunks(content):
+                await asyncio.sleep(token_delay)
+                yield chunk({"tool_calls": [{"index": 0, "function": {"arguments": piece}}]} if tool_name else {"content": piece})
+
+            yield chunk({}, "tool_calls" if tool_name else "stop", usage=usage)
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+class FakeProviderServer:
+    """Runs the fake provider with uvicorn on a background thread, so it does not share the event loop under test."""
+
+    def __init__(self, config: FakeProviderConfig, host: str = "127.0.0.1", port: int = 0) -> None:
+        self._server = uvicorn.Server(uvicorn.Config(create_app(config), host=host, port=port, log_level="warning"))
+        self._thread = threading.Thread(target=self._server.run, name="fake-provider", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.servers[0].sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> None:
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        self._thread.join()
+
+
+def add_provider_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = FakeProviderConfig()
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms, help="Delay before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=defaults.tokens_per_second)
+    parser.add_argument("--completion-tokens", type=int, default=defaults.completion_tokens, help="Tokens in the story argument and in text answers")
+    parser.add_argument("--slow-rate", type=float, default=defaults.slow_rate, help="Share of requests delayed by --slow-latency-ms instead")
+    parser.add_argument("--slow-latency-ms", type=float, default=defaults.slow_latency_ms)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="Share of requests answered with a 500")
+    parser.add_argument("--no-tool-calls", dest="tool_calls", action="store_false", help="Always answer with text, even when tools are offered")
+
+
+def config_from_arguments(args: argparse.Namespace) -> FakeProviderConfig:
+    return FakeProviderConfig(
+        latency_ms=args.latency_ms,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        tool_calls=args.tool_calls,
+        slow_rate=args.slow_rate,
+        slow_latency_ms=args.slow_latency_ms,
+        error_rate=args.error_rate,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    add_provider_arguments(parser)
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(config_from_arguments(args)), host=args.host, port=args.port)
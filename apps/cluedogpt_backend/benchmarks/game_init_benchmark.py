@@ -0,0 +1,112 @@
+"""
+Story and solution generation benchmark: the two-stage agents against the single-call agent, on a local fake provider.
+
+Each game is generated the way the warm pool does it (no database), with GAME_INIT_SINGLE_CALL off and then on.
+The report shows latency percentiles, model requests and input/output tokens per game for each mode, as counted by
+the agent metrics. The fake provider counts one token per word, so token numbers compare the modes, not real models.
+
+Usage:
+    python -m benchmarks.game_init_benchmark [--games 50] [--concurrency 4] [--latency-ms 300] [--tokens-per-second 80]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from benchmarks.fake_provider import FakeProviderServer, add_provider_arguments, config_from_arguments
+from benchmarks.load_test import _latency_summary
+
+
+MODES = ("two-stage", "single-call")
+AGENTS = ("story_creator", "solution_creator", "story_and_solution_creator")
+
+
+def _agent_totals() -> dict[str, float]:
+    from cluedogpt_backend.infrastructure.metrics import agent_model_requests_total, agent_tokens_total
+
+    return {
+        "requests": sum(agent_model_requests_total.value(agent=agent) for agent in AGENTS),
+        "input_tokens": sum(agent_tokens_total.value(agent=agent, kind="input") for agent in AGENTS),
+        "output_tokens": sum(agent_tokens_total.value(agent=agent, kind="output") for agent in AGENTS),
+    }
+
+
+async def run_mode(mode: str, games: int, concurrency: int) -> dict:
+    from cluedogpt_backend.ai.agents import generate_warm_game
+    from cluedogpt_backend.settings import settings
+
+    settings().game_init_single_call = mode == "single-call"
+
+    latencies_ms: list[float] = []
+    incomplete = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def generate() -> None:
+        nonlocal incomplete
+        async with semaphore:
+            start = time.perf_counter()
+            game = await generate_warm_game("english", "us")
+            latencies_ms.append((time.perf_counter() - start) * 1000)
+            if not (game.story and game.culprit and game.weapon and game.motive):
+                incomplete += 1
+
+    before = _agent_totals()
+    start = time.perf_counter()
+    await asyncio.gather(*(generate() for _ in range(games)))
+    duration = time.perf_counter() - start
+    totals = {name: value - before[name] for name, value in _agent_totals().items()}
+
+    return {
+        "mode": mode,
+        "games": games,
+        "incomplete": incomplete,
+        "duration_s": round(duration, 3),
+        "latency_ms": _latency_summary(latencies_ms),
+        "requests_per_game": round(totals["requests"] / games, 2),
+        "input_tokens_per_game": round(totals["input_tokens"] / games, 1),
+        "output_tokens_per_game": round(totals["output_tokens"] / games, 1),
+    }
+
+
+async def main(args: argparse.Namespace) -> list[dict]:
+    provider = FakeProviderServer(config_from_arguments(args))
+    provider.start()
+
+    # Settings are read on first use, so the environment has to be in place before the app modules are used
+    os.environ["AI_PROVIDER_BASE_URL"] = provider.base_url
+    os.environ.setdefault("AI_MODEL_API_KEY", "benchmark")
+    os.environ.setdefault("API_HOST", "127.0.0.1")
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-not-for-production")
+
+    results = []
+    try:
+        for mode in MODES:
+            result = await run_mode(mode, args.games, args.concurrency)
+            results.append(result)
+            print(
+                f"{mode:>11}  p50 {result['latency_ms']['p50']:>8.1f} ms  p95 {result['latency_ms']['p95']:>8.1f} ms  "
+                f"{result['requests_per_game']:>4.1f} requests/game  {result['input_tokens_per_game']:>7.1f} in + {result['output_tokens_per_game']:>6.1f} out tokens/game  "
+                f"incomplete {result['incomplete']}",
+            )
+    finally:
+        provider.stop()
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=50, help="Games generated per mode")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    add_provider_arguments(parser)
+    args = parser.parse_args()
+
+    results = asyncio.run(main(args))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+        print(f"Results written to {args.output}")
@@ -0,0 +1,151 @@
+"""
+Game room fan-out benchmark: one room, many connected players, some of them too slow to keep up.
+
+Everything runs in memory: the WebSockets are stand-ins whose sends take --send-ms (or --slow-send-ms for the slow
+players), and events are published straight to the room manager, without a database or the notify bridge.
+The report shows what publishing costs (per event, against serializing it once per player), how quickly the
+other players receive each event, and how many slow players were disconnected, and why.
+
+Usage:
+    python -m benchmarks.game_rooms_benchmark [--players 1000] [--slow-players 10] [--events 200] [--events-per-second 50]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+from datetime import UTC, datetime
+
+from benchmarks.load_test import _latency_summary
+
+
+class FakeWebSocket:
+    """Just enough of starlette's WebSocket for the room manager; records when each message arrived."""
+
+    def __init__(self, send_seconds: float) -> None:
+        self.send_seconds = send_seconds
+        self.received: dict[str, float] = {}
+        self.close_code: int | None = None
+        self._closed = asyncio.Event()
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_text(self, message: str) -> None:
+        await asyncio.sleep(self.send_seconds)
+        self.received[message] = time.perf_counter()
+
+    async def receive(self) -> dict:
+        await self._closed.wait()
+        return {"type": "websocket.disconnect", "code": 1000}
+
+    async def close(self, code: int = 1000, reason: str | None = None) -> None:
+        self.close_code = code
+        self._closed.set()
+
+    def disconnect(self) -> None:
+        self._closed.set()
+
+
+async def main(args: argparse.Namespace) -> dict:
+    os.environ.setdefault("AI_MODEL_API_KEY", "benchmark")
+    os.environ.setdefault("API_HOST", "127.0.0.1")
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-not-for-production")
+
+    from cluedogpt_backend.api.api_contracts.responses.game_event_response import GameEvent, GameEventType
+    from cluedogpt_backend.api.api_contracts.responses.game_question_response import GameQuestionResponse
+    from cluedogpt_backend.infrastructure.metrics import ws_disconnects_total
+    from cluedogpt_backend.models.postgres_models import QAStatus
+    from cluedogpt_backend.services.game_rooms import GameRoomManager
+    from cluedogpt_backend.settings import settings
+
+    settings().ws_send_queue_size = args.queue_size
+    settings().ws_send_timeout_seconds = args.send_timeout
+
+    rooms = GameRoomManager()
+    game_id = str(uuid.uuid4())
+    sockets = [FakeWebSocket(args.slow_send_ms / 1000 if i < args.slow_players else args.send_ms / 1000) for i in range(args.players)]
+    sessions = [asyncio.create_task(rooms.serve(game_id, str(uuid.uuid4()), socket)) for socket in sockets]
+    await asyncio.sleep(0)
+
+    answer = " ".join(["The butler says he was in the pantry all evening."] * 8)
+    events = [
+        GameEvent(
+            type=GameEventType.QUESTION_ANSWERED,
+            game_id=game_id,
+            data=GameQuestionResponse(
+                question_id=str(uuid.uuid4()),
+                game_id=game_id,
+                player_id=str(uuid.uuid4()),
+                question=f"Question {i}: where was the butler?",
+                answer=answer,
+                status=QAStatus.ANSWERED,
+                asked_at=datetime.now(UTC),
+                answered_at=datetime.now(UTC),
+            ),
+        )
+        for i in range(args.events)
+    ]
+
+    # What publishing would cost if each player's copy were serialized on its own
+    start = time.perf_counter()
+    for _ in range(args.players):
+        events[0].model_dump_json()
+    per_player_serialization_ms = (time.perf_counter() - start) * 1000
+
+    published_at: dict[str, float] = {}
+    publish_ms: list[float] = []
+    for event in events:
+        start = time.perf_counter()
+        rooms.publish(event)
+        publish_ms.append((time.perf_counter() - start) * 1000)
+        published_at[event.model_dump_json()] = start
+        await asyncio.sleep(1 / args.events_per_second)
+
+    # Let the fast players drain their queues
+    await asyncio.sleep(args.send_ms / 1000 * args.queue_size + 0.5)
+
+    delivery_ms = [(received - published_at[message]) * 1000 for socket in sockets[args.slow_players :] for message, received in socket.received.items()]
+    complete = sum(len(socket.received) == args.events for socket in sockets[args.slow_players :])
+    connected = rooms.connections(game_id)
+
+    for socket in sockets:
+        socket.disconnect()
+    await asyncio.gather(*sessions)
+
+    return {
+        "players": args.players,
+        "slow_players": args.slow_players,
+        "events": args.events,
+        "publish_ms": _latency_summary(publish_ms),
+        "per_player_serialization_ms": round(per_player_serialization_ms, 2),
+        "delivery_ms": _latency_summary(delivery_ms),
+        "fast_players_with_every_event": complete,
+        "still_connected": connected,
+        "disconnects": {reason: int(ws_disconnects_total.value(reason=reason)) for reason in ("slow_consumer", "send_timeout")},
+        "slow_players_closed_with_1013": sum(socket.close_code == 1013 for socket in sockets[: args.slow_players]),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--slow-players", type=int, default=10, help="Players whose sends take --slow-send-ms")
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--events-per-second", type=float, default=50.0)
+    parser.add_argument("--send-ms", type=float, default=1.0, help="Time one send takes for the other players")
+    parser.add_argument("--slow-send-ms", type=float, default=2000.0)
+    parser.add_argument("--queue-size", type=int, default=64, help="WS_SEND_QUEUE_SIZE")
+    parser.add_argument("--send-timeout", type=float, default=10.0, help="WS_SEND_TIMEOUT_SECONDS")
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    args = parser.parse_args()
+
+    result = asyncio.run(main(args))
+    print(json.dumps(result, indent=2))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2)
+        print(f"Results written to {args.output}")
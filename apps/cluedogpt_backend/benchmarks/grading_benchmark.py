@@ -0,0 +1,93 @@
+"""
+Benchmark for the deterministic proposal grader on a labelled corpus of guesses.
+
+Reports how many guesses are decided without the model, how many of those decisions are wrong
+(accepted wrong guesses and rejected right ones), and grading throughput.
+With --sweep, the same report is printed for a grid of accept/reject thresholds.
+
+Usage:
+    python -m benchmarks.grading_benchmark [--accept 0.85] [--reject 0.4] [--sweep] [--corpus benchmarks/data/grading_corpus.jsonl]
+"""
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+
+# Required settings without defaults; the benchmark never talks to the provider or the database
+os.environ.setdefault("API_HOST", "127.0.0.1")
+os.environ.setdefault("AI_MODEL_API_KEY", "benchmark")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-not-for-production")
+
+from cluedogpt_backend.services.proposal_grading import Verdict, grade_field  # noqa: E402
+
+
+DEFAULT_CORPUS = Path(__file__).parent / "data" / "grading_corpus.jsonl"
+
+
+def load_corpus(path: Path) -> list[dict]:
+    with path.open(encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def evaluate(corpus: list[dict], accept: float, reject: float) -> dict:
+    verdicts = [grade_field(case["guess"], case["solution"], accept, reject).verdict for case in corpus]
+
+    decided = [(case, verdict) for case, verdict in zip(corpus, verdicts, strict=True) if verdict != Verdict.AMBIGUOUS]
+    false_accepts = [case for case, verdict in decided if verdict == Verdict.CORRECT and not case["correct"]]
+    false_rejects = [case for case, verdict in decided if verdict == Verdict.INCORRECT and case["correct"]]
+
+    return {
+        "cases": len(corpus),
+        "decided": len(decided),
+        "ambiguous": len(corpus) - len(decided),
+        "false_accepts": false_accepts,
+        "false_rejects": false_rejects,
+    }
+
+
+def _print_summary(accept: float, reject: float, result: dict) -> None:
+    decided_pct = result["decided"] / result["cases"] * 100
+    print(
+        f"accept {accept:.2f} reject {reject:.2f}  decided {result['decided']:>3}/{result['cases']} ({decided_pct:5.1f}%)  "
+        f"model calls {result['ambiguous']:>3}  false accepts {len(result['false_accepts']):>2}  false rejects {len(result['false_rejects']):>2}",
+    )
+
+
+def throughput(corpus: list[dict], accept: float, reject: float, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for case in corpus:
+            grade_field(case["guess"], case["solution"], accept, reject)
+
+    return iterations * len(corpus) / (time.perf_counter() - start)
+
+
+def main(args: argparse.Namespace) -> None:
+    corpus = load_corpus(Path(args.corpus))
+
+    if args.sweep:
+        for accept in (0.8, 0.85, 0.9, 0.95):
+            for reject in (0.3, 0.4, 0.5, 0.6):
+                _print_summary(accept, reject, evaluate(corpus, accept, reject))
+        return
+
+    result = evaluate(corpus, args.accept, args.reject)
+    _print_summary(args.accept, args.reject, result)
+    for label, cases in (("false accept", result["false_accepts"]), ("false reject", result["false_rejects"])):
+        for case in cases:
+            print(f"  {label}: {case['field']} {case['guess']!r} for {case['solution']!r}")
+
+    print(f"throughput: {throughput(corpus, args.accept, args.reject, args.iterations):>12,.0f} grades/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS), help="JSON lines with field, solution, guess and the expected correct flag")
+    parser.add_argument("--accept", type=float, default=0.85, help="Similarity at or above which a guess is correct")
+    parser.add_argument("--reject", type=float, default=0.4, help="Similarity below which a guess is wrong")
+    parser.add_argument("--sweep", action="store_true", help="Evaluate a grid of thresholds instead")
+    parser.add_argument("--iterations", type=int, default=200, help="Passes over the corpus when measuring throughput")
+    main(parser.parse_args())
@@ -0,0 +1,79 @@
+"""
+Import-time budget check for the API entrypoint, based on `python -X importtime`.
+
+Imports `cluedogpt_backend.api.main` in a fresh interpreter a few times, keeps the fastest run, and exits
+with status 1 when its cumulative import time is over the budget.
+
+Usage:
+    python -m benchmarks.import_time_benchmark [--budget-ms 1500] [--runs 3] [--top 10]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+TARGET_MODULE = "cluedogpt_backend.api.main"
+
+
+def _parse_importtime(stderr: str) -> dict[str, tuple[int, int]]:
+    """Map module name -> (self us, cumulative us) from `-X importtime` output."""
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+
+        self_us, cumulative_us, module = (part.strip() for part in line.removeprefix("import time:").split("|"))
+        timings[module] = (int(self_us), int(cumulative_us))
+
+    return timings
+
+
+def _measure() -> dict[str, tuple[int, int]]:
+    env = {
+        # Required settings without defaults; importing must not need real values
+        "API_HOST": "127.0.0.1",
+        "AI_MODEL_API_KEY": "import-time-benchmark",
+        "JWT_SECRET_KEY": "import-time-benchmark",
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([str(ROOT_DIR), str(ROOT_DIR / "cluedogpt_backend")]),
+    }
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {TARGET_MODULE}"],
+        cwd=ROOT_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    return _parse_importtime(result.stderr)
+
+
+def main(budget_ms: float, runs: int, top: int) -> int:
+    timings = min((_measure() for _ in range(runs)), key=lambda run: run[TARGET_MODULE][1])
+    total_ms = timings[TARGET_MODULE][1] / 1000
+
+    print(f"Slowest modules by self time ({TARGET_MODULE}):")
+    for module, (self_us, cumulative_us) in sorted(timings.items(), key=lambda item: item[1][0], reverse=True)[:top]:
+        print(f"  {self_us / 1000:>8.1f} ms self  {cumulative_us / 1000:>8.1f} ms cumulative  {module.strip()}")
+
+    print(f"\n{TARGET_MODULE}: {total_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+    if total_ms > budget_ms:
+        print("Import time is over budget")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=1500)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    sys.exit(main(args.budget_ms, args.runs, args.top))
@@ -0,0 +1,284 @@
+"""
+Load test for /auth/sign-up and /api/v1/game-init/iteration against a local fake model provider.
+
+The app runs in-process (with its lifespan, job workers and the configured Postgres database) and is driven
+through an ASGI transport; the fake provider runs on its own thread. Each scenario is run once per concurrency
+level, and the report (p50/p95/p99 latency, throughput, DB queries) is written as JSON so runs can be compared.
+Game init jobs are polled until they finish; a failed job counts as an error and job_latency_ms covers the generation.
+
+Point POSTGRES_DSN at a throwaway database: the schema is generated if missing and rows are never cleaned up.
+
+Usage:
+    python -m benchmarks.load_test [--concurrency 1,8,32] [--requests 200] [--output report.json] [--compare baseline.json]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict
+from datetime import UTC, datetime
+
+import httpx
+
+from benchmarks.fake_provider import FakeProviderServer, add_provider_arguments, config_from_arguments
+
+
+SCENARIOS = ("sign-up", "game-init")
+JOB_POLL_INTERVAL_SECONDS = 0.05
+
+
+class QueryCounter(logging.Handler):
+    """Counts the queries Tortoise logs on `tortoise.db_client` (one DEBUG record per statement sent)."""
+
+    def __init__(self) -> None:
+        super().__init__(logging.DEBUG)
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if not record.msg.startswith(("Created connection", "Closed connection")):
+            self.count += 1
+
+    def install(self) -> None:
+        db_logger = logging.getLogger("tortoise.db_client")
+        db_logger.setLevel(logging.DEBUG)
+        db_logger.propagate = False
+        db_logger.addHandler(self)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def _latency_summary(latencies_ms: list[float]) -> dict[str, float]:
+    return {
+        "p50": round(percentile(latencies_ms, 50), 2),
+        "p95": round(percentile(latencies_ms, 95), 2),
+        "p99": round(percentile(latencies_ms, 99), 2),
+        "mean": round(sum(latencies_ms) / len(latencies_ms), 2) if latencies_ms else 0.0,
+        "max": round(max(latencies_ms, default=0.0), 2),
+    }
+
+
+async def _drive(requests: int, concurrency: int, send: Callable[[int], Awaitable[httpx.Response]]) -> tuple[list[float], list[httpx.Response], int]:
+    """Send `requests` requests from `concurrency` workers. Returns latencies (ms), successful responses and the error count."""
+    latencies_ms: list[float] = []
+    responses: list[httpx.Response] = []
+    errors = 0
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal errors, next_index
+        while next_index < requests:
+            index = next_index
+            next_index += 1
+
+            start = time.perf_counter()
+            try:
+                response = await send(index)
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies_ms.append((time.perf_counter() - start) * 1000)
+
+            if response.is_success:
+                responses.append(response)
+            else:
+                errors += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    return latencies_ms, responses, errors
+
+
+async def _wait_for_job(client: httpx.AsyncClient, job_id: str, headers: dict[str, str]) -> dict:
+    """Poll a game init job through the API until it is done or failed."""
+    from cluedogpt_backend.models.postgres_models import JobStatus
+
+    while True:
+        job = (await client.get(f"/api/v1/game-init/jobs/{job_id}", headers=headers)).raise_for_status().json()
+        if job["status"] in (JobStatus.DONE, JobStatus.FAILED):
+            return job
+
+        await asyncio.sleep(JOB_POLL_INTERVAL_SECONDS)
+
+
+def _job_latency_ms(job: dict) -> float:
+    return (datetime.fromisoformat(job["finished_at"]) - datetime.fromisoformat(job["created_at"])).total_seconds() * 1000
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: str, concurrency: int, requests: int, counter: QueryCounter) -> dict:
+    from cluedogpt_backend.models.postgres_models import JobStatus
+    from cluedogpt_backend.services.game_init_jobs import game_init_job_queue
+
+    run_id = f"{scenario}-{concurrency}-{int(time.time())}"
+
+    async def sign_up(index: int) -> httpx.Response:
+        return await client.post("/auth/sign-up", json={"username": f"{run_id}-{index}"})
+
+    async def game_init(index: int) -> httpx.Response:
+        return await client.post(
+            "/api/v1/game-init/iteration",
+            json={"title": f"{run_id}-{index}", "message": f"A murder at the manor, variant {index}"},
+            headers=headers,
+        )
+
+    if scenario == "game-init":
+        access_token = (await sign_up(-1)).raise_for_status().json()["access_token"]
+        headers = {"Cookie": f"access_token={access_token}"}
+
+    counter.count = 0
+    start = time.perf_counter()
+    latencies_ms, responses, errors = await _drive(requests, concurrency, sign_up if scenario == "sign-up" else game_init)
+    duration = time.perf_counter() - start
+
+    result = {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(requests / duration, 2),
+        "latency_ms": _latency_summary(latencies_ms),
+    }
+
+    if scenario == "game-init":
+        # The endpoint only enqueues; wait for the workers so their queries are part of the run, then follow every
+        # job to its end (jobs put back on the queue for a locked game finish later), counting failed jobs as errors
+        await game_init_job_queue.join()
+        queries = counter.count
+        jobs = await asyncio.gather(*(_wait_for_job(client, response.json()["job_id"], headers) for response in responses))
+        drained = time.perf_counter() - start
+
+        done = [job for job in jobs if job["status"] == JobStatus.DONE]
+        result["errors"] += len(jobs) - len(done)
+        result["jobs_done"] = len(done)
+        result["jobs_failed"] = len(jobs) - len(done)
+        result["jobs_per_second"] = round(len(done) / drained, 2)
+        result["job_latency_ms"] = _latency_summary([_job_latency_ms(job) for job in done])
+    else:
+        queries = counter.count
+
+    result["db_queries"] = queries
+    result["db_queries_per_request"] = round(queries / requests, 2)
+
+    return result
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()  # noqa: S607
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report: dict, baseline: dict) -> None:
+    """Print the p95 latency and throughput change of every scenario/concurrency pair present in both reports."""
+    previous = {(result["scenario"], result["concurrency"]): result for result in baseline["results"]}
+
+    for result in report["results"]:
+        before = previous.get((result["scenario"], result["concurrency"]))
+        if before is None:
+            continue
+
+        p95_change = (result["latency_ms"]["p95"] / before["latency_ms"]["p95"] - 1) * 100 if before["latency_ms"]["p95"] else 0.0
+        rps_change = (result["throughput_rps"] / before["throughput_rps"] - 1) * 100 if before["throughput_rps"] else 0.0
+        print(f"{result['scenario']:>10} c={result['concurrency']:<4} p95 {p95_change:+7.1f}%  throughput {rps_change:+7.1f}%")
+
+
+async def main(args: argparse.Namespace) -> dict:
+    provider_config = config_from_arguments(args)
+    provider = FakeProviderServer(provider_config)
+    provider.start()
+
+    # Settings are read on first use, so the environment has to be in place before the app is imported
+    os.environ["AI_PROVIDER_BASE_URL"] = provider.base_url
+    os.environ.setdefault("AI_MODEL_API_KEY", "benchmark")
+    os.environ.setdefault("API_HOST", "127.0.0.1")
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-not-for-production")
+    # Measure the cold path: no pre-generated games and no replayed model responses
+    os.environ.setdefault("WARM_POOL_SIZE", "0")
+    os.environ.setdefault("AGENT_CACHE_ENABLED", "false")
+    # Every game-init request comes from one player, and the requests measure the app rather than admission control:
+    # no per-player rate limit, and a wait queue for model slots that the benchmark's concurrency never fills
+    os.environ.setdefault("PLAYER_RATE_LIMIT_PER_MINUTE", "0")
+    os.environ.setdefault("LLM_MAX_QUEUE", str(max(args.concurrency) + args.requests))
+
+    from tortoise import Tortoise
+
+    from cluedogpt_backend.api.main import app
+    from cluedogpt_backend.infrastructure.postgres_db import init_db
+
+    counter = QueryCounter()
+    results = []
+
+    try:
+        # The job workers query their table on startup, so the schema has to exist before the lifespan runs
+        await init_db()
+        await Tortoise.generate_schemas(safe=True)
+        await Tortoise.close_connections()
+
+        async with app.router.lifespan_context(app):
+            counter.install()
+
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=60) as client:
+                for scenario in args.scenarios:
+                    for concurrency in args.concurrency:
+                        result = await run_scenario(client, scenario, concurrency, args.requests, counter)
+                        results.append(result)
+                        print(
+                            f"{scenario:>10} c={concurrency:<4} {result['throughput_rps']:>9.1f} req/s  "
+                            f"p50 {result['latency_ms']['p50']:>8.1f} ms  p95 {result['latency_ms']['p95']:>8.1f} ms  p99 {result['latency_ms']['p99']:>8.1f} ms  "
+                            f"{result['db_queries_per_request']:>5.1f} queries/req  errors {result['errors']}",
+                        )
+    finally:
+        await Tortoise.close_connections()
+        provider.stop()
+
+    return {
+        "created_at": datetime.now(UTC).isoformat(),
+        "git_commit": _git_commit(),
+        "provider": asdict(provider_config),
+        "results": results,
+    }
+
+
+def _csv(cast: Callable[[str], object]) -> Callable[[str], list]:
+    return lambda value: [cast(item) for item in value.split(",") if item]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", type=_csv(str), default=list(SCENARIOS), help=f"Comma-separated subset of {', '.join(SCENARIOS)}")
+    parser.add_argument("--concurrency", type=_csv(int), default=[1, 8, 32], help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario and concurrency level")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="Print the change against a previous JSON report")
+    add_provider_arguments(parser)
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    report = asyncio.run(main(args))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"Report written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            compare(report, json.load(file))
@@ -1,62 +1,509 @@
-from ai.deps import GameAgentDeps
-from ai.tools import create_solution, create_story
-from models.postgres_models import Game
-from pydantic_ai import Agent, AgentRunResult, Tool
-from pydantic_ai.models.openai import OpenAIChatModel
-from pydantic_ai.providers.openai import OpenAIProvider
-
-from cluedogpt_backend.ai.prompts import GAME_DESCRIPTION, SOLUTION_CREATOR, STORY_CREATOR
-from cluedogpt_backend.settings import settings
+import asyncio
+import time
+from collections.abc import AsyncIterator, Callable
 
+from pydantic_ai import Agent, AgentRunResult, AgentRunResultEvent, RunContext, Tool, ToolOutput
+from pydantic_ai.exceptions import UnexpectedModelBehavior
+from pydantic_ai.messages import AgentStreamEvent, ModelMessage, ModelResponse, PartDeltaEvent, PartStartEvent, ToolCallPart, ToolCallPartDelta
+from pydantic_ai.models import Model
+from pydantic_core import from_json
 
-model = OpenAIChatModel(
-    model_name=settings().ai_model_name,
-    provider=OpenAIProvider(
-        base_url=settings().ai_provider_base_url,
-        api_key=settings().ai_model_api_key,
-    ),
+from cluedogpt_backend.ai.cache import AgentRunCache, get_agent_run_cache, replay_model
+from cluedogpt_backend.ai.deps import GameAgentDeps, run_usage_fields
+from cluedogpt_backend.ai.history import append_messages, estimate_tokens, get_conversation, load_replayable_messages, next_message_idx, to_model_messages
+from cluedogpt_backend.ai.prompts import (
+    GAME_DESCRIPTION,
+    GAME_MASTER,
+    GAME_MASTER_BATCH_REQUEST,
+    GAME_MASTER_CONTEXT,
+    HISTORY_SUMMARIZER,
+    PROPOSAL_JUDGE,
+    SOLUTION_CREATOR,
+    STORY_AND_SOLUTION_CREATOR,
+    STORY_CREATOR,
+    WARM_POOL_STORY_REQUEST,
 )
+from cluedogpt_backend.ai.registry import agent_registry
+from cluedogpt_backend.ai.tools import create_solution, create_story, create_story_and_solution
+from cluedogpt_backend.app_logging import logger
+from cluedogpt_backend.dto.game_master_answers import GameMasterAnswers
+from cluedogpt_backend.dto.proposal_judgement import ProposalJudgement
+from cluedogpt_backend.infrastructure.metrics import record_agent_run
+from cluedogpt_backend.models.postgres_models import ConversationRole, Game
+from cluedogpt_backend.settings import settings
+
+
+STORY_CREATOR_PROMPT = STORY_CREATOR.format(game_description=GAME_DESCRIPTION)
+SOLUTION_CREATOR_PROMPT = SOLUTION_CREATOR.format(game_description=GAME_DESCRIPTION)
+STORY_AND_SOLUTION_CREATOR_PROMPT = STORY_AND_SOLUTION_CREATOR.format(game_description=GAME_DESCRIPTION)
+GAME_MASTER_PROMPT = GAME_MASTER.format(game_description=GAME_DESCRIPTION)
+
+
+# Agents are built lazily by the registry, so importing this module needs neither settings nor an API key
+def _build_story_creator_agent(model: Model) -> Agent:
+    return Agent(
+        model=model,
+        name="story_creator",
+        tools=[
+            Tool(
+                function=create_story,
+                description="Create a story",
+                takes_ctx=True,
+            ),
+        ],
+        # Instructions (unlike system prompts) are sent on every run, including runs that replay message history
+        instructions=STORY_CREATOR_PROMPT,
+        deps_type=GameAgentDeps,
+    )
+
+
+def _build_history_summarizer_agent(model: Model) -> Agent:
+    return Agent(
+        model=model,
+        name="history_summarizer",
+        instructions=HISTORY_SUMMARIZER.format(game_description=GAME_DESCRIPTION),
+    )
 
 
-story_creator_agent = Agent(
-    model=model,
-    tools=[
-        Tool(
-            function=create_story,
-            description="Create a story",
-            takes_ctx=True,
+def _build_solution_creator_agent(model: Model) -> Agent:
+    return Agent(
+        model=model,
+        name="solution_creator",
+        tools=[
+            Tool(
+                function=create_solution,
+                description="Create a solution for the mystery",
+                takes_ctx=True,
+            ),
+        ],
+        system_prompt=SOLUTION_CREATOR_PROMPT,
+        deps_type=GameAgentDeps,
+    )
+
+
+def _build_story_and_solution_creator_agent(model: Model) -> Agent:
+    # An output function rather than a tool: the run ends with its call, so story and solution take one model request
+    return Agent(
+        model=model,
+        name="story_and_solution_creator",
+        output_type=ToolOutput(
+            create_story_and_solution,
+            name=create_story_and_solution.__name__,
+            description="Create the story and its solution",
         ),
-    ],
-    system_prompt=STORY_CREATOR.format(game_description=GAME_DESCRIPTION),
-    deps_type=GameAgentDeps,
-)
+        instructions=STORY_AND_SOLUTION_CREATOR_PROMPT,
+        deps_type=GameAgentDeps,
+    )
+
+
+def _game_master_context(ctx: RunContext[Game]) -> str:
+    game = ctx.deps
+    return GAME_MASTER_CONTEXT.format(story=game.story, culprit=game.culprit, weapon=game.weapon, motive=game.motive)
+
+
+def _build_game_master_agent(model: Model) -> Agent:
+    # Static prompt first, then the game: the whole system message depends only on the game, so every question
+    # about it shares a byte-identical prefix that provider-side prompt caching can reuse
+    return Agent(
+        model=model,
+        name="game_master",
+        instructions=[GAME_MASTER_PROMPT, _game_master_context],
+        deps_type=Game,
+    )
+
+
+def _build_game_master_batch_agent(model: Model) -> Agent:
+    # Same instructions as the game master, so batched and single questions about a game share the system message
+    return Agent(
+        model=model,
+        name="game_master_batch",
+        instructions=[GAME_MASTER_PROMPT, _game_master_context],
+        deps_type=Game,
+        output_type=GameMasterAnswers,
+    )
+
+
+def _build_proposal_judge_agent(model: Model) -> Agent:
+    return Agent(
+        model=model,
+        name="proposal_judge",
+        instructions=PROPOSAL_JUDGE.format(game_description=GAME_DESCRIPTION),
+        output_type=ProposalJudgement,
+    )
+
+
+def story_creator_agent() -> Agent:
+    return agent_registry.get(_build_story_creator_agent)
+
+
+def history_summarizer_agent() -> Agent:
+    return agent_registry.get(_build_history_summarizer_agent)
+
+
+def solution_creator_agent() -> Agent:
+    return agent_registry.get(_build_solution_creator_agent)
+
+
+def story_and_solution_creator_agent() -> Agent:
+    return agent_registry.get(_build_story_and_solution_creator_agent)
+
+
+def game_master_agent() -> Agent:
+    return agent_registry.get(_build_game_master_agent)
 
-async def run_story_creation_agent(game: Game, message: str) -> AgentRunResult:
-    deps = GameAgentDeps(game=game)
 
+def game_master_batch_agent() -> Agent:
+    return agent_registry.get(_build_game_master_batch_agent)
+
+
+def proposal_judge_agent() -> Agent:
+    return agent_registry.get(_build_proposal_judge_agent)
+
+
+def _cache_key(system_prompt: str, user_prompt: str, message_history: list[ModelMessage] | None) -> str | None:
+    if not settings().agent_cache_enabled:
+        return None
+
+    return AgentRunCache.key(agent_registry.model().model_name, system_prompt, user_prompt, message_history)
+
+
+def _model_responses(result: AgentRunResult) -> list[ModelResponse]:
+    return [message for message in result.new_messages() if isinstance(message, ModelResponse)]
+
+
+def _elapsed_ms(start: float) -> int:
+    return round((time.perf_counter() - start) * 1000)
+
+
+async def _timed_run(agent: Agent, **kwargs) -> tuple[AgentRunResult, int]:
+    """agent.run, recording its latency and token usage in the metrics. Returns the result and the latency in ms."""
+    start = time.perf_counter()
+    result = await agent.run(**kwargs)
+    record_agent_run(agent.name, time.perf_counter() - start, result.usage())
+
+    return result, _elapsed_ms(start)
+
+
+async def _run_agent(
+    agent: Agent,
+    system_prompt: str,
+    user_prompt: str,
+    deps: GameAgentDeps,
+    message_history: list[ModelMessage] | None = None,
+    user_message: str | None = None,
+) -> AgentRunResult:
+    """
+    Run an agent through the response cache. Hits are replayed through the agent, so tool side effects still apply.
+
+    The run (its tool calls, latency and token usage) is recorded on deps; see GameAgentDeps.add_agent_run for user_message.
+    """
+    key = _cache_key(system_prompt, user_prompt, message_history)
+    cached = await get_agent_run_cache().get(key) if key else None
+
+    if cached:
+        # Replayed runs spend no tokens, so they are kept out of the metrics and their rows carry no usage
+        result = await agent.run(user_prompt=user_prompt, message_history=message_history, deps=deps, model=replay_model(cached))
+        deps.add_agent_run(agent.name, result, None, user_message=user_message)
+        return result
+
+    result, latency_ms = await _timed_run(agent, user_prompt=user_prompt, message_history=message_history, deps=deps)
+    deps.add_agent_run(agent.name, result, latency_ms, user_message=user_message)
+
+    if key:
+        await get_agent_run_cache().set(key, _model_responses(result))
+
+    return result
+
+
+async def _run_agent_stream_events(
+    agent: Agent,
+    system_prompt: str,
+    user_prompt: str,
+    deps: GameAgentDeps,
+    message_history: list[ModelMessage] | None = None,
+    user_message: str | None = None,
+) -> AsyncIterator[AgentStreamEvent | AgentRunResultEvent]:
+    """Streaming counterpart of _run_agent."""
+    key = _cache_key(system_prompt, user_prompt, message_history)
+    cached = await get_agent_run_cache().get(key) if key else None
+    start = time.perf_counter()
+
+    async for event in agent.run_stream_events(
+        user_prompt=user_prompt,
+        message_history=message_history,
+        deps=deps,
+        model=replay_model(cached) if cached else None,
+    ):
+        if isinstance(event, AgentRunResultEvent):
+            if cached:
+                deps.add_agent_run(agent.name, event.result, None, user_message=user_message)
+            else:
+                record_agent_run(agent.name, time.perf_counter() - start, event.result.usage())
+                deps.add_agent_run(agent.name, event.result, _elapsed_ms(start), user_message=user_message)
+                if key:
+                    await get_agent_run_cache().set(key, _model_responses(event.result))
+
+        yield event
+
+
+def _build_story_prompt(game: Game, message: str) -> str:
     user_prompt = f"Create or update the story with the following feedback from the user: {message}"
 
+    # Only the latest version of the story is sent; earlier versions are not part of the replayed history
     if game.story:
         user_prompt += f"\n\nCurrent story: {game.story}"
 
-    return await story_creator_agent.run(user_prompt=user_prompt, deps=deps)
+    return user_prompt
 
-solution_creator_agent = Agent(
-    model=model,
-    tools=[
-        Tool(
-            function=create_solution,
-            description="Create a solution for the mystery",
-            takes_ctx=True,
-        ),
-    ],
-    system_prompt=SOLUTION_CREATOR.format(game_description=GAME_DESCRIPTION),
-    deps_type=GameAgentDeps,
-)
 
-async def run_solution_creation_agent(game: Game) -> AgentRunResult:
+async def _load_story_history(deps: GameAgentDeps) -> list[ModelMessage]:
+    """Load the replayable history into the unit of work, compacting it first if it is over budget."""
+    deps.conversation = await get_conversation(deps.game)
+    messages = await load_replayable_messages(deps.conversation)
+
+    if estimate_tokens(messages) > settings().story_history_token_budget:
+        transcript = "\n\n".join(f"[{message.role.value}] {message.content}" for message in messages)
+        agent = history_summarizer_agent()
+        result, latency_ms = await _timed_run(agent, user_prompt=transcript)
+        messages = await append_messages(deps.conversation, [(ConversationRole.SYSTEM, result.output)], **run_usage_fields(agent.name, latency_ms, result.usage()))
+
+    deps.next_message_idx = await next_message_idx(deps.conversation)
+
+    return to_model_messages(messages)
+
+
+async def run_story_creation_agent(deps: GameAgentDeps, message: str) -> AgentRunResult:
+    """Run the story creation agent. Changes are recorded on deps; the caller flushes them."""
+    history = await _load_story_history(deps)
+
+    return await _run_agent(story_creator_agent(), STORY_CREATOR_PROMPT, _build_story_prompt(deps.game, message), deps, message_history=history, user_message=message)
+
+
+async def stream_story_creation_agent(deps: GameAgentDeps, message: str) -> AsyncIterator[str]:
+    """Run the story creation agent, yielding the story text as the model writes it."""
+    history = await _load_story_history(deps)
+
+    async for delta in _stream_story_argument(story_creator_agent(), STORY_CREATOR_PROMPT, create_story.__name__, deps, message, history):
+        yield delta
+
+
+async def _stream_story_argument(
+    agent: Agent,
+    system_prompt: str,
+    tool_name: str,
+    deps: GameAgentDeps,
+    message: str,
+    history: list[ModelMessage],
+) -> AsyncIterator[str]:
+    """
+    Run a story-writing agent, yielding the `story` argument of its `tool_name` call as the model writes it.
+
+    The partial JSON arguments are re-parsed on every delta and only the new suffix is yielded.
+    The tool itself still runs at the end of the call and records the final story on deps.
+    """
+    story_part_index: int | None = None
+    args_buffer = ""
+    streamed = ""
+
+    async for event in _run_agent_stream_events(
+        agent,
+        system_prompt,
+        _build_story_prompt(deps.game, message),
+        deps,
+        message_history=history,
+        user_message=message,
+    ):
+        if isinstance(event, AgentRunResultEvent):
+            continue
+
+        if isinstance(event, PartStartEvent) and isinstance(event.part, ToolCallPart) and event.part.tool_name == tool_name:
+            story_part_index = event.index
+            args_buffer = event.part.args_as_json_str() if event.part.args else ""
+        elif isinstance(event, PartDeltaEvent) and event.index == story_part_index and isinstance(event.delta, ToolCallPartDelta):
+            if isinstance(event.delta.args_delta, str):
+                args_buffer += event.delta.args_delta
+        else:
+            continue
+
+        story = _partial_story(args_buffer)
+        if len(story) > len(streamed) and story.startswith(streamed):
+            yield story[len(streamed) :]
+            streamed = story
+
+
+def _partial_story(args_json: str) -> str:
+    if not args_json:
+        return ""
+
+    try:
+        args = from_json(args_json, allow_partial="trailing-strings")
+    except ValueError:
+        return ""
+
+    story = args.get("story") if isinstance(args, dict) else None
+    return story if isinstance(story, str) else ""
+
+
+async def run_solution_creation_agent(deps: GameAgentDeps) -> AgentRunResult:
+    """Run the solution creation agent on the story held by deps. Changes are recorded on deps; the caller flushes them."""
+    return await _run_agent(solution_creator_agent(), SOLUTION_CREATOR_PROMPT, deps.game.story, deps)
+
+
+async def run_story_and_solution_agent(deps: GameAgentDeps, message: str) -> AgentRunResult:
+    """Write or update the story and its solution in one model call. Changes are recorded on deps; the caller flushes them."""
+    history = await _load_story_history(deps)
+
+    return await _run_agent(
+        story_and_solution_creator_agent(),
+        STORY_AND_SOLUTION_CREATOR_PROMPT,
+        _build_story_prompt(deps.game, message),
+        deps,
+        message_history=history,
+        user_message=message,
+    )
+
+
+# Decides, from the story before the iteration and deps, whether the solution agent has to run again
+SolutionCheck = Callable[[str, GameAgentDeps], bool]
+
+
+def _always_outdated(previous_story: str, deps: GameAgentDeps) -> bool:
+    return True
+
+
+async def run_game_creation_agents(deps: GameAgentDeps, message: str, solution_outdated: SolutionCheck = _always_outdated) -> None:
+    """
+    Write or update the story, then its solution. Changes are recorded on deps; the caller flushes them.
+
+    The solution agent only runs again when solution_outdated says the story changed materially.
+
+    With GAME_INIT_SINGLE_CALL both come from one model call. A model that cannot produce the combined output
+    (pydantic-ai gives up with UnexpectedModelBehavior) falls back to the story agent followed by the solution agent.
+    """
+    if settings().game_init_single_call:
+        try:
+            await run_story_and_solution_agent(deps, message)
+            return
+        except UnexpectedModelBehavior as e:
+            logger.warning(f"Single-call story generation failed, falling back to the story and solution agents: {e}")
+
+    previous_story = deps.game.story
+    await run_story_creation_agent(deps, message)
+    if solution_outdated(previous_story, deps):
+        await run_solution_creation_agent(deps)
+
+
+async def stream_game_creation_agents(deps: GameAgentDeps, message: str, solution_outdated: SolutionCheck = _always_outdated) -> AsyncIterator[str]:
+    """
+    Streaming counterpart of run_game_creation_agents: yields the story text as the model writes it.
+
+    The fallback only applies while nothing has been streamed yet; a story already sent to the client cannot be taken back.
+    """
+    if settings().game_init_single_call:
+        streamed = False
+        try:
+            history = await _load_story_history(deps)
+            agent = story_and_solution_creator_agent()
+            async for delta in _stream_story_argument(agent, STORY_AND_SOLUTION_CREATOR_PROMPT, create_story_and_solution.__name__, deps, message, history):
+                streamed = True
+                yield delta
+            return
+        except UnexpectedModelBehavior as e:
+            if streamed:
+                raise
+            logger.warning(f"Single-call story generation failed, falling back to the story and solution agents: {e}")
+
+    previous_story = deps.game.story
+    async for delta in stream_story_creation_agent(deps, message):
+        yield delta
+    if solution_outdated(previous_story, deps):
+        await run_solution_creation_agent(deps)
+
+
+async def generate_warm_game(language: str, locale: str) -> Game:
+    """
+    Generate a story and solution for the warm pool, without saving anything.
+
+    Runs bypass the response cache, since every pool entry must be a different story.
+    The deps are never flushed, so the Game stays in memory.
+    """
+    game = Game(language=language, locale=locale)
     deps = GameAgentDeps(game=game)
 
-    return await solution_creator_agent.run(
-        user_prompt=game.story, deps=deps
-    )
\ No newline at end of file
+    user_prompt = WARM_POOL_STORY_REQUEST.format(language=language, locale=locale)
+
+    if settings().game_init_single_call:
+        try:
+            await _timed_run(story_and_solution_creator_agent(), user_prompt=user_prompt, deps=deps)
+            return game
+        except UnexpectedModelBehavior as e:
+            logger.warning(f"Single-call story generation failed, falling back to the story and solution agents: {e}")
+
+    await _timed_run(story_creator_agent(), user_prompt=user_prompt, deps=deps)
+    await _timed_run(solution_creator_agent(), user_prompt=game.story, deps=deps)
+
+    return game
+
+
+def _game_master_settings(game: Game) -> dict:
+    return {"extra_body": {"prompt_cache_key": f"game-{game.id}"}}
+
+
+async def stream_game_master_answer(game: Game, question: str) -> AsyncIterator[str]:
+    """
+    Answer a player's question about the game, yielding the answer text as the model writes it.
+
+    Nothing but the question goes after the per-game prefix: no timestamps, no player name and no earlier questions.
+    The prompt cache key routes every question about a game to the same provider cache.
+    """
+    start = time.perf_counter()
+
+    async with game_master_agent().run_stream(
+        question,
+        deps=game,
+        model_settings=_game_master_settings(game),
+    ) as result:
+        async for delta in result.stream_text(delta=True):
+            yield delta
+
+    record_agent_run(game_master_agent().name, time.perf_counter() - start, result.usage())
+
+
+async def answer_game_master_questions(game: Game, questions: list[str]) -> list[str]:
+    """
+    Answer several questions about the game with one model call.
+
+    Questions are numbered in the prompt and the answers matched back by number. Questions the model skipped
+    (or answered under a number that does not exist) are answered one by one, so every question gets an answer.
+    """
+    if len(questions) == 1:
+        result, _ = await _timed_run(game_master_agent(), user_prompt=questions[0], deps=game, model_settings=_game_master_settings(game))
+        return [result.output]
+
+    numbered = "\n".join(f"{number}. {question}" for number, question in enumerate(questions, start=1))
+    result, _ = await _timed_run(
+        game_master_batch_agent(),
+        user_prompt=GAME_MASTER_BATCH_REQUEST.format(questions=numbered),
+        deps=game,
+        model_settings=_game_master_settings(game),
+    )
+
+    answers: list[str | None] = [None] * len(questions)
+    for answer in result.output.answers:
+        if 1 <= answer.number <= len(questions) and answers[answer.number - 1] is None:
+            answers[answer.number - 1] = answer.answer
+
+    missing = [index for index, answer in enumerate(answers) if answer is None]
+    retried = await asyncio.gather(*(answer_game_master_questions(game, [questions[index]]) for index in missing))
+    for index, [answer] in zip(missing, retried, strict=True):
+        answers[index] = answer
+
+    return answers
+
+
+async def judge_proposal(guesses: dict[str, tuple[str, str]]) -> ProposalJudgement:
+    """Ask the model whether each guess matches the solution; `guesses` maps a solution field to (guess, solution)."""
+    fields = "\n".join(f"- {field}: guess {guess!r}, solution {solution!r}" for field, (guess, solution) in guesses.items())
+    result, _ = await _timed_run(proposal_judge_agent(), user_prompt=fields)
+
+    return result.output
@@ -0,0 +1,125 @@
+"""
+Response cache for agent runs.
+
+Entries are keyed on a hash of the model name, system prompt, user prompt and message history, and hold
+the model responses of the run. A hit is replayed through the agent with a model that returns the cached
+responses, so tool calls (and their side effects on the Game) run exactly as they did the first time.
+
+Lookups are counted in agent_cache_lookups_total; expired rows of the persistent tier are deleted by the expiry sweeper.
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Sequence
+from datetime import UTC, datetime, timedelta
+from functools import cache
+
+from pydantic_ai.messages import ModelMessage, ModelMessagesTypeAdapter, ModelResponse, TextPart, ToolCallPart
+from pydantic_ai.models.function import AgentInfo, DeltaToolCall, DeltaToolCalls, FunctionModel
+
+from cluedogpt_backend.infrastructure.metrics import agent_cache_lookups_total
+from cluedogpt_backend.models.postgres_models import AgentRunCacheEntry
+from cluedogpt_backend.settings import settings
+
+
+class AgentRunCache:
+    """In-memory LRU + TTL cache of agent runs, backed by an optional Postgres tier."""
+
+    def __init__(self, max_entries: int, ttl_seconds: int, persistent: bool = False) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.persistent = persistent
+        self._entries: OrderedDict[str, tuple[float, list[ModelResponse]]] = OrderedDict()
+
+    @staticmethod
+    def key(model_name: str, system_prompt: str, user_prompt: str, message_history: Sequence[ModelMessage] | None = None) -> str:
+        payload = json.dumps(
+            [model_name, system_prompt, user_prompt, _history_fingerprint(message_history or [])],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def get(self, key: str) -> list[ModelResponse] | None:
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            agent_cache_lookups_total.inc(result="memory_hit")
+            return entry[1]
+
+        if entry:
+            del self._entries[key]
+
+        if self.persistent:
+            row = await AgentRunCacheEntry.get_or_none(key=key, expires_at__gt=datetime.now(UTC))
+            if row:
+                responses = [message for message in ModelMessagesTypeAdapter.validate_python(row.responses) if isinstance(message, ModelResponse)]
+                self._remember(key, responses)
+                agent_cache_lookups_total.inc(result="persistent_hit")
+                return responses
+
+        agent_cache_lookups_total.inc(result="miss")
+        return None
+
+    async def set(self, key: str, responses: list[ModelResponse]) -> None:
+        self._remember(key, responses)
+
+        if self.persistent:
+            await AgentRunCacheEntry.update_or_create(
+                key=key,
+                defaults={
+                    "responses": ModelMessagesTypeAdapter.dump_python(responses, mode="json"),
+                    "expires_at": datetime.now(UTC) + timedelta(seconds=self.ttl_seconds),
+                },
+            )
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _remember(self, key: str, responses: list[ModelResponse]) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, responses)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+def replay_model(responses: list[ModelResponse]) -> FunctionModel:
+    """A model that answers with the cached responses, in order, without calling the provider."""
+    remaining = iter(responses)
+
+    def respond(_messages: list[ModelMessage], _info: AgentInfo) -> ModelResponse:
+        return next(remaining)
+
+    async def stream(_messages: list[ModelMessage], _info: AgentInfo) -> AsyncIterator[str | DeltaToolCalls]:
+        response = next(remaining)
+        for index, part in enumerate(response.parts):
+            if isinstance(part, ToolCallPart):
+                yield {index: DeltaToolCall(name=part.tool_name, json_args=part.args_as_json_str(), tool_call_id=part.tool_call_id)}
+            elif isinstance(part, TextPart):
+                yield part.content
+
+    return FunctionModel(respond, stream_function=stream, model_name="agent-run-cache")
+
+
+def _history_fingerprint(messages: Sequence[ModelMessage]) -> list:
+    # Only content goes into the key; timestamps and ids differ between otherwise identical histories
+    fingerprint = []
+    for message in messages:
+        for part in message.parts:
+            if isinstance(part, ToolCallPart):
+                fingerprint.append([part.part_kind, part.tool_name, part.args_as_json_str()])
+            else:
+                fingerprint.append([part.part_kind, str(getattr(part, "content", ""))])
+
+    return fingerprint
+
+
+@cache
+def get_agent_run_cache() -> AgentRunCache:
+    return AgentRunCache(
+        max_entries=settings().agent_cache_max_entries,
+        ttl_seconds=settings().agent_cache_ttl_seconds,
+        persistent=settings().agent_cache_persistent,
+    )
@@ -1,8 +1,121 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Any
 
-from models.postgres_models import Game
+from pydantic_ai import AgentRunResult
+from pydantic_ai.messages import ModelRequest, ModelResponse, RetryPromptPart, ToolCallPart, ToolReturnPart
+from pydantic_ai.usage import RunUsage
+from tortoise import BaseDBAsyncClient
+from tortoise.transactions import in_transaction
+
+from cluedogpt_backend.ai.history import next_message_idx
+from cluedogpt_backend.models.postgres_models import ConversationRole, DefinitionMessage, Game, GameDefinitionConversation
+
+
+def run_usage_fields(agent_name: str, latency_ms: int | None, usage: RunUsage) -> dict[str, Any]:
+    """DefinitionMessage fields for an agent run. Runs replayed from the response cache (latency_ms None) spend nothing."""
+    if latency_ms is None:
+        return {"agent_name": agent_name}
+
+    return {"agent_name": agent_name, "latency_ms": latency_ms, "input_tokens": usage.input_tokens, "output_tokens": usage.output_tokens}
 
 
 @dataclass
 class GameAgentDeps:
+    """
+    Dependencies for the game agents, doubling as the unit of work of one iteration.
+
+    Tools record their changes here instead of saving; flush() writes the changed Game fields and the new
+    DefinitionMessage rows in a single transaction. The idx values handed out while recording are provisional:
+    flush() renumbers the new rows after the conversation's last message, under a lock on the conversation.
+    """
+
     game: Game
+    conversation: GameDefinitionConversation | None = None
+    next_message_idx: int = 0
+
+    changed_fields: set[str] = field(default_factory=set)
+    new_messages: list[DefinitionMessage] = field(default_factory=list)
+    # Tool latencies by tool_call_id, measured by the tools while the run is in progress
+    tool_latencies_ms: dict[str, int] = field(default_factory=dict)
+
+    def update_game(self, **values: Any) -> None:
+        for name, value in values.items():
+            setattr(self.game, name, value)
+
+        self.changed_fields.update(values)
+
+    def add_message(self, role: ConversationRole, content: str | None, **fields: Any) -> None:
+        self.new_messages.append(
+            DefinitionMessage(
+                conversation_id=self.conversation.id,
+                role=role,
+                content=content,
+                idx=self.next_message_idx,
+                **fields,
+            ),
+        )
+        self.next_message_idx += 1
+
+    def add_agent_run(self, agent_name: str, result: AgentRunResult, latency_ms: int | None, user_message: str | None = None) -> None:
+        """
+        Record a finished agent run: the user's message, a TOOL row per tool call and the run's usage.
+
+        Conversational runs (with a user message) end with an ASSISTANT reply carrying the usage; otherwise the usage
+        goes on the run's last tool row, or, for a run without tool calls, on a TOOL row without a tool_name holding
+        its output, which history replay skips like the other tool rows.
+        """
+        if user_message is not None:
+            self.add_message(ConversationRole.USER, user_message)
+
+        returns = {part.tool_call_id: part for message in result.new_messages() if isinstance(message, ModelRequest) for part in message.parts if isinstance(part, ToolReturnPart | RetryPromptPart)}
+        tool_calls = [part for message in result.new_messages() if isinstance(message, ModelResponse) for part in message.parts if isinstance(part, ToolCallPart)]
+        run_fields = run_usage_fields(agent_name, latency_ms, result.usage())
+
+        for position, call in enumerate(tool_calls):
+            returned = returns.get(call.tool_call_id)
+            closes_run = user_message is None and position == len(tool_calls) - 1
+
+            self.add_message(
+                ConversationRole.TOOL,
+                returned.model_response_str() if isinstance(returned, ToolReturnPart) else None,
+                tool_name=call.tool_name,
+                tool_args=call.args_as_dict(),
+                tool_result=returned.model_response_object() if isinstance(returned, ToolReturnPart) else None,
+                tool_call_id=call.tool_call_id,
+                tool_latency_ms=self.tool_latencies_ms.pop(call.tool_call_id, None),
+                tool_error=returned.model_response() if isinstance(returned, RetryPromptPart) else None,
+                **(run_fields if closes_run else {"agent_name": agent_name}),
+            )
+
+        if user_message is not None:
+            self.add_message(ConversationRole.ASSISTANT, result.output, **run_fields)
+        elif not tool_calls:
+            self.add_message(ConversationRole.TOOL, None if result.output is None else str(result.output), **run_fields)
+
+    async def flush(self, connection: BaseDBAsyncClient | None = None) -> None:
+        """Write the recorded changes in a transaction of their own, or in the caller's `connection` transaction."""
+        if not self.changed_fields and not self.new_messages:
+            return
+
+        if connection is None:
+            async with in_transaction() as connection:
+                await self._write(connection)
+        else:
+            await self._write(connection)
+
+        self.changed_fields.clear()
+        self.new_messages.clear()
+
+    async def _write(self, connection: BaseDBAsyncClient) -> None:
+        if self.changed_fields:
+            await self.game.save(update_fields=sorted(self.changed_fields), using_db=connection)
+        if self.new_messages:
+            # Lock the conversation row so concurrent flushes don't race for idx values
+            await GameDefinitionConversation.filter(id=self.conversation.id).using_db(connection).select_for_update().first()
+
+            next_idx = await next_message_idx(self.conversation, connection)
+            for offset, message in enumerate(self.new_messages):
+                message.idx = next_idx + offset
+            self.next_message_idx = next_idx + len(self.new_messages)
+
+            await DefinitionMessage.bulk_create(self.new_messages, using_db=connection)
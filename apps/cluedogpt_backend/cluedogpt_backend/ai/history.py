@@ -0,0 +1,76 @@
+"""
+Definition-time conversation history.
+
+Each story iteration is stored as ordered DefinitionMessage rows and replayed to the story agent as
+pydantic-ai message history. Only the user's feedback and the agent's short replies are replayed; the
+current story is sent once with the new prompt, so earlier story versions never re-enter the context.
+
+When the replayed history grows past a token budget it is folded into a SYSTEM summary row, and replay
+starts from the latest summary.
+"""
+
+from typing import Any
+
+from pydantic_ai.messages import ModelMessage, ModelRequest, ModelResponse, TextPart, UserPromptPart
+from tortoise import BaseDBAsyncClient
+from tortoise.functions import Max
+from tortoise.transactions import in_transaction
+
+from cluedogpt_backend.models.postgres_models import ConversationRole, DefinitionMessage, Game, GameDefinitionConversation
+
+
+# Rough chars-per-token ratio; good enough to decide when to compact
+CHARS_PER_TOKEN = 4
+
+
+async def get_conversation(game: Game) -> GameDefinitionConversation:
+    conversation, _ = await GameDefinitionConversation.get_or_create(game_id=game.id)
+    return conversation
+
+
+async def load_replayable_messages(conversation: GameDefinitionConversation) -> list[DefinitionMessage]:
+    """Messages from the latest summary (inclusive) onwards, in idx order."""
+    latest_summary_idx = await DefinitionMessage.filter(conversation_id=conversation.id, role=ConversationRole.SYSTEM).order_by("-idx").first().values_list("idx", flat=True)
+
+    query = DefinitionMessage.filter(conversation_id=conversation.id, role__in=[ConversationRole.SYSTEM, ConversationRole.USER, ConversationRole.ASSISTANT])
+    if latest_summary_idx is not None:
+        query = query.filter(idx__gte=latest_summary_idx)
+
+    return await query.order_by("idx")
+
+
+def estimate_tokens(messages: list[DefinitionMessage]) -> int:
+    return sum(len(message.content or "") for message in messages) // CHARS_PER_TOKEN
+
+
+def to_model_messages(messages: list[DefinitionMessage]) -> list[ModelMessage]:
+    model_messages: list[ModelMessage] = []
+
+    for message in messages:
+        if message.role == ConversationRole.SYSTEM:
+            model_messages.append(ModelRequest(parts=[UserPromptPart(content=f"Summary of the conversation so far:\n{message.content}")]))
+        elif message.role == ConversationRole.USER:
+            model_messages.append(ModelRequest(parts=[UserPromptPart(content=message.content or "")]))
+        elif message.role == ConversationRole.ASSISTANT:
+            model_messages.append(ModelResponse(parts=[TextPart(content=message.content or "")]))
+
+    return model_messages
+
+
+async def next_message_idx(conversation: GameDefinitionConversation, connection: BaseDBAsyncClient | None = None) -> int:
+    result = await DefinitionMessage.filter(conversation_id=conversation.id).using_db(connection).annotate(max_idx=Max("idx")).first().values("max_idx")
+    return (result["max_idx"] if result and result["max_idx"] is not None else -1) + 1
+
+
+async def append_messages(conversation: GameDefinitionConversation, messages: list[tuple[ConversationRole, str]], **fields: Any) -> list[DefinitionMessage]:
+    """Append messages to the conversation, assigning sequential idx values inside one transaction. `fields` are set on every row."""
+    async with in_transaction() as connection:
+        # Lock the conversation row so concurrent writers don't race for idx values
+        await GameDefinitionConversation.filter(id=conversation.id).using_db(connection).select_for_update().first()
+
+        next_idx = await next_message_idx(conversation, connection)
+
+        rows = [DefinitionMessage(conversation_id=conversation.id, role=role, content=content, idx=next_idx + offset, **fields) for offset, (role, content) in enumerate(messages)]
+        await DefinitionMessage.bulk_create(rows, using_db=connection)
+
+    return rows
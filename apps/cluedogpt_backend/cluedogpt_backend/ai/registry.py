@@ -0,0 +1,85 @@
+from collections.abc import Callable
+from urllib.parse import urlsplit
+
+import httpx
+from pydantic_ai import Agent
+from pydantic_ai.models import Model
+
+from cluedogpt_backend.infrastructure.http_client import provider_http_client
+from cluedogpt_backend.settings import ProviderSettings, settings
+
+
+def configured_providers() -> list[ProviderSettings]:
+    """The primary provider, then the fallbacks, in the order they are tried."""
+    primary = ProviderSettings(base_url=settings().ai_provider_base_url, model_name=settings().ai_model_name, api_key=settings().ai_model_api_key)
+
+    return [primary, *settings().ai_fallback_providers]
+
+
+def _build_provider_model(http_client: httpx.AsyncClient) -> Model:
+    # Imported here: the OpenAI SDK is the single most expensive import of the app
+    from openai import AsyncOpenAI
+    from pydantic_ai.models.openai import OpenAIChatModel
+    from pydantic_ai.providers.openai import OpenAIProvider
+
+    from cluedogpt_backend.ai.routing import ProviderRoute, RoutedModel
+
+    providers = configured_providers()
+    # The SDK retries failed calls itself; with fallbacks, the next provider is asked instead of retrying the same one
+    max_retries = 2 if len(providers) == 1 else 0
+
+    routes = []
+    for provider in providers:
+        model = OpenAIChatModel(
+            model_name=provider.model_name,
+            provider=OpenAIProvider(
+                openai_client=AsyncOpenAI(
+                    base_url=provider.base_url,
+                    api_key=provider.api_key,
+                    max_retries=max_retries,
+                    http_client=http_client,
+                ),
+            ),
+        )
+        routes.append(ProviderRoute(provider.name or urlsplit(provider.base_url).netloc, model))
+
+    return RoutedModel(routes)
+
+
+class AgentRegistry:
+    """
+    Builds the provider model and the agents on first use instead of at import time.
+
+    use_model() swaps in another model (e.g. pydantic-ai's TestModel) for every agent built afterwards.
+    The provider model and its agents are built again once the shared HTTP client they use was closed.
+    """
+
+    def __init__(self) -> None:
+        self._model: Model | None = None
+        self._http_client: httpx.AsyncClient | None = None
+        self._agents: dict[Callable[[Model], Agent], Agent] = {}
+
+    def model(self) -> Model:
+        if self._model is None or (self._http_client is not None and self._http_client.is_closed):
+            self._http_client = provider_http_client.get()
+            self._model = _build_provider_model(self._http_client)
+            self._agents.clear()
+
+        return self._model
+
+    def use_model(self, model: Model | None) -> None:
+        """Use `model` for all agents (None goes back to the configured provider). Already built agents are dropped."""
+        self._model = model
+        self._http_client = None
+        self._agents.clear()
+
+    def get(self, factory: Callable[[Model], Agent]) -> Agent:
+        model = self.model()
+        agent = self._agents.get(factory)
+        if agent is None:
+            agent = self._agents[factory] = factory(model)
+
+        return agent
+
+
+agent_registry = AgentRegistry()
@@ -0,0 +1,328 @@
+"""
+Failover, circuit breaking and hedging across the configured model providers.
+
+RoutedModel sits between the agents and the provider models. Each model request goes to the first provider whose
+circuit is closed, and moves on to the next one when that call fails. If the call is still running after the hedge
+delay (the provider's p95 latency for that kind of request), the same request is sent to the next provider as well,
+and whichever answers first wins; the other call is cancelled.
+
+Routing happens per model request, before pydantic-ai sees a response: tools only run on the winning response,
+so their side effects on the Game apply once, however many providers were asked.
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from enum import Enum
+from functools import cached_property
+from typing import Any
+
+import httpx
+from pydantic_ai import RunContext
+from pydantic_ai.exceptions import ModelHTTPError, UnexpectedModelBehavior
+from pydantic_ai.messages import ModelMessage, ModelResponse
+from pydantic_ai.models import Model, ModelRequestParameters, StreamedResponse
+from pydantic_ai.profiles import ModelProfile
+from pydantic_ai.settings import ModelSettings
+
+from cluedogpt_backend.api.exceptions import OverloadedError
+from cluedogpt_backend.app_logging import logger
+from cluedogpt_backend.infrastructure.metrics import llm_circuit_open, llm_hedged_requests_total, llm_provider_requests_total
+from cluedogpt_backend.settings import settings
+
+
+# Latency samples kept per provider and kind of request, and how many are needed before their p95 is trusted
+LATENCY_WINDOW = 200
+MIN_LATENCY_SAMPLES = 20
+RETRYABLE_STATUS_CODES = (408, 409, 429)
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(eq=False)
+class Permit:
+    """Handed out by CircuitBreaker.allow() for each call it lets through; the call's outcome is reported with it."""
+
+    trial: bool = False
+
+
+class CircuitBreaker:
+    """
+    Stops sending calls to a provider that keeps failing.
+
+    Closed: calls go through, and the circuit opens once enough of the recent calls failed or were too slow.
+    Open: calls are refused until open_seconds have passed. Half-open: a single trial call decides whether
+    the circuit closes again or stays open for another open_seconds. Only the call holding the trial permit
+    decides, or gives the trial up when it is cancelled.
+    """
+
+    def __init__(self, name: str, window: int, min_calls: int, failure_rate: float, slow_call_seconds: float, open_seconds: float) -> None:
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.state = CircuitState.CLOSED
+        self.opened_at = 0.0
+        self._failures: deque[bool] = deque(maxlen=window)
+        self._trial: Permit | None = None
+
+    def allow(self) -> Permit | None:
+        """A permit if a call may be sent now, else None; in the half-open state the permit claims the trial call."""
+        if self.state == CircuitState.OPEN:
+            if self.retry_after() > 0:
+                return None
+            self.state = CircuitState.HALF_OPEN
+
+        if self.state == CircuitState.HALF_OPEN:
+            if self._trial is not None:
+                return None
+            self._trial = Permit(trial=True)
+            return self._trial
+
+        return Permit()
+
+    def record(self, permit: Permit, ok: bool, seconds: float | None = None) -> None:
+        failed = not ok or (seconds is not None and seconds > self.slow_call_seconds)
+
+        if permit.trial:
+            if permit is self._trial:
+                self._trial = None
+                if failed:
+                    self._open()
+                else:
+                    self._close()
+            return
+
+        # Calls sent before the circuit opened may finish after it; they say nothing about the trial
+        if self.state != CircuitState.CLOSED:
+            return
+
+        self._failures.append(failed)
+        if len(self._failures) >= self.min_calls and sum(self._failures) / len(self._failures) >= self.failure_rate:
+            self._open()
+
+    def release(self, permit: Permit) -> None:
+        """A call that was let through was cancelled before it had an outcome; a trial call lets the next one try."""
+        if permit is self._trial:
+            self._trial = None
+
+    def retry_after(self) -> float:
+        if self.state != CircuitState.OPEN:
+            return 0.0
+
+        return max(0.0, self.opened_at + self.open_seconds - time.monotonic())
+
+    def _open(self) -> None:
+        self.state = CircuitState.OPEN
+        self.opened_at = time.monotonic()
+        self._failures.clear()
+        llm_circuit_open.set(1, provider=self.name)
+        logger.warning(f"Circuit opened for model provider {self.name}")
+
+    def _close(self) -> None:
+        self.state = CircuitState.CLOSED
+        llm_circuit_open.set(0, provider=self.name)
+        logger.info(f"Circuit closed for model provider {self.name}")
+
+
+class ProviderRoute:
+    """One provider's model, its circuit breaker and its recent latencies."""
+
+    def __init__(self, name: str, model: Model) -> None:
+        self.name = name
+        self.model = model
+        self.breaker = CircuitBreaker(
+            name,
+            window=settings().ai_circuit_window,
+            min_calls=settings().ai_circuit_min_calls,
+            failure_rate=settings().ai_circuit_failure_rate,
+            slow_call_seconds=settings().ai_circuit_slow_call_seconds,
+            open_seconds=settings().ai_circuit_open_seconds,
+        )
+        self._latencies: dict[str, deque[float]] = {}
+        llm_circuit_open.set(0, provider=name)
+
+    def observe(self, kind: str, seconds: float) -> None:
+        self._latencies.setdefault(kind, deque(maxlen=LATENCY_WINDOW)).append(seconds)
+
+    def hedge_delay(self, kind: str) -> float:
+        """p95 latency of this kind of request, clamped to the configured bounds; the upper bound until there are enough samples."""
+        low, high = settings().ai_hedge_min_delay_seconds, settings().ai_hedge_max_delay_seconds
+        samples = self._latencies.get(kind)
+        if not samples or len(samples) < MIN_LATENCY_SAMPLES:
+            return high
+
+        ordered = sorted(samples)
+        p95 = ordered[min(len(ordered) - 1, round(0.95 * len(ordered)))]
+        return min(high, max(low, p95))
+
+
+def _request_kind(stream: bool, model_request_parameters: ModelRequestParameters) -> str:
+    # Latency depends mostly on the agent, which the offered tools identify: writing a story is slower than judging a guess
+    return f"{'stream' if stream else 'request'}:{','.join(sorted(model_request_parameters.tool_defs))}"
+
+
+def _is_provider_failure(error: BaseException) -> bool:
+    """Errors worth trying another provider for: server errors, rate limits, timeouts and broken connections or responses."""
+    # Imported here like in the registry: the OpenAI SDK is only loaded once a provider model exists
+    from openai import APIConnectionError
+
+    if isinstance(error, ModelHTTPError):
+        return error.status_code >= 500 or error.status_code in RETRYABLE_STATUS_CODES
+
+    return isinstance(error, APIConnectionError | httpx.HTTPError | TimeoutError | UnexpectedModelBehavior)
+
+
+class RoutedModel(Model):
+    """A model that routes each request across providers; see the module docstring."""
+
+    def __init__(self, routes: list[ProviderRoute]) -> None:
+        super().__init__()
+        self.routes = routes
+
+    @property
+    def model_name(self) -> str:
+        # The primary's name, so response cache keys do not change when fallbacks are added
+        return self.routes[0].model.model_name
+
+    @property
+    def system(self) -> str:
+        return self.routes[0].model.system
+
+    @property
+    def base_url(self) -> str | None:
+        return self.routes[0].model.base_url
+
+    @cached_property
+    def profile(self) -> ModelProfile:
+        return self.routes[0].model.profile
+
+    def prepare_request(self, model_settings: ModelSettings | None, model_request_parameters: ModelRequestParameters) -> tuple[ModelSettings | None, ModelRequestParameters]:
+        # Each provider model prepares the request for itself
+        return model_settings, model_request_parameters
+
+    async def request(self, messages: list[ModelMessage], model_settings: ModelSettings | None, model_request_parameters: ModelRequestParameters) -> ModelResponse:
+        return await self._route(
+            _request_kind(False, model_request_parameters),
+            lambda route: route.model.request(messages, model_settings, model_request_parameters),
+        )
+
+    @asynccontextmanager
+    async def request_stream(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+        run_context: RunContext[Any] | None = None,
+    ) -> AsyncIterator[StreamedResponse]:
+        """
+        Route the opening of the stream (up to the first chunk), then stream from the winning provider alone.
+
+        Each provider's stream context is held open by a task of its own, so the losers can be closed without
+        waiting for them; the winner's is closed once the caller is done reading.
+        """
+        done = asyncio.Event()
+        holders: list[asyncio.Task] = []
+
+        async def open_stream(route: ProviderRoute) -> tuple[StreamedResponse, asyncio.Task]:
+            opened: asyncio.Future[StreamedResponse] = asyncio.get_running_loop().create_future()
+
+            async def hold() -> None:
+                async with route.model.request_stream(messages, model_settings, model_request_parameters, run_context) as response:
+                    opened.set_result(response)
+                    await done.wait()
+
+            holder = asyncio.create_task(hold())
+            holders.append(holder)
+            await asyncio.wait((opened, holder), return_when=asyncio.FIRST_COMPLETED)
+            if not opened.done():
+                holder.result()
+            return opened.result(), holder
+
+        winner: asyncio.Task | None = None
+        try:
+            response, winner = await self._route(_request_kind(True, model_request_parameters), open_stream)
+            yield response
+        finally:
+            done.set()
+            for holder in holders:
+                if holder is not winner:
+                    holder.cancel()
+            await asyncio.gather(*holders, return_exceptions=True)
+
+    async def _route[T](self, kind: str, attempt: Callable[[ProviderRoute], Awaitable[T]]) -> T:
+        candidates = iter(self.routes)
+        running: dict[asyncio.Task[T], tuple[ProviderRoute, Permit, float]] = {}
+        hedge: asyncio.Task[T] | None = None
+        last_error: BaseException | None = None
+
+        def start_next() -> asyncio.Task[T] | None:
+            for route in candidates:
+                permit = route.breaker.allow()
+                if permit is not None:
+                    task = asyncio.create_task(attempt(route))
+                    running[task] = (route, permit, time.perf_counter())
+                    return task
+            return None
+
+        if start_next() is None:
+            retry_after = min(route.breaker.retry_after() for route in self.routes)
+            raise OverloadedError("No model provider is available, try again shortly", retry_after=retry_after)
+
+        first_route = next(iter(running.values()))[0]
+        hedge_at = time.perf_counter() + first_route.hedge_delay(kind) if settings().ai_hedge_enabled else None
+
+        try:
+            while running:
+                timeout = max(0.0, hedge_at - time.perf_counter()) if hedge is None and hedge_at is not None else None
+                finished, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not finished:
+                    # Only one hedge per request: the timer is not re-armed, whether or not a provider was left to ask
+                    hedge_at = None
+                    hedge = start_next()
+                    continue
+
+                for task in finished:
+                    route, permit, started = running.pop(task)
+                    seconds = time.perf_counter() - started
+                    error = task.exception()
+
+                    if error is None:
+                        route.breaker.record(permit, ok=True, seconds=seconds)
+                        route.observe(kind, seconds)
+                        llm_provider_requests_total.inc(provider=route.name, outcome="success")
+                        if hedge is not None:
+                            llm_hedged_requests_total.inc(winner="hedge" if task is hedge else "original")
+                        return task.result()
+
+                    if not _is_provider_failure(error):
+                        route.breaker.release(permit)
+                        raise error
+
+                    route.breaker.record(permit, ok=False)
+                    llm_provider_requests_total.inc(provider=route.name, outcome="failure")
+                    logger.warning(f"Model provider {route.name} failed after {seconds:.2f}s: {error!r}")
+                    last_error = error
+
+                # Fail over right away instead of waiting for the hedge delay
+                if len(running) < 2:
+                    start_next()
+
+            if hedge is not None:
+                llm_hedged_requests_total.inc(winner="none")
+            raise last_error
+        finally:
+            for task, (route, permit, _) in running.items():
+                task.cancel()
+                route.breaker.release(permit)
+                llm_provider_requests_total.inc(provider=route.name, outcome="cancelled")
+            await asyncio.gather(*running, return_exceptions=True)
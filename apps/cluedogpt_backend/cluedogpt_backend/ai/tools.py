@@ -1,22 +1,58 @@
-from ai.deps import GameAgentDeps
+import functools
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
 from pydantic_ai import RunContext
 
-from dto.game_solution import GameSolution
+from cluedogpt_backend.ai.deps import GameAgentDeps
+from cluedogpt_backend.dto.game_solution import GameSolution
+from cluedogpt_backend.infrastructure.metrics import tool_call_duration_seconds
+
+
+def _recorded[**P](function: Callable[P, Awaitable[str]]) -> Callable[P, Awaitable[str]]:
+    """Time a tool call for the metrics and for its DefinitionMessage row. The signature is preserved for the tool schema."""
+
+    @functools.wraps(function)
+    async def wrapper(ctx: RunContext[GameAgentDeps], *args: Any, **kwargs: Any) -> str:
+        start = time.perf_counter()
+        try:
+            return await function(ctx, *args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            tool_call_duration_seconds.observe(seconds, tool=function.__name__)
+            if ctx.tool_call_id:
+                ctx.deps.tool_latencies_ms[ctx.tool_call_id] = round(seconds * 1000)
 
+    return wrapper
 
+
+@_recorded
 async def create_story(ctx: RunContext[GameAgentDeps], story: str) -> str:
-    game = ctx.deps.game
-    game.story = story
-    await game.save()
+    ctx.deps.update_game(story=story)
 
     return "Story created successfully."
 
 
+@_recorded
 async def create_solution(ctx: RunContext[GameAgentDeps], solution: GameSolution) -> str:
-    game = ctx.deps.game
-    game.culprit = solution.culprit
-    game.weapon = solution.weapon
-    game.motive = solution.motive
-    await game.save()
+    ctx.deps.update_game(
+        culprit=solution.culprit,
+        weapon=solution.weapon,
+        motive=solution.motive,
+    )
 
     return "Solution created successfully."
+
+
+@_recorded
+async def create_story_and_solution(ctx: RunContext[GameAgentDeps], story: str, solution: GameSolution, reply: str) -> str:
+    """Output function of the single-call story agent; the reply becomes the run's output, like the story agent's closing text."""
+    ctx.deps.update_game(
+        story=story,
+        culprit=solution.culprit,
+        weapon=solution.weapon,
+        motive=solution.motive,
+    )
+
+    return reply
@@ -0,0 +1,34 @@
+from collections.abc import AsyncIterator
+
+from fastapi import Depends
+
+from cluedogpt_backend.api.exceptions import OverloadedError
+from cluedogpt_backend.auth.dependencies import get_current_user_from_jwt
+from cluedogpt_backend.dto.user import UserJwt
+from cluedogpt_backend.infrastructure.admission import llm_limiter, player_rate_limiter
+from cluedogpt_backend.infrastructure.metrics import admission_rejections_total
+
+
+async def get_rate_limited_user(user: UserJwt = Depends(get_current_user_from_jwt)) -> UserJwt:
+    """The current user, after taking a token from their bucket; use it on endpoints that call the model."""
+    player_rate_limiter.check(user.user_id)
+
+    return user
+
+
+async def llm_slot(_user: UserJwt = Depends(get_rate_limited_user)) -> AsyncIterator[None]:
+    """
+    Hold a model concurrency slot for the whole request.
+
+    Declare it with `Depends(llm_slot, scope="request")`, so a streaming response keeps the slot until its last event
+    is sent. Depending on the rate-limited user orders the checks: a player over their limit never queues for a slot.
+    """
+    async with llm_limiter.slot():
+        yield
+
+
+async def llm_capacity(_user: UserJwt = Depends(get_rate_limited_user)) -> None:
+    """Refuse to queue more background model work while requests are already being shed."""
+    if llm_limiter.saturated():
+        admission_rejections_total.inc(reason="queue_full")
+        raise OverloadedError("Too many requests in progress, try again shortly", retry_after=1)
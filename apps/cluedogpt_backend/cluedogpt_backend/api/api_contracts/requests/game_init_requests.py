@@ -5,4 +5,6 @@ class GameInitIterationRequest(BaseModel):
     """Request received to iterate over the creation of a game"""
     game_id: str | None = None
     message: str
-    title: str
\ No newline at end of file
+    title: str
+    language: str = "english"
+    locale: str = "us"
@@ -0,0 +1,7 @@
+from pydantic import BaseModel, Field
+
+
+class GameQuestionRequest(BaseModel):
+    """Question a player asks the game master about a game"""
+
+    question: str = Field(min_length=1, max_length=1000)
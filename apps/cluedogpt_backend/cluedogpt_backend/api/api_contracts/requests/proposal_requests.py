@@ -0,0 +1,9 @@
+from pydantic import BaseModel, Field
+
+
+class ProposalRequest(BaseModel):
+    """A player's guess at the solution of a game"""
+
+    culprit: str = Field(max_length=255)
+    weapon: str = Field(max_length=255)
+    motive: str = Field(max_length=255)
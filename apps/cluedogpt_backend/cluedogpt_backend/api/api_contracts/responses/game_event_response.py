@@ -0,0 +1,58 @@
+from datetime import datetime
+from enum import Enum
+
+from pydantic import BaseModel
+
+from cluedogpt_backend.api.api_contracts.responses.game_question_response import GameQuestionResponse, to_question_response
+from cluedogpt_backend.models.postgres_models import Game, GameQuestion, GameStatus, Proposal
+
+
+class GameEventType(Enum):
+    QUESTION_ANSWERED = "question_answered"
+    PROPOSAL_GRADED = "proposal_graded"
+    STORY_UPDATED = "story_updated"
+
+
+class ProposalGradedEvent(BaseModel):
+    """A player's proposal was graded; the guess itself is left out, since its grading would give the solution away"""
+
+    proposal_id: str
+    player_id: str
+    correct_count: int
+    created_at: datetime
+
+
+class StoryUpdatedEvent(BaseModel):
+    """The game's story or solution changed; the story is not sent, since it gives the solution away"""
+
+    status: GameStatus
+    ready: bool
+
+
+class GameEvent(BaseModel):
+    """A message sent to every player connected to a game's room"""
+
+    type: GameEventType
+    game_id: str
+    data: GameQuestionResponse | ProposalGradedEvent | StoryUpdatedEvent
+
+
+def question_answered_event(question: GameQuestion) -> GameEvent:
+    return GameEvent(type=GameEventType.QUESTION_ANSWERED, game_id=str(question.game_id), data=to_question_response(question))
+
+
+def proposal_graded_event(proposal: Proposal) -> GameEvent:
+    return GameEvent(
+        type=GameEventType.PROPOSAL_GRADED,
+        game_id=str(proposal.game_id),
+        data=ProposalGradedEvent(
+            proposal_id=str(proposal.id),
+            player_id=str(proposal.player_id),
+            correct_count=proposal.correct_count,
+            created_at=proposal.created_at,
+        ),
+    )
+
+
+def story_updated_event(game: Game) -> GameEvent:
+    return GameEvent(type=GameEventType.STORY_UPDATED, game_id=str(game.id), data=StoryUpdatedEvent(status=game.status, ready=bool(game.culprit)))
@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from cluedogpt_backend.models.postgres_models import JobStatus
+
+
+class GameInitJobResponse(BaseModel):
+    """Status of a queued game init iteration"""
+
+    job_id: str
+    game_id: str
+    status: JobStatus
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
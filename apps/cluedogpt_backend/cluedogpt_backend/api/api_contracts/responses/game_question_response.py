@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from cluedogpt_backend.models.postgres_models import GameQuestion, QAStatus
+
+
+class GameQuestionResponse(BaseModel):
+    """A player's question and the game master's answer"""
+
+    question_id: str
+    game_id: str
+    player_id: str
+    question: str
+    answer: str | None = None
+    status: QAStatus
+    asked_at: datetime
+    answered_at: datetime | None = None
+
+
+class GameQuestionListResponse(BaseModel):
+    """A page of questions; pass next_cursor back as `cursor` for the next page"""
+
+    items: list[GameQuestionResponse]
+    next_cursor: str | None = None
+
+
+def to_question_response(question: GameQuestion) -> GameQuestionResponse:
+    return GameQuestionResponse(
+        question_id=str(question.id),
+        game_id=str(question.game_id),
+        player_id=str(question.player_id),
+        question=question.question_text,
+        answer=question.answer_text,
+        status=question.status,
+        asked_at=question.asked_at,
+        answered_at=question.answered_at,
+    )
@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from cluedogpt_backend.models.postgres_models import Game, GameStatus
+
+
+class GameSummaryResponse(BaseModel):
+    """A game as shown in lists, without its story or solution"""
+
+    game_id: str
+    name: str
+    owner_id: str
+    status: GameStatus
+    language: str
+    locale: str
+    created_at: datetime
+    expiry_date: datetime
+
+
+class GameListResponse(BaseModel):
+    """A page of games; pass next_cursor back as `cursor` for the next page"""
+
+    items: list[GameSummaryResponse]
+    next_cursor: str | None = None
+
+
+def to_game_summary_response(game: Game) -> GameSummaryResponse:
+    return GameSummaryResponse(
+        game_id=str(game.id),
+        name=game.name,
+        owner_id=str(game.owner_id),
+        status=game.status,
+        language=game.language,
+        locale=game.locale,
+        created_at=game.created_at,
+        expiry_date=game.expiry_date,
+    )
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+
+class DbPoolStatsResponse(BaseModel):
+    """Snapshot of the Postgres connection pool"""
+
+    min_size: int
+    max_size: int
+    size: int
+    idle: int
+    in_use: int
+    waiting: int
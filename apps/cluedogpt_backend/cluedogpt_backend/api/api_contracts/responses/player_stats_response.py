@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+
+
+class PlayerStatsResponse(BaseModel):
+    """A player's totals across all games"""
+
+    player_id: str
+    games_played: int
+    games_solved: int
+    proposals_count: int
+    questions_count: int
+    average_correct: float | None = None
+    questions_per_solve: float | None = None
+
+
+class LeaderboardEntry(PlayerStatsResponse):
+    """A player's rank and totals on the leaderboard"""
+
+    rank: int
+    name: str
+
+
+class LeaderboardResponse(BaseModel):
+    """Top players by games solved, then by correct proposal fields"""
+
+    entries: list[LeaderboardEntry]
@@ -0,0 +1,44 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from cluedogpt_backend.models.postgres_models import Proposal
+
+
+class ProposalResponse(BaseModel):
+    """A graded guess at the solution of a game"""
+
+    proposal_id: str
+    game_id: str
+    culprit: str
+    weapon: str
+    motive: str
+    correct_count: int
+    is_culprit_correct: bool
+    is_weapon_correct: bool
+    is_motive_correct: bool
+    explanation: str | None = None
+    created_at: datetime
+
+
+class ProposalListResponse(BaseModel):
+    """A page of proposals; pass next_cursor back as `cursor` for the next page"""
+
+    items: list[ProposalResponse]
+    next_cursor: str | None = None
+
+
+def to_proposal_response(proposal: Proposal) -> ProposalResponse:
+    return ProposalResponse(
+        proposal_id=str(proposal.id),
+        game_id=str(proposal.game_id),
+        culprit=proposal.culprit,
+        weapon=proposal.weapon,
+        motive=proposal.motive,
+        correct_count=proposal.correct_count,
+        is_culprit_correct=proposal.is_culprit_correct,
+        is_weapon_correct=proposal.is_weapon_correct,
+        is_motive_correct=proposal.is_motive_correct,
+        explanation=proposal.explanation,
+        created_at=proposal.created_at,
+    )
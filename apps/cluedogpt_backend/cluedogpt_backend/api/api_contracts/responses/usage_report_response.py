@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from cluedogpt_backend.services.usage_report_service import UsageGroupBy
+
+
+class AgentUsageRow(BaseModel):
+    """Latency percentiles and token spend of the agent runs in one group"""
+
+    key: str | None
+    runs: int
+    latency_p50_ms: float
+    latency_p95_ms: float
+    latency_p99_ms: float
+    input_tokens: int
+    output_tokens: int
+
+
+class AgentUsageReportResponse(BaseModel):
+    """Agent run usage over [since, until), grouped by game, agent or day"""
+
+    group_by: UsageGroupBy
+    since: datetime
+    until: datetime
+    rows: list[AgentUsageRow]
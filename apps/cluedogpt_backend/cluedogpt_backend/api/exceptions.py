@@ -81,3 +81,41 @@ class ServerError(Exception):
         self.details = details
         self.error_code = error_code
         super().__init__(message)
+
+
+class RateLimitedError(Exception):
+    """
+    Custom exception for a player sending requests faster than their rate limit.
+    This will be caught by the error handling middleware and converted to a 429 Too Many Requests.
+    """
+
+    def __init__(self, message: str, retry_after: float):
+        """
+        Initialize rate limited exception.
+
+        Args:
+            message: The error message
+            retry_after: Seconds until the request would be accepted
+        """
+        self.message = message
+        self.retry_after = retry_after
+        super().__init__(message)
+
+
+class OverloadedError(Exception):
+    """
+    Custom exception for requests shed because the server is at capacity.
+    This will be caught by the error handling middleware and converted to a 503 Service Unavailable.
+    """
+
+    def __init__(self, message: str, retry_after: float):
+        """
+        Initialize overloaded exception.
+
+        Args:
+            message: The error message
+            retry_after: Seconds the client should wait before retrying
+        """
+        self.message = message
+        self.retry_after = retry_after
+        super().__init__(message)
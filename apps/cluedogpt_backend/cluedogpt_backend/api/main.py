@@ -1,11 +1,26 @@
+import functools
 from contextlib import asynccontextmanager
+from typing import Any
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from starlette import status
 
-from cluedogpt_backend.api.routers import items
-from cluedogpt_backend.app_logging import initialize_logging_from_settings
+from cluedogpt_backend.ai.registry import configured_providers
+from cluedogpt_backend.api.exceptions import BadRequestError, OverloadedError, RateLimitedError, ResourceNotFoundError
+from cluedogpt_backend.api.middleware.metrics import MetricsMiddleware
+from cluedogpt_backend.api.middleware.request_context import RequestContextMiddleware
+from cluedogpt_backend.api.routers import auth, games, internal, items, metrics, players
+from cluedogpt_backend.app_logging import initialize_logging_from_settings, shutdown_logging
+from cluedogpt_backend.infrastructure.admission import retry_after_header
+from cluedogpt_backend.infrastructure.http_client import provider_http_client
 from cluedogpt_backend.infrastructure.postgres_db import init_db
+from cluedogpt_backend.services.expiry_sweeper import expiry_sweeper
+from cluedogpt_backend.services.game_init_jobs import game_init_job_queue
+from cluedogpt_backend.services.game_rooms import game_rooms
+from cluedogpt_backend.services.question_batcher import question_batcher
+from cluedogpt_backend.services.warm_pool import warm_pool_producer
 from cluedogpt_backend.settings import settings
 
 
@@ -16,45 +31,123 @@ async def lifespan(_app: FastAPI):
     # Initialize databases on startup
     await init_db()
 
+    # Connect to the model providers before the first request (or job) needs them
+    await provider_http_client.warm_up([provider.base_url for provider in configured_providers()])
+
+    # Start background workers once the database is available
+    await game_init_job_queue.start()
+    warm_pool_producer.start()
+    expiry_sweeper.start()
+    game_rooms.start()
+
     yield
 
     # Clean up resources on shutdown
+    await game_rooms.stop()
+    await expiry_sweeper.stop()
+    await warm_pool_producer.stop()
+    await game_init_job_queue.stop()
+    await question_batcher.stop()
+    await provider_http_client.close()
 
     # Postgres cleanup will be handled by Tortoise ORM automatically
 
+    # Flush buffered log records last, so shutdown messages are not lost
+    shutdown_logging()
+
+
+async def resource_not_found_handler(_request: Request, exc: ResourceNotFoundError) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_404_NOT_FOUND,
+        content={"error_code": exc.error_code, "message": exc.message, "details": exc.details},
+    )
+
+
+async def bad_request_handler(_request: Request, exc: BadRequestError) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={"error_code": exc.error_code, "message": exc.message, "details": exc.details},
+    )
+
+
+async def rate_limited_handler(_request: Request, exc: RateLimitedError) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"error_code": "rate_limited", "message": exc.message, "details": None},
+        headers=retry_after_header(exc.retry_after),
+    )
+
+
+async def overloaded_handler(_request: Request, exc: OverloadedError) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"error_code": "overloaded", "message": exc.message, "details": None},
+        headers=retry_after_header(exc.retry_after),
+    )
+
+
+def create_app() -> FastAPI:
+    """Build the application; settings are read here, not when this module is imported."""
+    # Create FastAPI app with hardcoded branding
+    app = FastAPI(
+        title="Cluedogpt Backend API",
+        description="API for Cluedogpt Backend",
+        version="1.0.0",
+        # Only enable Swagger/ReDoc if documentation is enabled
+        docs_url="/docs" if settings().enable_docs else None,
+        redoc_url="/redoc" if settings().enable_docs else None,
+        lifespan=lifespan,
+        # Add additional branding in the API metadata
+        openapi_tags=[
+            {
+                "name": "Cluedogpt Backend",
+                "description": "Cluedogpt Backend API documentation",
+            },
+        ],
+    )
+
+    # Add CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings().cors_allow_origins,
+        allow_credentials=settings().cors_allow_credentials,
+        allow_methods=settings().cors_allow_methods,
+        allow_headers=settings().cors_allow_headers,
+    )
+    app.add_middleware(MetricsMiddleware)
+    app.add_middleware(RequestContextMiddleware)
+
+    app.add_exception_handler(ResourceNotFoundError, resource_not_found_handler)
+    app.add_exception_handler(BadRequestError, bad_request_handler)
+    app.add_exception_handler(RateLimitedError, rate_limited_handler)
+    app.add_exception_handler(OverloadedError, overloaded_handler)
+
+    # Include routers
+    app.include_router(auth)
+    app.include_router(items, prefix="/api/v1", tags=["items"])
+    app.include_router(games, prefix="/api/v1")
+    app.include_router(players, prefix="/api/v1")
+    app.include_router(internal)
+    app.include_router(metrics)
+
+    return app
+
+
+@functools.cache
+def _app() -> FastAPI:
+    return create_app()
+
+
+def __getattr__(name: str) -> Any:
+    # `app`, which uvicorn and the tests import, is built on first access so that importing this module (aerich,
+    # tooling) works without the environment
+    if name == "app":
+        return _app()
 
-# Create FastAPI app with hardcoded branding
-app = FastAPI(
-    title="Cluedogpt Backend API",
-    description="API for Cluedogpt Backend",
-    version="1.0.0",
-    # Only enable Swagger/ReDoc if documentation is enabled
-    docs_url="/docs" if settings.enable_docs else None,
-    redoc_url="/redoc" if settings.enable_docs else None,
-    lifespan=lifespan,
-    # Add additional branding in the API metadata
-    openapi_tags=[
-        {
-            "name": "Cluedogpt Backend",
-            "description": "Cluedogpt Backend API documentation",
-        },
-    ],
-)
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_allow_origins,
-    allow_credentials=settings.cors_allow_credentials,
-    allow_methods=settings.cors_allow_methods,
-    allow_headers=settings.cors_allow_headers,
-)
-
-# Include routers
-app.include_router(items, prefix="/api/v1", tags=["items"])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host=settings.api_host, port=settings.api_port)
+    uvicorn.run(create_app(), host=settings().api_host, port=settings().api_port)
@@ -0,0 +1,59 @@
+import time
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from cluedogpt_backend.infrastructure.metrics import (
+    RequestQueryStats,
+    http_request_db_queries,
+    http_request_db_seconds,
+    http_request_duration_seconds,
+    request_query_stats,
+)
+
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def _route_template(scope: Scope) -> str:
+    """The path template of the matching route (e.g. /api/v1/game-init/jobs/{job_id}), so ids do not become labels."""
+    for route in scope["app"].routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", UNMATCHED_ROUTE)
+
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request latency and the database queries issued per request, by route."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = request_query_stats.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            request_query_stats.reset(token)
+
+            method = scope["method"]
+            route = _route_template(scope)
+            http_request_duration_seconds.observe(time.perf_counter() - start, method=method, route=route, status=str(status_code))
+            http_request_db_queries.observe(stats.count, method=method, route=route)
+            http_request_db_seconds.observe(stats.seconds, method=method, route=route)
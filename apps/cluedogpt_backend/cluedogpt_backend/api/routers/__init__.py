@@ -1,5 +1,15 @@
+from api.routers.auth import router as auth_router
 from api.routers.game_init import router as items_router
+from api.routers.games import router as games_router
+from api.routers.internal import router as internal_router
+from api.routers.metrics import router as metrics_router
+from api.routers.players import router as players_router
 
 
 # Export routers - this makes it possible to import them from the routers package directly
+auth = auth_router
 items = items_router
+games = games_router
+internal = internal_router
+metrics = metrics_router
+players = players_router
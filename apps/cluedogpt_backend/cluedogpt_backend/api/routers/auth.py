@@ -3,7 +3,9 @@ from api.api_contracts.responses.auth_response import SignUpResponse
 from auth.jwt_auth import create_access_token, create_refresh_token
 from dto.user import UserJwt
 from fastapi import APIRouter, Response
-from models.postgres_models import Player
+from tortoise.transactions import in_transaction
+
+from cluedogpt_backend.models.postgres_models import Player, PlayerStats
 
 
 # Create a router for items
@@ -15,9 +17,12 @@ router = APIRouter(
 
 @router.post("/sign-up", response_model=SignUpResponse)
 async def sign_up(request: SignUpRequest, response: Response):
-    player = await Player.create(
-        name=request.username,
-    )
+    async with in_transaction() as connection:
+        player = await Player.create(
+            name=request.username,
+            using_db=connection,
+        )
+        await PlayerStats.create(player=player, using_db=connection)
 
     user_jwt = UserJwt(
         name=player.name,
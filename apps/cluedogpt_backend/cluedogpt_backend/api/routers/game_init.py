@@ -1,7 +1,15 @@
 
 from api.api_contracts.requests.game_init_requests import GameInitIterationRequest
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 from services.game_init_service import GameInitService
+from starlette import status
+
+from cluedogpt_backend.api.admission import get_rate_limited_user, llm_capacity, llm_slot
+from cluedogpt_backend.api.api_contracts.responses.game_init_response import GameInitJobResponse
+from cluedogpt_backend.auth.dependencies import get_current_user_from_jwt
+from cluedogpt_backend.dto.user import UserJwt
+from cluedogpt_backend.models.postgres_models import GameInitJob
 
 
 # Create a router for items
@@ -11,6 +19,50 @@ router = APIRouter(
 )
 
 
-@router.post("/iteration")
-async def iteration(request: GameInitIterationRequest, service: GameInitService = Depends(GameInitService)):
-    return service.iterate_game_init(request)
+def _job_response(job: GameInitJob) -> GameInitJobResponse:
+    return GameInitJobResponse(
+        job_id=str(job.id),
+        game_id=str(job.game_id),
+        status=job.status,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+@router.post("/iteration", status_code=status.HTTP_202_ACCEPTED, response_model=GameInitJobResponse)
+async def iteration(
+    request: GameInitIterationRequest,
+    service: GameInitService = Depends(GameInitService),
+    user: UserJwt = Depends(get_rate_limited_user),
+    _capacity: None = Depends(llm_capacity),
+):
+    job = await service.iterate_game_init(request, user.user_id)
+
+    return _job_response(job)
+
+
+@router.get("/jobs/{job_id}", response_model=GameInitJobResponse)
+async def job_status(
+    job_id: str,
+    service: GameInitService = Depends(GameInitService),
+    user: UserJwt = Depends(get_current_user_from_jwt),
+):
+    job = await service.get_job(job_id, user.user_id)
+
+    return _job_response(job)
+
+
+@router.post("/iteration/stream")
+async def iteration_stream(
+    request: GameInitIterationRequest,
+    service: GameInitService = Depends(GameInitService),
+    user: UserJwt = Depends(get_rate_limited_user),
+    _slot: None = Depends(llm_slot, scope="request"),
+):
+    return StreamingResponse(
+        service.stream_game_init(request, user.user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,112 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketException
+from fastapi.responses import StreamingResponse
+from starlette import status
+
+from cluedogpt_backend.api.admission import get_rate_limited_user, llm_capacity, llm_slot
+from cluedogpt_backend.api.api_contracts.requests.game_question_requests import GameQuestionRequest
+from cluedogpt_backend.api.api_contracts.requests.proposal_requests import ProposalRequest
+from cluedogpt_backend.api.api_contracts.responses.game_question_response import GameQuestionListResponse, GameQuestionResponse, to_question_response
+from cluedogpt_backend.api.api_contracts.responses.game_response import GameListResponse, to_game_summary_response
+from cluedogpt_backend.api.api_contracts.responses.proposal_response import ProposalResponse, to_proposal_response
+from cluedogpt_backend.api.exceptions import ResourceNotFoundError
+from cluedogpt_backend.auth.dependencies import get_current_user_from_jwt, get_current_user_from_websocket
+from cluedogpt_backend.dto.user import UserJwt
+from cluedogpt_backend.services.game_access import get_player_game
+from cluedogpt_backend.services.game_question_service import GameQuestionService
+from cluedogpt_backend.services.game_rooms import game_rooms
+from cluedogpt_backend.services.listing_service import ListingService
+from cluedogpt_backend.services.proposal_service import ProposalService
+
+
+# Create a router for gameplay endpoints
+router = APIRouter(
+    prefix="/games",
+    tags=["Gameplay"],
+)
+
+
+@router.get("", response_model=GameListResponse)
+async def list_games(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    service: ListingService = Depends(ListingService),
+    user: UserJwt = Depends(get_current_user_from_jwt),
+):
+    page = await service.list_games(user.user_id, limit, cursor)
+
+    return GameListResponse(items=[to_game_summary_response(game) for game in page.items], next_cursor=page.next_cursor)
+
+
+@router.get("/{game_id}/questions", response_model=GameQuestionListResponse)
+async def list_questions(
+    game_id: UUID,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    service: ListingService = Depends(ListingService),
+    user: UserJwt = Depends(get_current_user_from_jwt),
+):
+    page = await service.list_questions(str(game_id), user.user_id, limit, cursor)
+
+    return GameQuestionListResponse(items=[to_question_response(question) for question in page.items], next_cursor=page.next_cursor)
+
+
+@router.post("/{game_id}/questions", response_model=GameQuestionResponse)
+async def ask_question(
+    game_id: UUID,
+    request: GameQuestionRequest,
+    service: GameQuestionService = Depends(GameQuestionService),
+    user: UserJwt = Depends(get_rate_limited_user),
+    # The batcher takes one slot per model call; the request only checks that there is room to queue
+    _capacity: None = Depends(llm_capacity),
+):
+    game, question = await service.ask_question(str(game_id), user.user_id, request.question)
+    question = await service.answer(game, question)
+
+    return to_question_response(question)
+
+
+@router.post("/{game_id}/questions/stream")
+async def ask_question_stream(
+    game_id: UUID,
+    request: GameQuestionRequest,
+    service: GameQuestionService = Depends(GameQuestionService),
+    user: UserJwt = Depends(get_rate_limited_user),
+    _slot: None = Depends(llm_slot, scope="request"),
+):
+    # Validated and stored before the response starts, so refusals are plain 400/404 responses instead of a broken stream
+    game, question = await service.ask_question(str(game_id), user.user_id, request.question)
+
+    return StreamingResponse(
+        service.stream_answer(game, question),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/{game_id}/proposals", response_model=ProposalResponse)
+async def submit_proposal(
+    game_id: UUID,
+    request: ProposalRequest,
+    service: ProposalService = Depends(ProposalService),
+    user: UserJwt = Depends(get_rate_limited_user),
+):
+    proposal = await service.submit(str(game_id), user.user_id, request)
+
+    return to_proposal_response(proposal)
+
+
+@router.websocket("/{game_id}/ws")
+async def game_room(
+    websocket: WebSocket,
+    game_id: UUID,
+    user: UserJwt = Depends(get_current_user_from_websocket),
+):
+    """The game's events (question_answered, proposal_graded, story_updated) as JSON text messages, for as long as the socket stays open."""
+    try:
+        await get_player_game(str(game_id), user.user_id)
+    except ResourceNotFoundError as e:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason=e.message) from e
+
+    await game_rooms.serve(str(game_id), user.user_id, websocket)
@@ -0,0 +1,33 @@
+from dataclasses import asdict
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Query
+
+from cluedogpt_backend.api.api_contracts.responses.internal_response import DbPoolStatsResponse
+from cluedogpt_backend.api.api_contracts.responses.usage_report_response import AgentUsageReportResponse
+from cluedogpt_backend.auth.dependencies import require_internal_token
+from cluedogpt_backend.infrastructure.postgres_db import get_pool_stats
+from cluedogpt_backend.services.usage_report_service import UsageGroupBy, UsageReportService
+
+
+# Create a router for internal/operational endpoints
+router = APIRouter(
+    prefix="/internal",
+    tags=["Internal"],
+)
+
+
+@router.get("/db-pool", response_model=DbPoolStatsResponse, dependencies=[Depends(require_internal_token)])
+async def db_pool_stats():
+    return DbPoolStatsResponse(**asdict(get_pool_stats()))
+
+
+@router.get("/agent-usage", response_model=AgentUsageReportResponse, dependencies=[Depends(require_internal_token)])
+async def agent_usage(
+    group_by: UsageGroupBy = UsageGroupBy.AGENT,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    limit: int = Query(100, ge=1, le=1000),
+    service: UsageReportService = Depends(UsageReportService),
+):
+    return await service.agent_usage(group_by, since, until, limit)
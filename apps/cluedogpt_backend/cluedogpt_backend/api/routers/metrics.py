@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from cluedogpt_backend.auth.dependencies import require_internal_token
+from cluedogpt_backend.infrastructure.http_client import provider_http_client
+from cluedogpt_backend.infrastructure.metrics import CONTENT_TYPE, db_pool_connections, llm_http_pool_connections, llm_http_pool_limits, metrics_registry
+from cluedogpt_backend.infrastructure.postgres_db import get_pool_stats
+
+
+# Create a router for the Prometheus scrape endpoint
+router = APIRouter(
+    tags=["Internal"],
+)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False, dependencies=[Depends(require_internal_token)])
+async def metrics():
+    pool = get_pool_stats()
+    db_pool_connections.set(pool.idle, state="idle")
+    db_pool_connections.set(pool.in_use, state="in_use")
+    db_pool_connections.set(pool.waiting, state="waiting")
+
+    http_pool = provider_http_client.pool_stats()
+    llm_http_pool_connections.set(http_pool.idle, state="idle")
+    llm_http_pool_connections.set(http_pool.active, state="active")
+    llm_http_pool_limits.set(http_pool.max_connections, limit="max_connections")
+    llm_http_pool_limits.set(http_pool.max_keepalive_connections, limit="max_keepalive_connections")
+
+    return PlainTextResponse(metrics_registry.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,68 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+
+from cluedogpt_backend.api.api_contracts.responses.player_stats_response import LeaderboardEntry, LeaderboardResponse, PlayerStatsResponse
+from cluedogpt_backend.api.api_contracts.responses.proposal_response import ProposalListResponse, to_proposal_response
+from cluedogpt_backend.auth.dependencies import get_current_user_from_jwt
+from cluedogpt_backend.dto.user import UserJwt
+from cluedogpt_backend.services.listing_service import ListingService
+from cluedogpt_backend.services.player_stats_service import PlayerStatsService
+
+
+# Create a router for player endpoints
+router = APIRouter(
+    prefix="/players",
+    tags=["Players"],
+)
+
+
+def _ratio(numerator: int, denominator: int) -> float | None:
+    return round(numerator / denominator, 2) if denominator else None
+
+
+def _stats_fields(stats: dict) -> dict:
+    return {
+        "player_id": str(stats["player_id"]),
+        "games_played": stats["games_played"],
+        "games_solved": stats["games_solved"],
+        "proposals_count": stats["proposals_count"],
+        "questions_count": stats["questions_count"],
+        "average_correct": _ratio(stats["correct_total"], stats["proposals_count"]),
+        "questions_per_solve": _ratio(stats["questions_count"], stats["games_solved"]),
+    }
+
+
+@router.get("/me/stats", response_model=PlayerStatsResponse)
+async def my_stats(
+    service: PlayerStatsService = Depends(PlayerStatsService),
+    user: UserJwt = Depends(get_current_user_from_jwt),
+):
+    stats = await service.get_stats(user.user_id)
+
+    return PlayerStatsResponse(**_stats_fields(stats))
+
+
+@router.get("/leaderboard", response_model=LeaderboardResponse)
+async def leaderboard(
+    limit: int = Query(10, ge=1, le=100),
+    service: PlayerStatsService = Depends(PlayerStatsService),
+):
+    rows = await service.leaderboard(limit)
+
+    return LeaderboardResponse(
+        entries=[LeaderboardEntry(rank=rank, name=row["player__name"], **_stats_fields(row)) for rank, row in enumerate(rows, start=1)],
+    )
+
+
+@router.get("/me/proposals", response_model=ProposalListResponse)
+async def my_proposals(
+    game_id: UUID | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    service: ListingService = Depends(ListingService),
+    user: UserJwt = Depends(get_current_user_from_jwt),
+):
+    page = await service.list_proposals(user.user_id, str(game_id) if game_id else None, limit, cursor)
+
+    return ProposalListResponse(items=[to_proposal_response(proposal) for proposal in page.items], next_cursor=page.next_cursor)
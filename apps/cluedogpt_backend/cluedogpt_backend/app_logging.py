@@ -1,9 +1,65 @@
+import copy
+import json
 import logging
+import queue
 import sys
-from logging.config import dictConfig
-from logging.handlers import RotatingFileHandler
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
-from settings import settings
+from cluedogpt_backend.settings import settings
+
+
+# Per-request context, attached to every log record emitted while it is set
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+game_id_var: ContextVar[str | None] = ContextVar("game_id", default=None)
+
+_listener: QueueListener | None = None
+
+
+class ContextFilter(logging.Filter):
+    """Copy the request/game context onto the record. Runs on the emitting thread, where the context vars are set."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        record.game_id = game_id_var.get()
+        return True
+
+
+class ContextQueueHandler(QueueHandler):
+    """
+    Queue records for the listener without formatting them.
+
+    QueueHandler.prepare() formats the record, traceback included, into its message and drops exc_info, which left
+    the listener's formatters nothing to render the exception from. Only the message arguments are merged here,
+    while they are still current.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with the request context and an optional `latency_ms` passed through `extra`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+            "game_id": getattr(record, "game_id", None),
+        }
+        if hasattr(record, "latency_ms"):
+            entry["latency_ms"] = record.latency_ms
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(entry, ensure_ascii=False)
 
 
 def setup_logging(
@@ -12,61 +68,71 @@ def setup_logging(
     file_level: str = "INFO",
     max_bytes: int = 10 * 1024 * 1024,  # 10 MB
     backup_count: int = 5,
+    json_format: bool = False,
 ) -> None:
     """
-    Configure logging with console and rotating file handlers.
+    Configure logging with console and rotating file handlers, fed through a queue.
 
+    - The root logger only gets a QueueHandler, so callers never format or write on the event loop thread
+    - A QueueListener thread formats records and writes them to the console and the rotating file
     - Console: prints to stdout with configurable level (default INFO)
     - Rotating file: writes to log_file with configurable level, rotates at max_bytes, keeps backup_count files
     """
-    log_config = {
-        "version": 1,
-        "disable_existing_loggers": False,
-        "formatters": {
-            "standard": {
-                "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-                "datefmt": "%Y-%m-%d %H:%M:%S",
-            },
-        },
-        "handlers": {
-            "console": {
-                "class": "logging.StreamHandler",
-                "level": console_level,
-                "formatter": "standard",
-                "stream": sys.stdout,
-            },
-            "rotating_file": {
-                "()": RotatingFileHandler,
-                "level": file_level,
-                "formatter": "standard",
-                "filename": log_file,
-                "mode": "a",
-                "encoding": "utf-8",
-                "maxBytes": max_bytes,
-                "backupCount": backup_count,
-            },
-        },
-        "root": {
-            "handlers": ["console", "rotating_file"],
-            "level": console_level,
-        },
-    }
-
-    dictConfig(log_config)
+    global _listener
+
+    shutdown_logging()
+
+    if json_format:
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S",
+        )
+
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(console_level)
+    console_handler.setFormatter(formatter)
+
+    file_handler = RotatingFileHandler(log_file, mode="a", encoding="utf-8", maxBytes=max_bytes, backupCount=backup_count)
+    file_handler.setLevel(file_level)
+    file_handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = ContextQueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(min(logging.getLevelName(console_level), logging.getLevelName(file_level)))
+
+    _listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush pending records and stop the listener thread."""
+    global _listener
+
+    if _listener is None:
+        return
+
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
 
 
 def initialize_logging_from_settings():
     """Initialize logging using settings from the environment."""
-    # Import here to avoid circular imports
-
     setup_logging(
         console_level=settings().console_log_level,
         file_level=settings().file_log_level,
+        json_format=settings().log_json_format,
     )
 
 
-# Initialize with default settings on import
-setup_logging()
-
 # Export logger for application use
 logger = logging.getLogger("cluedogpt")
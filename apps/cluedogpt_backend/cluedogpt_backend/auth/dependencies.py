@@ -1,4 +1,6 @@
-from fastapi import Depends, HTTPException, Request, Security
+import hmac
+
+from fastapi import Depends, HTTPException, Request, Security, WebSocket, WebSocketException
 from fastapi.security import HTTPBearer
 from fastapi.security.http import HTTPAuthorizationCredentials
 from starlette import status
@@ -6,6 +8,7 @@ from starlette import status
 from cluedogpt_backend.api.exceptions import BadRequestError
 from cluedogpt_backend.auth.jwt_auth import verify_token
 from cluedogpt_backend.dto.user import UserJwt
+from cluedogpt_backend.settings import settings
 
 
 # Security schemes
@@ -48,6 +51,31 @@ async def get_current_user_from_jwt(
     return user
 
 
+async def get_current_user_from_websocket(websocket: WebSocket) -> UserJwt:
+    """Same as get_current_user_from_jwt for WebSockets: browsers send the access_token cookie with the handshake."""
+    access_token = websocket.cookies.get("access_token")
+    payload = verify_token(access_token, "access") if access_token else None
+
+    if not payload or not payload.get("user_id"):
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Invalid access token")
+
+    return UserJwt(**payload)
+
+
+async def require_internal_token(token: HTTPAuthorizationCredentials | None = Security(jwt_bearer)) -> None:
+    """Guard for operational endpoints: the request must carry INTERNAL_API_TOKEN as a bearer token."""
+    expected = settings().internal_api_token
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Internal endpoints are disabled")
+
+    if token is None or not hmac.compare_digest(token.credentials.encode(), expected.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid internal token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
 async def authenticate_user(
     request: Request,
     user: UserJwt | None = Depends(get_current_user_from_jwt),
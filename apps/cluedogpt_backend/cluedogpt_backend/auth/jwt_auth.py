@@ -1,3 +1,6 @@
+import hashlib
+import time
+from collections import OrderedDict
 from datetime import UTC, datetime, timedelta
 from typing import Any, Dict
 
@@ -12,6 +15,64 @@ from cluedogpt_backend.settings import settings
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+def _signing_params() -> tuple[str, str]:
+    """JWT secret and algorithm, read from the settings on every use so they are never frozen at import."""
+    return settings().jwt_secret_key, settings().jwt_algorithm
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of already-verified token payloads, keyed by the SHA-256 digest of the token and the signing parameters
+    it was verified with. Entries are only served until the token's own `exp`, so a cached token never outlives its validity.
+
+    Without an explicit max_entries, the size limit is read from the settings on use rather than at import.
+    """
+
+    def __init__(self, max_entries: int | None = None) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[bytes, Dict[str, Any]] = OrderedDict()
+
+    @property
+    def max_entries(self) -> int:
+        return settings().jwt_verified_token_cache_size if self._max_entries is None else self._max_entries
+
+    @staticmethod
+    def digest(token: str, secret_key: str = "", algorithm: str = "") -> bytes:
+        return hashlib.sha256(f"{algorithm}:{secret_key}:{token}".encode()).digest()
+
+    def get(self, digest: bytes) -> Dict[str, Any] | None:
+        payload = self._entries.get(digest)
+        if payload is None:
+            return None
+
+        if payload["exp"] <= time.time():
+            del self._entries[digest]
+            return None
+
+        self._entries.move_to_end(digest)
+        return payload
+
+    def set(self, digest: bytes, payload: Dict[str, Any]) -> None:
+        max_entries = self.max_entries
+        if max_entries <= 0 or "exp" not in payload:
+            return
+
+        self._entries[digest] = payload
+        self._entries.move_to_end(digest)
+
+        while len(self._entries) > max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+verified_token_cache = VerifiedTokenCache()
+
+
 def create_access_token(data: UserJwt, expires_delta: timedelta | None = None) -> tuple[str, UserJwtWithTokenProperties]:
     """Create a JWT access token."""
     if expires_delta:
@@ -33,7 +94,8 @@ def create_access_token(data: UserJwt, expires_delta: timedelta | None = None) -
         type=token_type,
     )
 
-    encoded_jwt = jwt.encode(user_jwt_with_props.model_dump(), settings().jwt_secret_key, algorithm=settings().jwt_algorithm)
+    secret_key, algorithm = _signing_params()
+    encoded_jwt = jwt.encode(user_jwt_with_props.model_dump(), secret_key, algorithm=algorithm)
     return encoded_jwt, user_jwt_with_props
 
 
@@ -58,19 +120,27 @@ def create_refresh_token(data: UserJwt, expires_delta: timedelta | None = None)
         type=token_type,
     )
 
-    encoded_jwt = jwt.encode(user_jwt_with_props.model_dump(), settings().jwt_secret_key, algorithm=settings().jwt_algorithm)
+    secret_key, algorithm = _signing_params()
+    encoded_jwt = jwt.encode(user_jwt_with_props.model_dump(), secret_key, algorithm=algorithm)
     return encoded_jwt, user_jwt_with_props
 
 
 def verify_token(token: str, token_type: str = "access") -> Dict[str, Any] | None:  # noqa: S107
-    """Verify and decode a JWT token."""
-    try:
-        payload = jwt.decode(token, settings().jwt_secret_key, algorithms=[settings().jwt_algorithm])
-
-        # Check if the token type matches
-        if payload.get("type") != token_type:
+    """Verify and decode a JWT token. Tokens that already passed verification are served from the cache until they expire."""
+    secret_key, algorithm = _signing_params()
+    digest = verified_token_cache.digest(token, secret_key, algorithm)
+    payload = verified_token_cache.get(digest)
+
+    if payload is None:
+        try:
+            payload = jwt.decode(token, secret_key, algorithms=[algorithm])
+        except jwt.PyJWTError:
             return None
 
-        return payload
-    except jwt.PyJWTError:
+        verified_token_cache.set(digest, payload)
+
+    # Check if the token type matches
+    if payload.get("type") != token_type:
         return None
+
+    return dict(payload)
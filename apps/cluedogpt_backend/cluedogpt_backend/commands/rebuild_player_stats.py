@@ -0,0 +1,33 @@
+"""
+Recompute player_stats from the proposals and game_questions tables.
+
+Players are rebuilt in chunks, each in its own short transaction, so the command can run while the app is serving.
+
+Usage:
+    python -m cluedogpt_backend.commands.rebuild_player_stats [--chunk-size 500]
+"""
+
+import argparse
+import asyncio
+import time
+
+from cluedogpt_backend.infrastructure.postgres_db import close_connections, init_db
+from cluedogpt_backend.services.player_stats_service import rebuild_player_stats
+
+
+async def main(chunk_size: int) -> None:
+    await init_db()
+    try:
+        start = time.perf_counter()
+        rebuilt = await rebuild_player_stats(chunk_size)
+        print(f"Rebuilt the stats of {rebuilt} players in {time.perf_counter() - start:.1f}s")
+    finally:
+        await close_connections()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chunk-size", type=int, default=500, help="Players rebuilt per transaction")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.chunk_size))
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+
+class QuestionAnswer(BaseModel):
+    number: int
+    answer: str
+
+
+class GameMasterAnswers(BaseModel):
+    answers: list[QuestionAnswer]
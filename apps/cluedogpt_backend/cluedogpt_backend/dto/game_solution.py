@@ -1,7 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class GameSolution(BaseModel):
-    culprit: str
-    weapon: str
-    motive: str
\ No newline at end of file
+    # Bounded like the Game columns, so an overlong answer is sent back to the model instead of failing the save
+    culprit: str = Field(max_length=255)
+    weapon: str = Field(max_length=255)
+    motive: str = Field(max_length=255)
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+
+class ProposalJudgement(BaseModel):
+    culprit_correct: bool
+    weapon_correct: bool
+    motive_correct: bool
+    explanation: str
@@ -0,0 +1,128 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from cluedogpt_backend.api.exceptions import OverloadedError, RateLimitedError
+from cluedogpt_backend.infrastructure.metrics import admission_rejections_total, llm_in_flight, llm_queue_depth
+from cluedogpt_backend.settings import settings
+
+
+# Buckets of the least recently seen players are dropped past this many; a dropped player starts again with a full bucket
+MAX_TRACKED_PLAYERS = 10_000
+
+
+class ConcurrencyLimiter:
+    """
+    Caps the model-backed work in flight at llm_max_concurrency, with a bounded wait queue in front.
+
+    Requests are shed with OverloadedError when llm_max_queue are already waiting, or when their wait passes
+    llm_queue_timeout_seconds, so a burst gets fast 503s instead of piling onto the provider's rate limits.
+    Background work (game init jobs, the warm pool) waits without a bound or timeout, but is counted in the
+    queue depth so requests are shed first.
+    """
+
+    def __init__(self) -> None:
+        self._semaphore: asyncio.Semaphore | None = None
+        self.waiting = 0
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Created on first use, so importing this module does not read settings
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(settings().llm_max_concurrency)
+
+        return self._semaphore
+
+    def saturated(self) -> bool:
+        """Whether a request asking for a slot now would be rejected without waiting."""
+        return self.semaphore.locked() and self.waiting >= settings().llm_max_queue
+
+    @asynccontextmanager
+    async def slot(self, background: bool = False) -> AsyncIterator[None]:
+        if not background and self.saturated():
+            admission_rejections_total.inc(reason="queue_full")
+            raise OverloadedError("Too many requests in progress, try again shortly", retry_after=1)
+
+        self._set_waiting(self.waiting + 1)
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), timeout=None if background else settings().llm_queue_timeout_seconds)
+        except TimeoutError:
+            admission_rejections_total.inc(reason="queue_timeout")
+            raise OverloadedError("Timed out waiting for capacity, try again shortly", retry_after=1) from None
+        finally:
+            self._set_waiting(self.waiting - 1)
+
+        llm_in_flight.inc()
+        try:
+            yield
+        finally:
+            llm_in_flight.dec()
+            self.semaphore.release()
+
+    def _set_waiting(self, waiting: int) -> None:
+        self.waiting = waiting
+        llm_queue_depth.set(waiting)
+
+
+class TokenBucket:
+    def __init__(self, capacity: float, refill_per_second: float) -> None:
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def take(self) -> float:
+        """Take a token; returns 0 if there was one, else the seconds until there will be."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second)
+        self.updated_at = now
+
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+
+        return (1 - self.tokens) / self.refill_per_second
+
+
+class PlayerRateLimiter:
+    """
+    Per-player token buckets: player_rate_limit_burst requests at once, refilled at player_rate_limit_per_minute.
+
+    Buckets live in the worker process, so with several workers a player's effective limit is multiplied by their count.
+    """
+
+    def __init__(self) -> None:
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+
+    def check(self, player_id: str) -> None:
+        """Raise RateLimitedError if the player is over their limit."""
+        per_minute = settings().player_rate_limit_per_minute
+        if per_minute <= 0:
+            return
+
+        bucket = self._buckets.get(player_id)
+        if bucket is None:
+            bucket = self._buckets[player_id] = TokenBucket(settings().player_rate_limit_burst, per_minute / 60)
+            if len(self._buckets) > MAX_TRACKED_PLAYERS:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(player_id)
+
+        retry_after = bucket.take()
+        if retry_after:
+            admission_rejections_total.inc(reason="rate_limited")
+            raise RateLimitedError("Too many requests, slow down", retry_after=retry_after)
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
+llm_limiter = ConcurrencyLimiter()
+player_rate_limiter = PlayerRateLimiter()
+
+
+def retry_after_header(seconds: float) -> dict[str, str]:
+    return {"Retry-After": str(max(1, math.ceil(seconds)))}
@@ -0,0 +1,117 @@
+"""
+The HTTP client shared by every model provider of this worker.
+
+One pooled httpx.AsyncClient keeps connections to the providers alive between calls, so most requests skip the
+TCP and TLS handshakes. The app's lifespan opens a connection to each provider before serving traffic, and closes
+the client on shutdown. Requests are traced: the connections opened next to the requests sent give the reuse rate.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from cluedogpt_backend.app_logging import logger
+from cluedogpt_backend.infrastructure.metrics import llm_http_connections_opened_total, llm_http_requests_total, llm_http_tls_handshakes_total
+from cluedogpt_backend.settings import settings
+
+
+@dataclass
+class HttpPoolStats:
+    max_connections: int
+    max_keepalive_connections: int
+    idle: int
+    active: int
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+
+    return True
+
+
+async def _trace_request(request: httpx.Request) -> None:
+    host = request.url.host
+    llm_http_requests_total.inc(host=host)
+
+    async def trace(event: str, _info: dict[str, Any]) -> None:
+        if event == "connection.connect_tcp.complete":
+            llm_http_connections_opened_total.inc(host=host)
+        elif event == "connection.start_tls.complete":
+            llm_http_tls_handshakes_total.inc(host=host)
+
+    request.extensions["trace"] = trace
+
+
+class ProviderHttpClient:
+    """Owns the shared client: created on first use, so jobs and benchmarks running without the lifespan get one too."""
+
+    def __init__(self) -> None:
+        self._client: httpx.AsyncClient | None = None
+
+    def get(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = self._build()
+
+        return self._client
+
+    def _build(self) -> httpx.AsyncClient:
+        http2 = settings().ai_http2
+        if http2 and not _http2_available():
+            logger.warning("AI_HTTP2 is enabled but the h2 package is not installed; model providers are called over HTTP/1.1")
+            http2 = False
+
+        return httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings().ai_http_max_connections,
+                max_keepalive_connections=settings().ai_http_max_keepalive_connections,
+                keepalive_expiry=settings().ai_http_keepalive_expiry_seconds,
+            ),
+            timeout=httpx.Timeout(settings().ai_http_read_timeout_seconds, connect=settings().ai_http_connect_timeout_seconds),
+            event_hooks={"request": [_trace_request]},
+        )
+
+    async def warm_up(self, base_urls: list[str]) -> None:
+        """Open a pooled connection to each provider, so the first model calls do not pay for the TCP and TLS handshakes."""
+        client = self.get()
+
+        async def connect(base_url: str) -> None:
+            try:
+                # Any response will do: the connection stays in the pool afterwards
+                await client.head(base_url, timeout=settings().ai_http_connect_timeout_seconds)
+            except httpx.HTTPError as e:
+                logger.warning(f"Could not warm up the connection to {base_url}: {e!r}")
+
+        await asyncio.gather(*(connect(base_url) for base_url in dict.fromkeys(base_urls)))
+
+    def pool_stats(self) -> HttpPoolStats:
+        """The pool's limits and connections (zero connections until the client exists, or when the pool cannot be read)."""
+        limits = HttpPoolStats(max_connections=settings().ai_http_max_connections, max_keepalive_connections=settings().ai_http_max_keepalive_connections, idle=0, active=0)
+        client = self._client
+        if client is None or client.is_closed:
+            return limits
+
+        # httpx does not expose its pool: httpcore's sits behind private attributes, which an upgrade may rename
+        connections = getattr(getattr(getattr(client, "_transport", None), "_pool", None), "connections", None)
+        try:
+            idle = sum(1 for connection in connections if connection.is_idle())
+        except (AttributeError, TypeError):
+            logger.debug("The provider HTTP pool cannot be inspected with this httpx version")
+            return limits
+
+        limits.idle, limits.active = idle, len(connections) - idle
+        return limits
+
+    async def close(self) -> None:
+        # Detach the client before closing it, so nothing picks it up while it closes
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+
+provider_http_client = ProviderHttpClient()
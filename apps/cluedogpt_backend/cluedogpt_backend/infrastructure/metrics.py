@@ -0,0 +1,288 @@
+from collections.abc import Iterable
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+
+# Prometheus text exposition format, version 0.0.4
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+DB_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+
+def _format_labels(labelnames: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _label_values(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}", *self.samples()]
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._label_values(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._label_values(labels), 0)
+
+    def samples(self) -> Iterable[str]:
+        for key, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._label_values(labels)] = value
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._label_values(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._label_values(labels), 0)
+
+    def samples(self) -> Iterable[str]:
+        for key, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+@dataclass
+class _HistogramSeries:
+    bucket_counts: list[int]
+    count: int = 0
+    total: float = 0.0
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = LATENCY_BUCKETS) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = (*sorted(buckets), float("inf"))
+        self._series: dict[tuple[str, ...], _HistogramSeries] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._label_values(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _HistogramSeries(bucket_counts=[0] * len(self.buckets))
+
+        # Buckets are stored non-cumulative and summed on render, so an observation touches a single bucket
+        for i, upper_bound in enumerate(self.buckets):
+            if value <= upper_bound:
+                series.bucket_counts[i] += 1
+                break
+        series.count += 1
+        series.total += value
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._label_values(labels))
+        return series.count if series else 0
+
+    def samples(self) -> Iterable[str]:
+        for key, series in self._series.items():
+            cumulative = 0
+            for upper_bound, bucket_count in zip(self.buckets, series.bucket_counts, strict=True):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, f'le="{_format_value(upper_bound)}"')} {cumulative}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {series.count}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(series.total)}"
+
+
+class MetricsRegistry:
+    """
+    In-process metric store rendered in the Prometheus text format on /metrics.
+
+    Metrics are only updated from the event loop thread, so no locking is needed.
+    Values are per worker process; Prometheus aggregates across workers when scraping each of them.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register[M: _Metric](self, metric: M) -> M:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+metrics_registry = MetricsRegistry()
+
+# HTTP
+http_request_duration_seconds = metrics_registry.register(
+    Histogram("http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route", "status")),
+)
+http_request_db_queries = metrics_registry.register(
+    Histogram("http_request_db_queries", "Database queries issued while handling one request.", ("method", "route"), buckets=COUNT_BUCKETS),
+)
+http_request_db_seconds = metrics_registry.register(
+    Histogram("http_request_db_seconds", "Time spent in database queries while handling one request.", ("method", "route"), buckets=DB_LATENCY_BUCKETS),
+)
+
+# LLM agents
+agent_run_duration_seconds = metrics_registry.register(
+    Histogram("agent_run_duration_seconds", "Agent run latency, including tool calls.", ("agent",)),
+)
+agent_tokens_total = metrics_registry.register(
+    Counter("agent_tokens_total", "Tokens used by agent runs.", ("agent", "kind")),
+)
+agent_model_requests_total = metrics_registry.register(
+    Counter("agent_model_requests_total", "Model requests made by agent runs.", ("agent",)),
+)
+agent_cache_lookups_total = metrics_registry.register(
+    Counter("agent_cache_lookups_total", "Agent run cache lookups by result (memory_hit, persistent_hit or miss).", ("result",)),
+)
+agent_cache_purged_total = metrics_registry.register(
+    Counter("agent_cache_purged_total", "Expired agent run cache rows deleted by the expiry sweeper."),
+)
+tool_call_duration_seconds = metrics_registry.register(
+    Histogram("tool_call_duration_seconds", "Agent tool call latency.", ("tool",), buckets=DB_LATENCY_BUCKETS),
+)
+llm_provider_requests_total = metrics_registry.register(
+    Counter("llm_provider_requests_total", "Model requests by provider and outcome (success, failure or cancelled).", ("provider", "outcome")),
+)
+llm_hedged_requests_total = metrics_registry.register(
+    Counter("llm_hedged_requests_total", "Model requests duplicated on another provider, by which call answered first.", ("winner",)),
+)
+llm_circuit_open = metrics_registry.register(
+    Gauge("llm_circuit_open", "Whether a provider's circuit breaker is open (1) or letting calls through (0).", ("provider",)),
+)
+llm_http_requests_total = metrics_registry.register(
+    Counter("llm_http_requests_total", "HTTP requests sent to model providers.", ("host",)),
+)
+llm_http_connections_opened_total = metrics_registry.register(
+    Counter("llm_http_connections_opened_total", "Connections opened to model providers; the other requests reused a pooled connection.", ("host",)),
+)
+llm_http_tls_handshakes_total = metrics_registry.register(
+    Counter("llm_http_tls_handshakes_total", "TLS handshakes with model providers.", ("host",)),
+)
+llm_http_pool_connections = metrics_registry.register(
+    Gauge("llm_http_pool_connections", "Pooled model provider connections by state, sampled on scrape.", ("state",)),
+)
+llm_http_pool_limits = metrics_registry.register(
+    Gauge("llm_http_pool_limits", "Connection limits of the model provider pool.", ("limit",)),
+)
+
+# Admission control
+llm_in_flight = metrics_registry.register(
+    Gauge("llm_in_flight", "Model-backed work holding a concurrency slot."),
+)
+llm_queue_depth = metrics_registry.register(
+    Gauge("llm_queue_depth", "Model-backed work waiting for a concurrency slot."),
+)
+admission_rejections_total = metrics_registry.register(
+    Counter("admission_rejections_total", "Requests shed by admission control.", ("reason",)),
+)
+
+# Gameplay
+proposal_field_grades_total = metrics_registry.register(
+    Counter("proposal_field_grades_total", "Graded proposal fields by how the verdict was reached (exact, similarity or model).", ("method",)),
+)
+story_changes_total = metrics_registry.register(
+    Counter("story_changes_total", "Story iterations by how the story changed; unchanged and minor_edit keep the solution.", ("change",)),
+)
+games_expired_total = metrics_registry.register(
+    Counter("games_expired_total", "Games moved to EXPIRED by the expiry sweeper."),
+)
+
+# Game rooms
+ws_connections = metrics_registry.register(
+    Gauge("ws_connections", "Players connected to game rooms over WebSocket."),
+)
+ws_disconnects_total = metrics_registry.register(
+    Counter("ws_disconnects_total", "WebSockets closed by the server because the player fell behind (slow_consumer or send_timeout).", ("reason",)),
+)
+game_events_published_total = metrics_registry.register(
+    Counter("game_events_published_total", "Game events published to rooms by this worker.", ("type",)),
+)
+notify_bridge_messages_total = metrics_registry.register(
+    Counter("notify_bridge_messages_total", "Messages exchanged with the other workers over Postgres NOTIFY (sent, received or dropped).", ("direction",)),
+)
+
+# Database
+db_query_duration_seconds = metrics_registry.register(
+    Histogram("db_query_duration_seconds", "Tortoise query latency.", ("method",), buckets=DB_LATENCY_BUCKETS),
+)
+db_pool_connections = metrics_registry.register(
+    Gauge("db_pool_connections", "Postgres pool connections by state, sampled on scrape.", ("state",)),
+)
+
+
+@dataclass
+class RequestQueryStats:
+    count: int = 0
+    seconds: float = 0.0
+
+
+# Set by the metrics middleware for the duration of each HTTP request
+request_query_stats: ContextVar[RequestQueryStats | None] = ContextVar("request_query_stats", default=None)
+
+
+def record_db_query(method: str, seconds: float) -> None:
+    db_query_duration_seconds.observe(seconds, method=method)
+
+    stats = request_query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += seconds
+
+
+def record_agent_run(agent_name: str, seconds: float, usage: Any) -> None:
+    """Record an agent run; `usage` is the RunUsage from `AgentRunResult.usage()`."""
+    agent_run_duration_seconds.observe(seconds, agent=agent_name)
+    agent_tokens_total.inc(usage.input_tokens, agent=agent_name, kind="input")
+    agent_tokens_total.inc(usage.output_tokens, agent=agent_name, kind="output")
+    agent_model_requests_total.inc(usage.requests, agent=agent_name)
@@ -0,0 +1,157 @@
+"""
+Postgres LISTEN/NOTIFY bridge: messages published by one worker process reach every other worker.
+
+Each worker listens on the channel over a connection of its own, outside the pool, and sends its NOTIFYs through
+the pool. A payload starts with a header, origin:message_id:index:count:key:, so workers skip their own messages
+and reassemble the ones split to fit the payload limit. Chunks are sent in one transaction, which Postgres delivers
+together and in order.
+
+Delivery is at most once: messages sent while a worker's listening connection is down are lost to that worker.
+"""
+
+import asyncio
+import contextlib
+import uuid
+from collections.abc import Callable
+from itertools import count
+
+import asyncpg
+from tortoise import connections
+
+from cluedogpt_backend.app_logging import logger
+from cluedogpt_backend.infrastructure.metrics import notify_bridge_messages_total
+from cluedogpt_backend.infrastructure.postgres_db import asyncpg_connect_kwargs
+
+
+# NOTIFY payloads must be shorter than 8000 bytes; the rest of the margin is for the header
+MAX_PAYLOAD_BYTES = 7900
+HEADER_BYTES = 128
+OUTGOING_QUEUE_SIZE = 1000
+RECONNECT_DELAY_SECONDS = 5.0
+# A connection dropped without a FIN or RST is only noticed when it is used
+KEEPALIVE_SECONDS = 30.0
+
+
+def _chunks(message: str) -> list[str]:
+    """Split a message into pieces that fit a payload once encoded; a character takes at most 4 bytes in UTF-8."""
+    size = MAX_PAYLOAD_BYTES - HEADER_BYTES
+    if not message.isascii():
+        size //= 4
+
+    return [message[start : start + size] for start in range(0, len(message), size)] or [""]
+
+
+class NotifyBridge:
+    """Forwards (key, message) pairs to the other workers, which hand them to `deliver`; see the module docstring."""
+
+    def __init__(self, channel: str) -> None:
+        self.channel = channel
+        self._origin = uuid.uuid4().hex
+        self._message_ids = count()
+        self._deliver: Callable[[str, str], None] | None = None
+        self._outgoing: asyncio.Queue[tuple[str, str]] = asyncio.Queue(maxsize=OUTGOING_QUEUE_SIZE)
+        self._partial: dict[tuple[str, str], list[str]] = {}
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self, deliver: Callable[[str, str], None]) -> None:
+        """Start listening and sending. Databases without LISTEN/NOTIFY (SQLite in local runs) have a single process, so there is nothing to bridge."""
+        if connections.get("default").capabilities.dialect != "postgres":
+            return
+
+        self._deliver = deliver
+        self._tasks = [
+            asyncio.create_task(self._listen(), name="notify-bridge-listen"),
+            asyncio.create_task(self._send(), name="notify-bridge-send"),
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._deliver = None
+
+    def publish(self, key: str, message: str) -> None:
+        """Queue a message for the other workers without waiting for Postgres; dropped when the bridge is not running or is backed up."""
+        if not self._tasks:
+            return
+
+        try:
+            self._outgoing.put_nowait((key, message))
+        except asyncio.QueueFull:
+            notify_bridge_messages_total.inc(direction="dropped")
+            logger.warning(f"Notify bridge queue is full, dropped a message for {key}")
+
+    async def _send(self) -> None:
+        while True:
+            key, message = await self._outgoing.get()
+            message_id = next(self._message_ids)
+            chunks = _chunks(message)
+            payloads = [f"{self._origin}:{message_id}:{index}:{len(chunks)}:{key}:{chunk}" for index, chunk in enumerate(chunks)]
+
+            try:
+                async with connections.get("default").acquire_connection() as connection:
+                    if len(payloads) == 1:
+                        await connection.execute("SELECT pg_notify($1, $2)", self.channel, payloads[0])
+                    else:
+                        async with connection.transaction():
+                            for payload in payloads:
+                                await connection.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+            except (OSError, asyncpg.PostgresError) as e:
+                notify_bridge_messages_total.inc(direction="dropped")
+                logger.warning(f"Notify bridge could not send a message for {key}: {e!r}")
+                continue
+
+            notify_bridge_messages_total.inc(direction="sent")
+
+    async def _listen(self) -> None:
+        """Hold the listening connection, and open a new one whenever it is lost."""
+        while True:
+            try:
+                await self._listen_once()
+            except (OSError, TimeoutError, asyncpg.PostgresError) as e:
+                logger.warning(f"Notify bridge could not listen on {self.channel}: {e!r}")
+            finally:
+                # Chunks of a message cut off by the disconnect would never be completed
+                self._partial.clear()
+
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+    async def _listen_once(self) -> None:
+        connection = await asyncpg.connect(**asyncpg_connect_kwargs())
+        try:
+            lost = asyncio.Event()
+            connection.add_termination_listener(lambda _connection: lost.set())
+            await connection.add_listener(self.channel, self._on_notification)
+            logger.info(f"Notify bridge listening on {self.channel}")
+            while not lost.is_set():
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(lost.wait(), timeout=KEEPALIVE_SECONDS)
+                if not lost.is_set():
+                    await connection.fetchval("SELECT 1", timeout=KEEPALIVE_SECONDS)
+            logger.warning("Notify bridge lost its listening connection")
+        finally:
+            if not connection.is_closed():
+                connection.terminate()
+
+    def _on_notification(self, _connection: asyncpg.Connection, _pid: int, _channel: str, payload: str) -> None:
+        origin, message_id, index, total, key, chunk = payload.split(":", 5)
+        if origin == self._origin or self._deliver is None:
+            return
+
+        if total == "1":
+            message = chunk
+        else:
+            parts = self._partial.setdefault((origin, message_id), [])
+            if int(index) != len(parts):
+                # A chunk went missing; the message cannot be rebuilt
+                del self._partial[(origin, message_id)]
+                return
+            parts.append(chunk)
+            if len(parts) < int(total):
+                return
+            message = "".join(self._partial.pop((origin, message_id)))
+
+        notify_bridge_messages_total.inc(direction="received")
+        self._deliver(key, message)
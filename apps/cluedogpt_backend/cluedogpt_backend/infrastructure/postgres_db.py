@@ -1,26 +1,210 @@
-from tortoise import Tortoise
+import functools
+import re
+import sys
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any
 
+from tortoise import Tortoise, connections
+from tortoise.backends.base.client import TransactionalDBClient
+from tortoise.backends.base.config_generator import expand_db_url
+
+from cluedogpt_backend.infrastructure.metrics import record_db_query
 from cluedogpt_backend.settings import settings
 
 
-TORTOISE_ORM = {
-    "connections": {
-        "default": settings.postgres_dsn,
-    },
-    "apps": {
-        "models": {
-            "models": ["cluedogpt_backend.models", "aerich.models"],
-            "default_connection": "default",
+# `-c name=value` settings in a libpq options parameter
+_LIBPQ_OPTION = re.compile(r"-c\s*([\w.]+=\S+)")
+
+
+def build_tortoise_config() -> dict[str, Any]:
+    """
+    Tortoise config for POSTGRES_DSN, with the asyncpg pool tuned from Settings.
+
+    The DSN is expanded by Tortoise, so its query parameters (application_name, ssl, pool sizes...) are kept and win
+    over Settings. Other schemes (sqlite:// in local runs and tests) are passed through untouched.
+    """
+    connection = expand_db_url(settings().postgres_dsn)
+
+    if connection["engine"] == "tortoise.backends.asyncpg":
+        credentials = connection["credentials"]
+        # libpq spellings that asyncpg only understands inside a DSN, not as keyword arguments
+        if "sslmode" in credentials:
+            credentials["ssl"] = credentials.pop("sslmode")
+        if "options" in credentials:
+            credentials["server_settings"] = dict(option.split("=", 1) for option in _LIBPQ_OPTION.findall(credentials.pop("options")))
+
+        credentials.setdefault("minsize", settings().postgres_min_pool_size)
+        credentials.setdefault("maxsize", settings().postgres_max_pool_size)
+        # Passed through to asyncpg.create_pool / asyncpg.connect
+        credentials.setdefault("max_inactive_connection_lifetime", settings().postgres_max_inactive_connection_lifetime)
+        credentials.setdefault("statement_cache_size", settings().postgres_statement_cache_size)
+
+    return {
+        "connections": {"default": connection},
+        "apps": {
+            "models": {
+                "models": ["cluedogpt_backend.models", "aerich.models"],
+                "default_connection": "default",
+            },
         },
-    },
-    "use_tz": True,
-    "timezone": "UTC",
-}
+        "use_tz": True,
+        "timezone": "UTC",
+    }
+
+
+def __getattr__(name: str) -> Any:
+    # TORTOISE_ORM, which aerich reads (see pyproject.toml), is built on access so importing this module reads no settings
+    if name == "TORTOISE_ORM":
+        return build_tortoise_config()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Credentials the Tortoise client takes for itself or for the pool, which asyncpg.connect would reject
+_POOL_CREDENTIALS = ("minsize", "maxsize", "max_inactive_connection_lifetime", "max_queries", "connection_name", "fetch_inserted", "loop")
+
+
+def asyncpg_connect_kwargs() -> dict[str, Any]:
+    """
+    asyncpg.connect arguments for a connection to the POSTGRES_DSN database kept outside the pool.
+
+    Built from the Tortoise credentials, so the DSN is read the same way (asyncpg:// scheme, libpq spellings, pool
+    parameters) and schema and application_name become server settings, as the Tortoise client does for the pool.
+    """
+    credentials = dict(build_tortoise_config()["connections"]["default"]["credentials"])
+    for name in _POOL_CREDENTIALS:
+        credentials.pop(name, None)
+
+    server_settings = dict(credentials.pop("server_settings", None) or {})
+    if schema := credentials.pop("schema", None):
+        server_settings["search_path"] = schema
+    if application_name := credentials.pop("application_name", None):
+        server_settings["application_name"] = application_name
+
+    return {**credentials, "server_settings": server_settings}
+
+
+@dataclass
+class PoolStats:
+    min_size: int
+    max_size: int
+    size: int
+    idle: int
+    in_use: int
+    waiting: int
+
+
+class _InstrumentedPool:
+    """Thin proxy around asyncpg's Pool that counts the tasks waiting in acquire()."""
+
+    def __init__(self, pool: Any) -> None:
+        self._pool = pool
+        self.waiting = 0
+
+    async def acquire(self, *, timeout: float | None = None) -> Any:
+        self.waiting += 1
+        try:
+            return await self._pool.acquire(timeout=timeout)
+        finally:
+            self.waiting -= 1
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._pool, name)
+
+
+def _instrument_pool(client: Any) -> None:
+    # Tortoise creates the pool lazily through client.create_pool, so wrap whatever it returns. SQLite has no pool
+    create_pool = getattr(client, "create_pool", None)
+    if create_pool is None:
+        return
+
+    async def create_instrumented_pool(**kwargs: Any) -> _InstrumentedPool:
+        return _InstrumentedPool(await create_pool(**kwargs))
+
+    client.create_pool = create_instrumented_pool
+
+
+_QUERY_METHODS = ("execute_insert", "execute_many", "execute_query", "execute_query_dict", "execute_script")
+
+
+def _timed_query(method: Any) -> Any:
+    @functools.wraps(method)
+    async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            record_db_query(method.__name__, time.perf_counter() - start)
+
+    wrapper.__timed_query__ = True
+    return wrapper
+
+
+def _instrument_queries(client: Any) -> None:
+    # Transactions run on a TransactionWrapper created per transaction, so patch the classes rather than the instance.
+    # Only methods defined on each class itself are wrapped, so inherited ones are not timed twice.
+    client_class = type(client)
+    # The backend's transaction class: TransactionWrapper for asyncpg, SqliteTransactionWrapper for SQLite
+    transaction_classes = [cls for cls in vars(sys.modules[client_class.__module__]).values() if isinstance(cls, type) and issubclass(cls, client_class) and issubclass(cls, TransactionalDBClient)]
+
+    for cls in (client_class, *transaction_classes):
+        for name in _QUERY_METHODS:
+            method = cls.__dict__.get(name)
+            if method is not None and not getattr(method, "__timed_query__", False):
+                setattr(cls, name, _timed_query(method))
 
 
 async def init_db() -> None:
     """Initialize the Tortoise ORM with the shared models."""
-    await Tortoise.init(config=TORTOISE_ORM)
+    await Tortoise.init(config=build_tortoise_config())
+    _instrument_pool(connections.get("default"))
+    _instrument_queries(connections.get("default"))
+
+
+def get_pool_stats() -> PoolStats:
+    """Current state of the default connection pool (all zeros until the first query opens it, and always on SQLite)."""
+    client = connections.get("default")
+    pool = getattr(client, "_pool", None)
+
+    if pool is None:
+        return PoolStats(min_size=getattr(client, "pool_minsize", 0), max_size=getattr(client, "pool_maxsize", 0), size=0, idle=0, in_use=0, waiting=0)
+
+    size = pool.get_size()
+    idle = pool.get_idle_size()
+
+    return PoolStats(
+        min_size=pool.get_min_size(),
+        max_size=pool.get_max_size(),
+        size=size,
+        idle=idle,
+        in_use=size - idle,
+        waiting=getattr(pool, "waiting", 0),
+    )
+
+
+@asynccontextmanager
+async def advisory_lock(lock_id: int) -> AsyncIterator[bool]:
+    """
+    Try to take a session-level Postgres advisory lock for the duration of the block; yields whether it was taken.
+
+    The lock lives on a pool connection reserved for the block, so a worker that dies releases it with its connection.
+    Databases without advisory locks (SQLite in local runs) have a single process and always yield True.
+    """
+    client = connections.get("default")
+    if client.capabilities.dialect != "postgres":
+        yield True
+        return
+
+    async with client.acquire_connection() as connection:
+        acquired = await connection.fetchval("SELECT pg_try_advisory_lock($1)", lock_id)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                await connection.execute("SELECT pg_advisory_unlock($1)", lock_id)
 
 
 async def generate_schemas() -> None:
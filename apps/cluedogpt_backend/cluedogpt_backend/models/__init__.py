@@ -1,24 +1,34 @@
 from cluedogpt_backend.models.postgres_models import (
+    AgentRunCacheEntry,
     ConversationRole,
     DefinitionMessage,
     Game,
     GameDefinitionConversation,
+    GameInitJob,
     GameQuestion,
     GameStatus,
+    JobStatus,
     Player,
+    PlayerStats,
     Proposal,
     QAStatus,
+    WarmGame,
 )
 
 
 __all__ = [
+    "AgentRunCacheEntry",
     "ConversationRole",
     "DefinitionMessage",
     "Game",
     "GameDefinitionConversation",
+    "GameInitJob",
     "GameQuestion",
     "GameStatus",
+    "JobStatus",
     "Player",
+    "PlayerStats",
     "Proposal",
     "QAStatus",
+    "WarmGame",
 ]
@@ -1,4 +1,4 @@
-from enum import Enum
+from enum import Enum, StrEnum
 
 from tortoise import fields, models
 
@@ -23,6 +23,13 @@ class QAStatus(str, Enum):
     ANSWERED = "answered"
 
 
+class JobStatus(StrEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
 class Player(models.Model):
     id = fields.UUIDField(primary_key=True)
     name = fields.CharField(max_length=255, index=True)
@@ -57,6 +64,10 @@ class Game(models.Model):
     weapon = fields.CharField(max_length=255)
     motive = fields.CharField(max_length=255)
     story = fields.TextField()
+    # Fingerprint of the story the solution was written for, and the summed word-level distance of the edits kept
+    # since, to skip regenerating the solution when the story barely changed (see services.story_changes)
+    solution_story_hash = fields.CharField(max_length=64, null=True)
+    solution_story_drift = fields.FloatField(default=0)
 
     status = fields.CharEnumField(GameStatus, default=GameStatus.DEFINITION)
 
@@ -73,7 +84,10 @@ class Game(models.Model):
 
     class Meta:
         table = "games"
-        indexes = (("status", "expiry_date"),)
+        indexes = (
+            ("status", "expiry_date"),
+            ("owner_id", "created_at"),
+        )
 
     def __str__(self) -> str:
         return f"{self.name}"
@@ -132,6 +146,12 @@ class DefinitionMessage(models.Model):
     tool_latency_ms = fields.IntField(null=True)
     tool_error = fields.TextField(null=True)
 
+    # Agent run usage, on the row that closes the run (the reply, or the last tool call when the agent does not reply)
+    agent_name = fields.CharField(max_length=50, null=True)
+    latency_ms = fields.IntField(null=True)
+    input_tokens = fields.IntField(null=True)
+    output_tokens = fields.IntField(null=True)
+
     created_at = fields.DatetimeField(auto_now_add=True)
 
     class Meta:
@@ -140,6 +160,7 @@ class DefinitionMessage(models.Model):
         indexes = (
             ("conversation_id", "idx"),
             ("role",),
+            ("created_at",),
         )
 
     def __str__(self) -> str:
@@ -221,3 +242,112 @@ class Proposal(models.Model):
             ("game_id", "player_id", "created_at"),
             ("player_id", "created_at"),
         )
+
+
+class GameInitJob(models.Model):
+    """
+    A queued game-init iteration (story + solution generation).
+    Processed by the in-process worker pool; persisted so queued work survives a restart.
+    """
+
+    id = fields.UUIDField(primary_key=True)
+    game = fields.ForeignKeyField(
+        "models.Game",
+        related_name="init_jobs",
+        on_delete=fields.CASCADE,
+        index=True,
+    )
+
+    message = fields.TextField()
+
+    status = fields.CharEnumField(JobStatus, default=JobStatus.QUEUED)
+    error = fields.TextField(null=True)
+    # Set when a worker claims the job; the worker only writes its results while the job still holds its lease
+    lease_id = fields.UUIDField(null=True)
+
+    created_at = fields.DatetimeField(auto_now_add=True)
+    started_at = fields.DatetimeField(null=True)
+    finished_at = fields.DatetimeField(null=True)
+
+    class Meta:
+        table = "game_init_jobs"
+        indexes = (("status", "created_at"),)
+
+    def __str__(self) -> str:
+        return f"GameInitJob<{self.id}> [{self.status}]"
+
+
+class AgentRunCacheEntry(models.Model):
+    """
+    Persistent tier of the agent run cache.
+    Holds the serialized model responses of a run, keyed on the run's input hash.
+    """
+
+    key = fields.CharField(max_length=64, primary_key=True)
+    responses = fields.JSONField()  # JSONB in Postgres
+    expires_at = fields.DatetimeField(index=True)
+    created_at = fields.DatetimeField(auto_now_add=True)
+
+    class Meta:
+        table = "agent_run_cache"
+
+    def __str__(self) -> str:
+        return f"AgentRunCacheEntry<{self.key}>"
+
+
+class WarmGame(models.Model):
+    """
+    A pre-generated story and solution, waiting to be claimed by a new game.
+    Claimed rows are deleted in the same transaction that creates the game.
+    """
+
+    id = fields.UUIDField(primary_key=True)
+    language = fields.CharField(max_length=30)
+    locale = fields.CharField(max_length=30)
+
+    culprit = fields.CharField(max_length=255)
+    weapon = fields.CharField(max_length=255)
+    motive = fields.CharField(max_length=255)
+    story = fields.TextField()
+
+    created_at = fields.DatetimeField(auto_now_add=True)
+
+    class Meta:
+        table = "warm_games"
+        indexes = (("language", "locale", "created_at"),)
+
+    def __str__(self) -> str:
+        return f"WarmGame<{self.language}/{self.locale}>"
+
+
+class PlayerStats(models.Model):
+    """
+    Running totals of a player's activity, so stats and leaderboard reads never scan proposals or game_questions.
+    Updated in the same transaction as each Proposal and GameQuestion insert; rebuilt from those tables by
+    `python -m cluedogpt_backend.commands.rebuild_player_stats`.
+    """
+
+    player = fields.OneToOneField(
+        "models.Player",
+        related_name="stats",
+        on_delete=fields.CASCADE,
+        primary_key=True,
+    )
+
+    # Games with at least one question or proposal from the player
+    games_played = fields.IntField(default=0)
+    # Games where one of the player's proposals got all three fields right
+    games_solved = fields.IntField(default=0)
+    proposals_count = fields.IntField(default=0)
+    # Sum of correct_count over the player's proposals
+    correct_total = fields.IntField(default=0)
+    questions_count = fields.IntField(default=0)
+
+    updated_at = fields.DatetimeField(auto_now=True)
+
+    class Meta:
+        table = "player_stats"
+        indexes = (("games_solved", "correct_total"),)
+
+    def __str__(self) -> str:
+        return f"PlayerStats<{self.player_id}>"
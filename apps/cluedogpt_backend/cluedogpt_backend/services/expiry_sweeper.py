@@ -0,0 +1,115 @@
+import asyncio
+import uuid
+from datetime import UTC, datetime
+
+from tortoise.expressions import Q
+
+from cluedogpt_backend.app_logging import logger
+from cluedogpt_backend.infrastructure.metrics import agent_cache_purged_total, games_expired_total
+from cluedogpt_backend.infrastructure.postgres_db import advisory_lock
+from cluedogpt_backend.models.postgres_models import AgentRunCacheEntry, Game, GameStatus
+from cluedogpt_backend.settings import settings
+
+
+# Arbitrary, but unique among the advisory locks taken by the app
+EXPIRY_SWEEPER_LOCK_ID = 0x6578_7069_7279  # "expiry"
+
+# Games in these states can still be played, so they are the ones that expire
+SWEPT_STATUSES = (GameStatus.DEFINITION, GameStatus.ONGOING)
+
+
+class ExpirySweeper:
+    """
+    Background task that moves games past their expiry_date to EXPIRED, and deletes expired agent run cache rows.
+
+    Expired games are found by keyset iteration over the (status, expiry_date) index and updated in batches of
+    expiry_sweep_batch_size ids, each batch in its own short statement. An advisory lock keeps the other
+    replicas from sweeping at the same time; they skip the round instead of waiting.
+    """
+
+    def __init__(self) -> None:
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if settings().expiry_sweep_interval_seconds > 0:
+            self._task = asyncio.create_task(self._run(), name="expiry-sweeper")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except Exception:  # noqa: BLE001
+                logger.exception("Expiry sweep failed")
+
+            await asyncio.sleep(settings().expiry_sweep_interval_seconds)
+
+    async def sweep(self) -> int:
+        """Expire every game past its expiry_date; returns how many were expired (0 when another replica holds the lock)."""
+        async with advisory_lock(EXPIRY_SWEEPER_LOCK_ID) as acquired:
+            if not acquired:
+                return 0
+
+            now = datetime.now(UTC)
+            expired = 0
+            for status in SWEPT_STATUSES:
+                expired += await self._sweep_status(status, now)
+            await self._purge_agent_cache(now)
+
+        if expired:
+            logger.info(f"Expired {expired} games")
+
+        return expired
+
+    async def _sweep_status(self, status: GameStatus, now: datetime) -> int:
+        batch_size = settings().expiry_sweep_batch_size
+        expired = 0
+        cursor: tuple[datetime, uuid.UUID] | None = None
+
+        while True:
+            query = Game.filter(status=status, expiry_date__lte=now)
+            if cursor:
+                # Resume after the last row seen, so rows that failed to update are not read again
+                query = query.filter(Q(expiry_date__gt=cursor[0]) | Q(expiry_date=cursor[0], id__gt=cursor[1]))
+
+            rows = await query.order_by("expiry_date", "id").limit(batch_size).values_list("expiry_date", "id")
+            if not rows:
+                break
+            cursor = rows[-1]
+
+            # The status is checked again: a game may have changed state since it was read
+            updated = await Game.filter(id__in=[game_id for _, game_id in rows], status=status).update(status=GameStatus.EXPIRED)
+            games_expired_total.inc(updated)
+            expired += updated
+
+            if len(rows) < batch_size:
+                break
+
+        return expired
+
+    async def _purge_agent_cache(self, now: datetime) -> int:
+        """Delete agent run cache rows past their expires_at, which reads already skip, in batches."""
+        batch_size = settings().expiry_sweep_batch_size
+        purged = 0
+
+        while True:
+            keys = await AgentRunCacheEntry.filter(expires_at__lte=now).limit(batch_size).values_list("key", flat=True)
+            if not keys:
+                break
+
+            deleted = await AgentRunCacheEntry.filter(key__in=keys).delete()
+            agent_cache_purged_total.inc(deleted)
+            purged += deleted
+
+            if len(keys) < batch_size:
+                break
+
+        return purged
+
+
+expiry_sweeper = ExpirySweeper()
@@ -0,0 +1,28 @@
+from datetime import UTC, datetime
+
+from cluedogpt_backend.api.exceptions import BadRequestError, ResourceNotFoundError
+from cluedogpt_backend.app_logging import game_id_var
+from cluedogpt_backend.models.postgres_models import Game, GameStatus
+
+
+async def get_player_game(game_id: str, player_id: str) -> Game:
+    """The game, if the player owns or plays it."""
+    game_id_var.set(game_id)
+
+    game = await Game.get_or_none(id=game_id)
+    if not game or (str(game.owner_id) != player_id and not await game.players.filter(id=player_id).exists()):
+        raise ResourceNotFoundError(error_code="game_not_found", message=f"Game {game_id} not found")
+
+    return game
+
+
+async def get_playable_game(game_id: str, player_id: str) -> Game:
+    """The game, if the player owns or plays it and it can be played: its solution exists and it is not over."""
+    game = await get_player_game(game_id, player_id)
+
+    if not game.culprit:
+        raise BadRequestError(error_code="game_not_ready", message=f"Game {game_id} has no solution yet")
+    if game.status in (GameStatus.COMPLETED, GameStatus.EXPIRED) or game.expiry_date <= datetime.now(UTC):
+        raise BadRequestError(error_code="game_over", message=f"Game {game_id} is over")
+
+    return game
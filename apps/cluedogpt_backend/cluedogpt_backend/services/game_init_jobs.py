@@ -0,0 +1,173 @@
+import asyncio
+import contextlib
+import uuid
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, timedelta
+
+from tortoise.transactions import in_transaction
+
+from cluedogpt_backend.ai.agents import run_game_creation_agents
+from cluedogpt_backend.ai.deps import GameAgentDeps
+from cluedogpt_backend.api.api_contracts.responses.game_event_response import story_updated_event
+from cluedogpt_backend.app_logging import game_id_var, logger
+from cluedogpt_backend.infrastructure.admission import llm_limiter
+from cluedogpt_backend.models.postgres_models import Game, GameInitJob, JobStatus
+from cluedogpt_backend.services.game_rooms import game_rooms
+from cluedogpt_backend.services.story_changes import record_solution_story, solution_outdated
+from cluedogpt_backend.settings import settings
+
+
+# How long a job waits before it is retried while another replica runs a job of the same game
+GAME_LOCKED_RETRY_SECONDS = 5.0
+
+
+class GameInitJobQueue:
+    """
+    In-process worker pool that runs queued game-init iterations.
+
+    Jobs live in the game_init_jobs table; the asyncio queue only carries their (job id, game id) pairs.
+    On start, queued jobs (and running jobs abandoned by a dead worker) are loaded back into the queue.
+    Jobs of the same game run one at a time, in order: workers of this process wait on a per-game lock, and a job
+    whose game has a job running on another replica is put back in the queue. No database lock or connection is held
+    while the model runs: a job is claimed in a short transaction that hands it a lease (lease_id), and its results
+    are only written if the job still holds that lease, since a run outliving game_init_job_stale_after_seconds can
+    be recovered and run again elsewhere.
+    """
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[tuple[uuid.UUID, uuid.UUID]] = asyncio.Queue()
+        self._workers: list[asyncio.Task] = []
+        # Per-game lock and the number of workers holding or waiting for it, so unused locks can be dropped
+        self._game_locks: dict[uuid.UUID, tuple[asyncio.Lock, int]] = {}
+
+    async def start(self, worker_count: int | None = None) -> None:
+        worker_count = worker_count or settings().game_init_worker_count
+
+        await self._recover_jobs()
+
+        self._workers = [asyncio.create_task(self._work(), name=f"game-init-worker-{i}") for i in range(worker_count)]
+        logger.info(f"Started {worker_count} game init workers")
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def enqueue(self, job: GameInitJob) -> None:
+        self._queue.put_nowait((job.id, job.game_id))
+
+    async def join(self) -> None:
+        """Wait until every job enqueued so far has been processed."""
+        await self._queue.join()
+
+    def pending(self) -> int:
+        """Number of jobs waiting for a free worker."""
+        return self._queue.qsize()
+
+    async def _recover_jobs(self) -> None:
+        stale_before = datetime.now(UTC) - timedelta(seconds=settings().game_init_job_stale_after_seconds)
+        await GameInitJob.filter(status=JobStatus.RUNNING, started_at__lt=stale_before).update(status=JobStatus.QUEUED, started_at=None, lease_id=None)
+
+        jobs = await GameInitJob.filter(status=JobStatus.QUEUED).order_by("created_at").values_list("id", "game_id")
+        for job_id, game_id in jobs:
+            self._queue.put_nowait((job_id, game_id))
+
+        if jobs:
+            logger.info(f"Recovered {len(jobs)} queued game init jobs")
+
+    async def _work(self) -> None:
+        while True:
+            job_id, game_id = await self._queue.get()
+            try:
+                await self._run(job_id, game_id)
+            except Exception as e:  # noqa: BLE001
+                logger.exception(f"Game init job {job_id} failed")
+                await self._fail(job_id, e)
+            finally:
+                self._queue.task_done()
+
+    async def _fail(self, job_id: uuid.UUID, error: Exception, lease: uuid.UUID | None = None) -> None:
+        """
+        Mark a job FAILED: still QUEUED if it was never claimed, else RUNNING under our lease.
+
+        The database may be what failed, so errors are only logged.
+        """
+        query = GameInitJob.filter(id=job_id, status=JobStatus.QUEUED) if lease is None else GameInitJob.filter(id=job_id, status=JobStatus.RUNNING, lease_id=lease)
+        try:
+            await query.update(status=JobStatus.FAILED, error=str(error), finished_at=datetime.now(UTC))
+        except Exception:  # noqa: BLE001
+            logger.exception(f"Could not mark game init job {job_id} as failed")
+
+    @contextlib.asynccontextmanager
+    async def _game_lock(self, game_id: uuid.UUID) -> AsyncIterator[None]:
+        lock, users = self._game_locks.get(game_id, (asyncio.Lock(), 0))
+        self._game_locks[game_id] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._game_locks[game_id]
+            if users == 1:
+                del self._game_locks[game_id]
+            else:
+                self._game_locks[game_id] = (lock, users - 1)
+
+    async def _claim(self, job_id: uuid.UUID, game_id: uuid.UUID) -> uuid.UUID | None:
+        """
+        Move a QUEUED job to RUNNING under a new lease, which is returned.
+
+        Returns None when the job was claimed already (a job recovered by several replicas only runs once), or when
+        another job of its game is running; the game row is locked for this transaction only, so concurrent claims of
+        the game's jobs see each other.
+        """
+        now = datetime.now(UTC)
+        stale_before = now - timedelta(seconds=settings().game_init_job_stale_after_seconds)
+        lease = uuid.uuid4()
+
+        async with in_transaction() as connection:
+            await Game.filter(id=game_id).using_db(connection).select_for_update().first()
+
+            running = GameInitJob.filter(game_id=game_id, status=JobStatus.RUNNING, started_at__gte=stale_before).exclude(id=job_id)
+            if await running.using_db(connection).exists():
+                # Try again once the other replica is likely done
+                asyncio.get_running_loop().call_later(GAME_LOCKED_RETRY_SECONDS, self._queue.put_nowait, (job_id, game_id))
+                return None
+
+            claimed = await GameInitJob.filter(id=job_id, status=JobStatus.QUEUED).using_db(connection).update(status=JobStatus.RUNNING, started_at=now, lease_id=lease)
+
+        return lease if claimed else None
+
+    async def _run(self, job_id: uuid.UUID, game_id: uuid.UUID) -> None:
+        game_id_var.set(str(game_id))
+
+        async with self._game_lock(game_id):
+            lease = await self._claim(job_id, game_id)
+            if lease is None:
+                return
+
+            try:
+                job = await GameInitJob.get(id=job_id).prefetch_related("game")
+                deps = GameAgentDeps(game=job.game)
+                async with llm_limiter.slot(background=True):
+                    await run_game_creation_agents(deps, job.message, solution_outdated)
+                record_solution_story(deps)
+
+                async with in_transaction() as connection:
+                    owned = await GameInitJob.filter(id=job_id, status=JobStatus.RUNNING, lease_id=lease).using_db(connection).select_for_update().first()
+                    if owned is None:
+                        logger.warning(f"Game init job {job_id} lost its lease while running; its results are discarded")
+                        return
+
+                    await deps.flush(connection)
+                    await GameInitJob.filter(id=job_id).using_db(connection).update(status=JobStatus.DONE, finished_at=datetime.now(UTC))
+            except Exception as e:  # noqa: BLE001
+                logger.exception(f"Game init job {job_id} failed")
+                await self._fail(job_id, e, lease)
+                return
+
+        game_rooms.publish(story_updated_event(job.game))
+
+
+game_init_job_queue = GameInitJobQueue()
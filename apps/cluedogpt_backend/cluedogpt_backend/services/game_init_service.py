@@ -1,27 +1,120 @@
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime, timedelta
 
-from ai.agents import run_solution_creation_agent, run_story_creation_agent
-from api.api_contracts.requests.game_init_requests import GameInitIterationRequest
-from app_logging import logger
-from models.postgres_models import Game
+from cluedogpt_backend.ai.agents import stream_game_creation_agents
+from cluedogpt_backend.ai.deps import GameAgentDeps
+from cluedogpt_backend.ai.history import append_messages, get_conversation
+from cluedogpt_backend.api.api_contracts.requests.game_init_requests import GameInitIterationRequest
+from cluedogpt_backend.api.api_contracts.responses.game_event_response import story_updated_event
+from cluedogpt_backend.api.exceptions import ResourceNotFoundError
+from cluedogpt_backend.app_logging import game_id_var, logger
+from cluedogpt_backend.models.postgres_models import ConversationRole, Game, GameInitJob, JobStatus
+from cluedogpt_backend.services.game_access import get_player_game
+from cluedogpt_backend.services.game_init_jobs import game_init_job_queue
+from cluedogpt_backend.services.game_rooms import game_rooms
+from cluedogpt_backend.services.story_changes import record_solution_story, solution_outdated
+from cluedogpt_backend.services.warm_pool import claim_warm_game, is_generic_message
+from cluedogpt_backend.utils.sse import format_sse
 
 
 class GameInitService:
-    async def iterate_game_init(self, game_iteration: GameInitIterationRequest):
-        game = None
+    async def iterate_game_init(self, game_iteration: GameInitIterationRequest, owner_id: str) -> GameInitJob:
+        """Queue the story and solution generation for this iteration; the workers pick it up from there."""
+        warm_game = await self._claim_warm_game(game_iteration, owner_id)
+        if warm_game:
+            now = datetime.now(UTC)
+            return await GameInitJob.create(game=warm_game, message=game_iteration.message, status=JobStatus.DONE, started_at=now, finished_at=now)
+
+        game = await self._get_or_create_game(game_iteration, owner_id)
+
+        job = await GameInitJob.create(game=game, message=game_iteration.message)
+        game_init_job_queue.enqueue(job)
+
+        return job
+
+    async def get_job(self, job_id: str, player_id: str) -> GameInitJob:
+        """The job, if the player owns or plays its game."""
+        job = await GameInitJob.get_or_none(id=job_id)
+        if job:
+            try:
+                await get_player_game(str(job.game_id), player_id)
+            except ResourceNotFoundError:
+                job = None
+
+        if not job:
+            raise ResourceNotFoundError(error_code="job_not_found", message=f"Game init job {job_id} not found")
+
+        return job
+
+    async def stream_game_init(self, game_iteration: GameInitIterationRequest, owner_id: str) -> AsyncIterator[str]:
+        """Same as iterate_game_init, but yields the story as Server-Sent Events while it is generated."""
+        warm_game = await self._claim_warm_game(game_iteration, owner_id)
+        if warm_game:
+            yield format_sse({"game_id": str(warm_game.id)}, event="game")
+            yield format_sse(warm_game.story, event="story")
+            yield format_sse({"game_id": str(warm_game.id)}, event="done")
+            return
+
+        game = await self._get_or_create_game(game_iteration, owner_id)
+        yield format_sse({"game_id": str(game.id)}, event="game")
+
+        deps = GameAgentDeps(game=game)
+        async for story_delta in stream_game_creation_agents(deps, game_iteration.message, solution_outdated):
+            yield format_sse(story_delta, event="story")
+
+        record_solution_story(deps)
+        await deps.flush()
+        game_rooms.publish(story_updated_event(game))
+        yield format_sse({"game_id": str(game.id)}, event="done")
+
+    async def _claim_warm_game(self, game_iteration: GameInitIterationRequest, owner_id: str) -> Game | None:
+        """New games started with a generic message take a pre-generated story instead of waiting on the model."""
+        if game_iteration.game_id or not is_generic_message(game_iteration.message):
+            return None
+
+        game = await claim_warm_game(
+            game_iteration.language,
+            game_iteration.locale,
+            name=game_iteration.title,
+            owner_id=owner_id,
+            expiry_date=datetime.now(UTC) + timedelta(days=7),
+        )
+        if not game:
+            return None
+
+        game_id_var.set(str(game.id))
+        logger.info(f"Started game {game.id} from the warm pool")
+
+        # Record the turn so later iterations have the same history as a generated game
+        conversation = await get_conversation(game)
+        await append_messages(conversation, [(ConversationRole.USER, game_iteration.message), (ConversationRole.ASSISTANT, "Story created successfully.")])
+
+        return game
+
+    async def _get_or_create_game(self, game_iteration: GameInitIterationRequest, owner_id: str) -> Game:
         if game_iteration.game_id:
+            game_id_var.set(game_iteration.game_id)
             logger.info(f"Continuing game {game_iteration.game_id}")
 
-            game = await Game.get(id=game_iteration.game_id)
+            game = await Game.get_or_none(id=game_iteration.game_id, owner_id=owner_id)
+            if not game:
+                raise ResourceNotFoundError(error_code="game_not_found", message=f"Game {game_iteration.game_id} not found")
+
+            return game
 
-            # TODO Check game owner against request user
-        else:
-            logger.info("Starting new game initialization")
-            # TODO add owner when auth is implemented
-            game = await Game.create(
-                name=game_iteration.title,
-                expiry_date=datetime.now(UTC) + timedelta(days=7),
-            )
+        logger.info("Starting new game initialization")
+        # Story and solution are filled in by the agents; the columns are NOT NULL, so start them empty
+        game = await Game.create(
+            name=game_iteration.title,
+            owner_id=owner_id,
+            language=game_iteration.language,
+            locale=game_iteration.locale,
+            expiry_date=datetime.now(UTC) + timedelta(days=7),
+            story="",
+            culprit="",
+            weapon="",
+            motive="",
+        )
+        game_id_var.set(str(game.id))
 
-        await run_story_creation_agent(game, game_iteration.message)
-        await run_solution_creation_agent(game)
+        return game
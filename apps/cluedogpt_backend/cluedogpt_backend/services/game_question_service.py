@@ -0,0 +1,59 @@
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+
+from tortoise.transactions import in_transaction
+
+from cluedogpt_backend.ai.agents import stream_game_master_answer
+from cluedogpt_backend.api.api_contracts.responses.game_event_response import question_answered_event
+from cluedogpt_backend.api.exceptions import BadRequestError
+from cluedogpt_backend.app_logging import logger
+from cluedogpt_backend.models.postgres_models import Game, GameQuestion, Proposal, QAStatus
+from cluedogpt_backend.services.game_access import get_playable_game
+from cluedogpt_backend.services.game_rooms import game_rooms
+from cluedogpt_backend.services.player_stats_service import lock_player, record_question
+from cluedogpt_backend.services.question_batcher import question_batcher
+from cluedogpt_backend.utils.sse import format_sse
+
+
+class GameQuestionService:
+    async def ask_question(self, game_id: str, player_id: str, question_text: str) -> tuple[Game, GameQuestion]:
+        """Record a question in the ASKED state. Raises before anything is streamed if the player may not ask it."""
+        game = await get_playable_game(game_id, player_id)
+
+        async with in_transaction() as connection:
+            # Counted under the player's lock, so concurrent questions neither exceed the limit nor both count as the first
+            await lock_player(player_id, connection)
+            asked = await GameQuestion.filter(game_id=game.id, player_id=player_id).using_db(connection).count()
+            if game.max_questions is not None and asked >= game.max_questions:
+                raise BadRequestError(error_code="question_limit_reached", message=f"No questions left in game {game_id}")
+
+            first_in_game = not asked and not await Proposal.filter(game_id=game.id, player_id=player_id).using_db(connection).exists()
+            question = await GameQuestion.create(game=game, player_id=player_id, question_text=question_text, using_db=connection)
+            await record_question(player_id, first_in_game, connection)
+        logger.info(f"Question {question.id} asked")
+
+        return game, question
+
+    async def answer(self, game: Game, question: GameQuestion) -> GameQuestion:
+        """Answer the question together with the other questions about the game asked at the same time."""
+        await question_batcher.answer(game, question)
+        game_rooms.publish(question_answered_event(question))
+
+        return question
+
+    async def stream_answer(self, game: Game, question: GameQuestion) -> AsyncIterator[str]:
+        """Yield the game master's answer as Server-Sent Events, then store it and mark the question ANSWERED."""
+        yield format_sse({"question_id": str(question.id)}, event="question")
+
+        answer_parts = []
+        async for answer_delta in stream_game_master_answer(game, question.question_text):
+            answer_parts.append(answer_delta)
+            yield format_sse(answer_delta, event="answer")
+
+        question.answer_text = "".join(answer_parts)
+        question.status = QAStatus.ANSWERED
+        question.answered_at = datetime.now(UTC)
+        await question.save(update_fields=["answer_text", "status", "answered_at"])
+        game_rooms.publish(question_answered_event(question))
+
+        yield format_sse({"question_id": str(question.id)}, event="done")
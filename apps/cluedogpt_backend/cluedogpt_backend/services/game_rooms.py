@@ -0,0 +1,119 @@
+import asyncio
+import contextlib
+from dataclasses import dataclass, field
+
+from fastapi import WebSocket
+from starlette import status
+
+from cluedogpt_backend.api.api_contracts.responses.game_event_response import GameEvent
+from cluedogpt_backend.app_logging import logger
+from cluedogpt_backend.infrastructure.metrics import game_events_published_total, ws_connections, ws_disconnects_total
+from cluedogpt_backend.infrastructure.notify_bridge import NotifyBridge
+from cluedogpt_backend.settings import settings
+
+
+GAME_EVENTS_CHANNEL = "game_events"
+CLOSE_TIMEOUT_SECONDS = 1.0
+
+
+@dataclass(eq=False)
+class RoomConnection:
+    """One player's WebSocket and the messages waiting to be sent to it."""
+
+    websocket: WebSocket
+    player_id: str
+    queue: asyncio.Queue[str] = field(default_factory=lambda: asyncio.Queue(maxsize=settings().ws_send_queue_size))
+    sender: asyncio.Task | None = None
+    # Why the server ended the connection, if it did
+    drop_reason: str | None = None
+
+
+class GameRoomManager:
+    """
+    Fans game events out to the players connected to each game's room.
+
+    An event is serialized once, and the same text is queued for every connection in the room and forwarded to
+    the other workers over the notify bridge. Each connection has a sender task and a bounded queue: a player
+    who falls behind (a full queue, or a send that does not finish in time) is disconnected with 1013 rather
+    than slowing the room down or buffering without limit. Clients reconnect and catch up through the list endpoints.
+    """
+
+    def __init__(self) -> None:
+        self._rooms: dict[str, set[RoomConnection]] = {}
+        self._bridge = NotifyBridge(GAME_EVENTS_CHANNEL)
+
+    def start(self) -> None:
+        self._bridge.start(self._deliver)
+
+    async def stop(self) -> None:
+        await self._bridge.stop()
+
+    def publish(self, event: GameEvent) -> None:
+        """Send an event to the game's room on every worker. Never waits, so it is safe to call from request handlers."""
+        message = event.model_dump_json()
+        game_events_published_total.inc(type=event.type.value)
+
+        self._deliver(event.game_id, message)
+        self._bridge.publish(event.game_id, message)
+
+    def connections(self, game_id: str) -> int:
+        """Players connected to the game's room on this worker."""
+        return len(self._rooms.get(game_id, ()))
+
+    async def serve(self, game_id: str, player_id: str, websocket: WebSocket) -> None:
+        """Keep the player in the game's room until either side closes the WebSocket. Messages from the client are ignored."""
+        await websocket.accept()
+
+        connection = RoomConnection(websocket, player_id)
+        connection.sender = asyncio.create_task(self._send(connection))
+        receiver = asyncio.create_task(self._receive(connection))
+        self._rooms.setdefault(game_id, set()).add(connection)
+        ws_connections.inc()
+
+        try:
+            await asyncio.wait((connection.sender, receiver), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            room = self._rooms.get(game_id)
+            if room is not None:
+                room.discard(connection)
+                if not room:
+                    del self._rooms[game_id]
+            ws_connections.dec()
+
+            connection.sender.cancel()
+            receiver.cancel()
+            await asyncio.gather(connection.sender, receiver, return_exceptions=True)
+
+        if connection.drop_reason:
+            ws_disconnects_total.inc(reason=connection.drop_reason)
+            logger.info(f"Disconnected player {player_id} from game {game_id}: {connection.drop_reason.replace('_', ' ')}")
+            # A stalled client may not read the close frame either
+            with contextlib.suppress(Exception):
+                await asyncio.wait_for(websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason=connection.drop_reason), timeout=CLOSE_TIMEOUT_SECONDS)
+
+    def _deliver(self, game_id: str, message: str) -> None:
+        for connection in tuple(self._rooms.get(game_id, ())):
+            if connection.drop_reason:
+                continue
+            try:
+                connection.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                connection.drop_reason = "slow_consumer"
+                connection.sender.cancel()
+
+    async def _send(self, connection: RoomConnection) -> None:
+        while True:
+            message = await connection.queue.get()
+            try:
+                await asyncio.wait_for(connection.websocket.send_text(message), timeout=settings().ws_send_timeout_seconds)
+            except TimeoutError:
+                connection.drop_reason = "send_timeout"
+                return
+
+    async def _receive(self, connection: RoomConnection) -> None:
+        # Reading is how a closed connection is noticed
+        while (await connection.websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+
+game_rooms = GameRoomManager()
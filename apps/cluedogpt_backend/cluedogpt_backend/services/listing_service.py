@@ -0,0 +1,43 @@
+from cluedogpt_backend.models.postgres_models import Game, GameQuestion, Proposal
+from cluedogpt_backend.services.game_access import get_player_game
+from cluedogpt_backend.utils.pagination import Page, keyset_page, keyset_union_page
+
+
+# Projections: list pages never load the story or the hidden solution
+GAME_LIST_FIELDS = ("id", "name", "owner_id", "status", "language", "locale", "created_at", "expiry_date")
+QUESTION_LIST_FIELDS = ("id", "game_id", "player_id", "question_text", "answer_text", "status", "asked_at", "answered_at")
+PROPOSAL_LIST_FIELDS = (
+    "id",
+    "game_id",
+    "culprit",
+    "weapon",
+    "motive",
+    "correct_count",
+    "is_culprit_correct",
+    "is_weapon_correct",
+    "is_motive_correct",
+    "explanation",
+    "created_at",
+)
+
+
+class ListingService:
+    async def list_games(self, player_id: str, limit: int, cursor: str | None) -> Page:
+        """Games the player owns (the (owner_id, created_at) index) or plays, newest first."""
+        queries = (Game.filter(owner_id=player_id), Game.filter(players__id=player_id))
+
+        return await keyset_union_page(queries, GAME_LIST_FIELDS, "created_at", limit, cursor)
+
+    async def list_questions(self, game_id: str, player_id: str, limit: int, cursor: str | None) -> Page:
+        """All players' questions about a game, newest first (the (game_id, asked_at) index)."""
+        game = await get_player_game(game_id, player_id)
+
+        return await keyset_page(GameQuestion.filter(game_id=game.id), QUESTION_LIST_FIELDS, "asked_at", limit, cursor)
+
+    async def list_proposals(self, player_id: str, game_id: str | None, limit: int, cursor: str | None) -> Page:
+        """The player's proposals, newest first: (player_id, created_at) index, or (game_id, player_id, created_at) for one game."""
+        query = Proposal.filter(player_id=player_id)
+        if game_id:
+            query = query.filter(game_id=game_id)
+
+        return await keyset_page(query, PROPOSAL_LIST_FIELDS, "created_at", limit, cursor)
@@ -0,0 +1,130 @@
+from collections import Counter
+from datetime import UTC, datetime
+
+from tortoise import BaseDBAsyncClient
+from tortoise.expressions import F
+from tortoise.functions import Count, Sum
+from tortoise.transactions import in_transaction
+
+from cluedogpt_backend.models.postgres_models import GameQuestion, Player, PlayerStats, Proposal
+
+
+STAT_FIELDS = ("games_played", "games_solved", "proposals_count", "correct_total", "questions_count")
+
+
+async def _increment(player_id: str, connection: BaseDBAsyncClient, **increments: int) -> None:
+    # A single UPDATE ... SET x = x + n, so concurrent inserts for the same player never lose an increment
+    updated = await PlayerStats.filter(player_id=player_id).using_db(connection).update(updated_at=datetime.now(UTC), **{field: F(field) + amount for field, amount in increments.items() if amount})
+    if not updated:
+        # Rows are created at sign-up and by the migration; this only covers players created some other way
+        await PlayerStats.create(player_id=player_id, using_db=connection, **increments)
+
+
+async def lock_player(player_id: str, connection: BaseDBAsyncClient) -> None:
+    """
+    Lock the player's row until the transaction ends.
+
+    Inserts for the same player then run one after the other, so whether an insert is the player's first in the game
+    (or solves it) can be read inside the transaction without two concurrent inserts both claiming it.
+    """
+    await Player.filter(id=player_id).using_db(connection).select_for_update().first()
+
+
+async def record_question(player_id: str, first_in_game: bool, connection: BaseDBAsyncClient) -> None:
+    """Count a new GameQuestion; call it in the transaction that inserts the question."""
+    await _increment(player_id, connection, questions_count=1, games_played=int(first_in_game))
+
+
+async def record_proposal(player_id: str, correct_count: int, first_in_game: bool, solves_game: bool, connection: BaseDBAsyncClient) -> None:
+    """Count a new Proposal; call it in the transaction that inserts the proposal."""
+    await _increment(
+        player_id,
+        connection,
+        proposals_count=1,
+        correct_total=correct_count,
+        games_played=int(first_in_game),
+        games_solved=int(solves_game),
+    )
+
+
+async def rebuild_player_stats(chunk_size: int = 500) -> int:
+    """Recompute every player's stats from proposals and game_questions, chunk_size players at a time. Returns the player count."""
+    rebuilt = 0
+    last_id = None
+
+    while True:
+        query = Player.all().order_by("id").limit(chunk_size)
+        if last_id is not None:
+            query = query.filter(id__gt=last_id)
+
+        player_ids = await query.values_list("id", flat=True)
+        if not player_ids:
+            break
+
+        await _rebuild_chunk([str(player_id) for player_id in player_ids])
+        rebuilt += len(player_ids)
+        last_id = player_ids[-1]
+
+    return rebuilt
+
+
+async def _rebuild_chunk(player_ids: list[str]) -> None:
+    """
+    Rebuild the stats of some players in one transaction.
+
+    Their stats rows are locked before the raw tables are read. An insert that updated a row first has committed
+    by the time the lock is granted, so its row is counted; one that comes later waits and increments the rebuilt totals.
+    """
+    async with in_transaction() as connection:
+        existing = {str(player_id) for player_id in await PlayerStats.filter(player_id__in=player_ids).using_db(connection).values_list("player_id", flat=True)}
+        missing = [PlayerStats(player_id=player_id) for player_id in player_ids if player_id not in existing]
+        if missing:
+            await PlayerStats.bulk_create(missing, ignore_conflicts=True, using_db=connection)
+
+        stats = await PlayerStats.filter(player_id__in=player_ids).select_for_update().using_db(connection)
+
+        proposals = (
+            await Proposal.filter(player_id__in=player_ids)
+            .using_db(connection)
+            .annotate(proposals=Count("id"), correct=Sum("correct_count"))
+            .group_by("player_id")
+            .values("player_id", "proposals", "correct")
+        )
+        solved = (
+            await Proposal.filter(player_id__in=player_ids, correct_count=3).using_db(connection).annotate(solved=Count("game_id", distinct=True)).group_by("player_id").values("player_id", "solved")
+        )
+        questions = await GameQuestion.filter(player_id__in=player_ids).using_db(connection).annotate(questions=Count("id")).group_by("player_id").values("player_id", "questions")
+        played_games = {
+            *await Proposal.filter(player_id__in=player_ids).using_db(connection).distinct().values_list("player_id", "game_id"),
+            *await GameQuestion.filter(player_id__in=player_ids).using_db(connection).distinct().values_list("player_id", "game_id"),
+        }
+
+        proposals_by_player = {str(row["player_id"]): row for row in proposals}
+        solved_by_player = {str(row["player_id"]): row["solved"] for row in solved}
+        questions_by_player = {str(row["player_id"]): row["questions"] for row in questions}
+        played_by_player = Counter(str(player_id) for player_id, _ in played_games)
+
+        updated_at = datetime.now(UTC)
+        for row in stats:
+            player_id = str(row.player_id)
+            row.games_played = played_by_player[player_id]
+            row.games_solved = solved_by_player.get(player_id, 0)
+            row.proposals_count = proposals_by_player.get(player_id, {}).get("proposals", 0)
+            row.correct_total = int(proposals_by_player.get(player_id, {}).get("correct") or 0)
+            row.questions_count = questions_by_player.get(player_id, 0)
+            row.updated_at = updated_at
+
+        if stats:
+            await PlayerStats.bulk_update(stats, fields=[*STAT_FIELDS, "updated_at"], using_db=connection)
+
+
+class PlayerStatsService:
+    async def get_stats(self, player_id: str) -> dict:
+        """The player's totals (all zeros for a player without a stats row)."""
+        stats = await PlayerStats.filter(player_id=player_id).first().values("player_id", *STAT_FIELDS)
+
+        return stats or {"player_id": player_id, **dict.fromkeys(STAT_FIELDS, 0)}
+
+    async def leaderboard(self, limit: int) -> list[dict]:
+        """Top players by games solved, then by correct fields; served by the (games_solved, correct_total) index."""
+        return await PlayerStats.all().order_by("-games_solved", "-correct_total").limit(limit).values("player_id", "player__name", *STAT_FIELDS)
@@ -0,0 +1,108 @@
+import re
+import unicodedata
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from enum import Enum
+
+from cluedogpt_backend.settings import settings
+
+
+SOLUTION_FIELDS = ("culprit", "weapon", "motive")
+
+# Articles of the languages games are played in; they carry no meaning when comparing a guess with the solution
+ARTICLES = frozenset({"the", "a", "an", "el", "la", "los", "las", "un", "una", "unos", "unas", "le", "les", "l", "une", "der", "die", "das", "ein", "eine"})
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+class Verdict(Enum):
+    CORRECT = "CORRECT"
+    INCORRECT = "INCORRECT"
+    # Neither clearly right nor clearly wrong: the model decides
+    AMBIGUOUS = "AMBIGUOUS"
+
+
+@dataclass(frozen=True)
+class FieldGrade:
+    verdict: Verdict
+    score: float
+    # How the verdict was reached: exact, similarity or model
+    method: str
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and punctuation, drop articles and collapse whitespace."""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = _PUNCTUATION.sub(" ", text)
+
+    return " ".join(token for token in text.split() if token not in ARTICLES)
+
+
+def _ratio(a: str, b: str) -> float:
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def token_set_ratio(a: str, b: str) -> float:
+    """
+    Similarity of two normalized strings that ignores word order and extra words on one side.
+
+    The shared words are compared with each side's full word set, so a guess whose words all appear in the
+    solution ("mustard" for "colonel mustard") scores 1.0.
+    """
+    tokens_a, tokens_b = set(a.split()), set(b.split())
+    common = " ".join(sorted(tokens_a & tokens_b))
+    combined_a = " ".join(filter(None, [common, " ".join(sorted(tokens_a - tokens_b))]))
+    combined_b = " ".join(filter(None, [common, " ".join(sorted(tokens_b - tokens_a))]))
+
+    if not common:
+        return _ratio(combined_a, combined_b)
+
+    return max(_ratio(common, combined_a), _ratio(common, combined_b), _ratio(combined_a, combined_b))
+
+
+def token_coverage(a: str, b: str) -> float:
+    """Share of the longer side's words that two normalized strings have in common."""
+    tokens_a, tokens_b = set(a.split()), set(b.split())
+
+    return len(tokens_a & tokens_b) / max(len(tokens_a), len(tokens_b))
+
+
+def similarity(guess: str, truth: str) -> float:
+    """Best of the token-set ratio and the character-level ratio (which catches typos) of two normalized strings."""
+    return max(token_set_ratio(guess, truth), _ratio(guess, truth))
+
+
+def grade_field(
+    guess: str,
+    truth: str,
+    accept_threshold: float | None = None,
+    reject_threshold: float | None = None,
+    min_token_coverage: float | None = None,
+) -> FieldGrade:
+    """
+    Grade one guess against the solution without the model; AMBIGUOUS when the similarity falls between the thresholds.
+
+    The token-set ratio scores a guess made of some of the solution's words ("mr" for "mr green", "money" for a whole
+    motive) as a perfect match, so such a guess is only accepted when it covers min_token_coverage of the words,
+    or when its characters match anyway (a typo). Otherwise the model decides.
+    """
+    accept_threshold = settings().grading_accept_threshold if accept_threshold is None else accept_threshold
+    reject_threshold = settings().grading_reject_threshold if reject_threshold is None else reject_threshold
+    min_token_coverage = settings().grading_min_token_coverage if min_token_coverage is None else min_token_coverage
+
+    guess, truth = normalize(guess), normalize(truth)
+    if not guess:
+        return FieldGrade(Verdict.INCORRECT, 0.0, "exact")
+    if guess == truth:
+        return FieldGrade(Verdict.CORRECT, 1.0, "exact")
+
+    score = similarity(guess, truth)
+    if score >= accept_threshold and (token_coverage(guess, truth) >= min_token_coverage or _ratio(guess, truth) >= accept_threshold):
+        return FieldGrade(Verdict.CORRECT, score, "similarity")
+    if score >= accept_threshold:
+        return FieldGrade(Verdict.AMBIGUOUS, score, "similarity")
+    if score < reject_threshold:
+        return FieldGrade(Verdict.INCORRECT, score, "similarity")
+
+    return FieldGrade(Verdict.AMBIGUOUS, score, "similarity")
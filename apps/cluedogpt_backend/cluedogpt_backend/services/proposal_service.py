@@ -0,0 +1,77 @@
+from tortoise.transactions import in_transaction
+
+from cluedogpt_backend.ai.agents import judge_proposal
+from cluedogpt_backend.api.api_contracts.requests.proposal_requests import ProposalRequest
+from cluedogpt_backend.api.api_contracts.responses.game_event_response import proposal_graded_event
+from cluedogpt_backend.api.exceptions import BadRequestError
+from cluedogpt_backend.app_logging import logger
+from cluedogpt_backend.infrastructure.admission import llm_limiter
+from cluedogpt_backend.infrastructure.metrics import proposal_field_grades_total
+from cluedogpt_backend.models.postgres_models import Game, GameQuestion, Proposal
+from cluedogpt_backend.services.game_access import get_playable_game
+from cluedogpt_backend.services.game_rooms import game_rooms
+from cluedogpt_backend.services.player_stats_service import lock_player, record_proposal
+from cluedogpt_backend.services.proposal_grading import SOLUTION_FIELDS, FieldGrade, Verdict, grade_field
+
+
+class ProposalService:
+    async def submit(self, game_id: str, player_id: str, request: ProposalRequest) -> Proposal:
+        """Grade the guess and store it. The model is only asked about the fields the grader cannot decide."""
+        game = await get_playable_game(game_id, player_id)
+
+        # Checked before grading, which may call the model, and again under the lock
+        self._check_limit(game, await Proposal.filter(game_id=game.id, player_id=player_id).count())
+
+        grades, explanation = await self._grade(game, request)
+        correct = {field: grade.verdict == Verdict.CORRECT for field, grade in grades.items()}
+        correct_count = sum(correct.values())
+
+        async with in_transaction() as connection:
+            await lock_player(player_id, connection)
+            previous_scores = await Proposal.filter(game_id=game.id, player_id=player_id).using_db(connection).values_list("correct_count", flat=True)
+            self._check_limit(game, len(previous_scores))
+
+            first_in_game = not previous_scores and not await GameQuestion.filter(game_id=game.id, player_id=player_id).using_db(connection).exists()
+            solves_game = correct_count == len(SOLUTION_FIELDS) and len(SOLUTION_FIELDS) not in previous_scores
+            proposal = await Proposal.create(
+                game=game,
+                player_id=player_id,
+                culprit=request.culprit,
+                weapon=request.weapon,
+                motive=request.motive,
+                correct_count=correct_count,
+                is_culprit_correct=correct["culprit"],
+                is_weapon_correct=correct["weapon"],
+                is_motive_correct=correct["motive"],
+                explanation=explanation,
+                using_db=connection,
+            )
+            await record_proposal(player_id, correct_count, first_in_game, solves_game, connection)
+        logger.info(f"Proposal {proposal.id} graded {proposal.correct_count}/3 ({', '.join(f'{field}: {grade.method}' for field, grade in grades.items())})")
+        game_rooms.publish(proposal_graded_event(proposal))
+
+        return proposal
+
+    @staticmethod
+    def _check_limit(game: Game, submitted: int) -> None:
+        if game.max_proposals is not None and submitted >= game.max_proposals:
+            raise BadRequestError(error_code="proposal_limit_reached", message=f"No proposals left in game {game.id}")
+
+    async def _grade(self, game: Game, request: ProposalRequest) -> tuple[dict[str, FieldGrade], str | None]:
+        grades = {field: grade_field(getattr(request, field), getattr(game, field)) for field in SOLUTION_FIELDS}
+        explanation = None
+
+        ambiguous = [field for field, grade in grades.items() if grade.verdict == Verdict.AMBIGUOUS]
+        if ambiguous:
+            # Most proposals are graded without the model, so the slot is only taken when it is needed
+            async with llm_limiter.slot():
+                judgement = await judge_proposal({field: (getattr(request, field), getattr(game, field)) for field in ambiguous})
+            for field in ambiguous:
+                verdict = Verdict.CORRECT if getattr(judgement, f"{field}_correct") else Verdict.INCORRECT
+                grades[field] = FieldGrade(verdict, grades[field].score, "model")
+            explanation = judgement.explanation
+
+        for grade in grades.values():
+            proposal_field_grades_total.inc(method=grade.method)
+
+        return grades, explanation
@@ -0,0 +1,97 @@
+import asyncio
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+
+from cluedogpt_backend.ai.agents import answer_game_master_questions
+from cluedogpt_backend.app_logging import logger
+from cluedogpt_backend.infrastructure.admission import llm_limiter
+from cluedogpt_backend.models.postgres_models import Game, GameQuestion, QAStatus
+from cluedogpt_backend.settings import settings
+
+
+@dataclass
+class _Batch:
+    game: Game
+    questions: list[GameQuestion] = field(default_factory=list)
+    waiters: list[asyncio.Future[str]] = field(default_factory=list)
+    # Set when the batch stops accepting questions before its window is over (full, or shutting down)
+    closed: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class QuestionBatcher:
+    """
+    Answers the ASKED questions of a game that arrive within question_batch_window_ms with a single model call.
+
+    The first question of a game opens a batch; it is answered once the window is over or question_batch_max_size
+    questions joined it, whichever comes first. The batch takes one model concurrency slot for its single call, however
+    many requests wait on it. The answers are stored in one bulk update and handed back to the waiting requests.
+    Batches are per worker process: questions that land on different workers are not merged.
+    """
+
+    def __init__(self) -> None:
+        self._batches: dict[str, _Batch] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def answer(self, game: Game, question: GameQuestion) -> str:
+        """Wait for the question's answer. The question is saved as ANSWERED before this returns."""
+        game_key = str(game.id)
+        batch = self._batches.get(game_key)
+        if batch is None:
+            batch = self._batches[game_key] = _Batch(game=game)
+            task = asyncio.create_task(self._run(game_key, batch), name=f"question-batch-{game_key}")
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        waiter = asyncio.get_running_loop().create_future()
+        batch.questions.append(question)
+        batch.waiters.append(waiter)
+
+        if len(batch.questions) >= settings().question_batch_max_size or settings().question_batch_window_ms <= 0:
+            self._close(game_key, batch)
+
+        return await waiter
+
+    async def stop(self) -> None:
+        """Answer the open batches right away and wait for every batch in flight."""
+        for game_key, batch in list(self._batches.items()):
+            self._close(game_key, batch)
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _close(self, game_key: str, batch: _Batch) -> None:
+        if self._batches.get(game_key) is batch:
+            del self._batches[game_key]
+        batch.closed.set()
+
+    async def _run(self, game_key: str, batch: _Batch) -> None:
+        try:
+            await asyncio.wait_for(batch.closed.wait(), timeout=settings().question_batch_window_ms / 1000)
+        except TimeoutError:
+            pass
+        self._close(game_key, batch)
+
+        try:
+            async with llm_limiter.slot():
+                answers = await answer_game_master_questions(batch.game, [question.question_text for question in batch.questions])
+
+            answered_at = datetime.now(UTC)
+            for question, answer in zip(batch.questions, answers, strict=True):
+                question.answer_text = answer
+                question.status = QAStatus.ANSWERED
+                question.answered_at = answered_at
+            await GameQuestion.bulk_update(batch.questions, fields=["answer_text", "status", "answered_at"])
+        except Exception as exc:  # noqa: BLE001
+            logger.exception(f"Answering {len(batch.questions)} questions of game {game_key} failed")
+            for waiter in batch.waiters:
+                if not waiter.done():
+                    waiter.set_exception(exc)
+            return
+
+        logger.info(f"Answered {len(batch.questions)} batched questions of game {game_key}")
+        for waiter, answer in zip(batch.waiters, answers, strict=True):
+            # A waiter is cancelled when its client went away; the answer is stored all the same
+            if not waiter.done():
+                waiter.set_result(answer)
+
+
+question_batcher = QuestionBatcher()
@@ -0,0 +1,100 @@
+"""
+Decides whether a story iteration needs a new solution.
+
+Each Game keeps the fingerprint of the story its solution was written for, and how far the story drifted from it
+since: the word-level distance (1 - similarity) of every edit kept in between, summed. A run of small edits thus adds
+up to a rewrite instead of drifting away from the solution unnoticed, without keeping a copy of the old story.
+"""
+
+import hashlib
+from difflib import SequenceMatcher
+from enum import Enum
+from typing import Any
+
+from cluedogpt_backend.ai.deps import GameAgentDeps
+from cluedogpt_backend.app_logging import logger
+from cluedogpt_backend.infrastructure.metrics import story_changes_total
+from cluedogpt_backend.models.postgres_models import Game
+from cluedogpt_backend.services.proposal_grading import SOLUTION_FIELDS, normalize
+from cluedogpt_backend.settings import settings
+
+
+class StoryChange(Enum):
+    """How an iteration changed the story; only UNCHANGED and MINOR_EDIT keep the solution."""
+
+    UNCHANGED = "unchanged"
+    MINOR_EDIT = "minor_edit"
+    # There is no solution yet
+    NO_SOLUTION = "no_solution"
+    # The culprit, weapon or motive is no longer mentioned in the story
+    SOLUTION_MISSING = "solution_missing"
+    # The edits since the solution was written add up to more than the similarity threshold allows
+    REWRITTEN = "rewritten"
+
+    @property
+    def keeps_solution(self) -> bool:
+        return self in (StoryChange.UNCHANGED, StoryChange.MINOR_EDIT)
+
+
+def story_fingerprint(story: str) -> str:
+    """sha256 of the story with whitespace collapsed, so reflowed text keeps its fingerprint."""
+    return hashlib.sha256(" ".join(story.split()).encode()).hexdigest()
+
+
+def solution_story_fields(story: str) -> dict[str, Any]:
+    """Game fields recording that the solution was written for story."""
+    return {"solution_story_hash": story_fingerprint(story), "solution_story_drift": 0.0}
+
+
+def _mentioned(text: str, story_tokens: set[str]) -> bool:
+    tokens = normalize(text).split()
+    if not tokens:
+        return False
+
+    return sum(token in story_tokens for token in tokens) / len(tokens) >= settings().story_change_mention_threshold
+
+
+def detect_story_change(previous_story: str, game: Game) -> tuple[StoryChange, float]:
+    """
+    Classify the change from previous_story to game.story, with the cheapest checks first.
+
+    Returns the change with the game's drift from the story the solution was written for, this edit included.
+    """
+    if game.solution_story_hash and story_fingerprint(game.story) == game.solution_story_hash:
+        return StoryChange.UNCHANGED, 0.0
+
+    if not (game.culprit and game.weapon and game.motive):
+        return StoryChange.NO_SOLUTION, game.solution_story_drift
+
+    story_tokens = set(normalize(game.story).split())
+    if not all(_mentioned(getattr(game, name), story_tokens) for name in SOLUTION_FIELDS):
+        return StoryChange.SOLUTION_MISSING, game.solution_story_drift
+
+    # Word-level diff: a reworded sentence costs a few words, not every character after it.
+    # quick_ratio is an upper bound of ratio, so clearly rewritten stories skip the full diff
+    matcher = SequenceMatcher(None, previous_story.split(), game.story.split(), autojunk=False)
+    allowed_drift = 1 - settings().story_change_similarity_threshold
+    for ratio in (matcher.quick_ratio, matcher.ratio):
+        drift = game.solution_story_drift + 1 - ratio()
+        if drift > allowed_drift:
+            return StoryChange.REWRITTEN, drift
+
+    return StoryChange.MINOR_EDIT, drift
+
+
+def solution_outdated(previous_story: str, deps: GameAgentDeps) -> bool:
+    """Whether the story agent changed the story enough that the solution agent has to run again."""
+    change, drift = detect_story_change(previous_story, deps.game)
+    story_changes_total.inc(change=change.value)
+    if not change.keeps_solution:
+        return True
+
+    deps.update_game(solution_story_drift=drift)
+    logger.info(f"Keeping the solution of game {deps.game.id}: story {change.value.replace('_', ' ')}")
+    return False
+
+
+def record_solution_story(deps: GameAgentDeps) -> None:
+    """After an iteration, mark the story as the one the solution was written for if the solution was (re)written."""
+    if deps.changed_fields.intersection(SOLUTION_FIELDS):
+        deps.update_game(**solution_story_fields(deps.game.story))
@@ -0,0 +1,49 @@
+from datetime import UTC, datetime, timedelta
+from enum import StrEnum
+from typing import Any
+
+from tortoise import connections
+
+
+class UsageGroupBy(StrEnum):
+    GAME = "game"
+    AGENT = "agent"
+    DAY = "day"
+
+
+# Group key expression and ordering per grouping; both are fixed strings, never user input
+_BY_TOKEN_SPEND = 'coalesce(sum(m."input_tokens"), 0) + coalesce(sum(m."output_tokens"), 0) DESC'
+_GROUPINGS: dict[UsageGroupBy, tuple[str, str]] = {
+    UsageGroupBy.GAME: ('c."game_id"::text', _BY_TOKEN_SPEND),
+    UsageGroupBy.AGENT: ('m."agent_name"', _BY_TOKEN_SPEND),
+    UsageGroupBy.DAY: ("(m.\"created_at\" AT TIME ZONE 'UTC')::date::text", '"key" DESC'),
+}
+
+# Rows with a latency are the ones that close an agent run (see GameAgentDeps.add_agent_run)
+_AGENT_USAGE_QUERY = """
+SELECT {key} AS "key",
+       count(*) AS "runs",
+       percentile_cont(0.5) WITHIN GROUP (ORDER BY m."latency_ms") AS "latency_p50_ms",
+       percentile_cont(0.95) WITHIN GROUP (ORDER BY m."latency_ms") AS "latency_p95_ms",
+       percentile_cont(0.99) WITHIN GROUP (ORDER BY m."latency_ms") AS "latency_p99_ms",
+       coalesce(sum(m."input_tokens"), 0) AS "input_tokens",
+       coalesce(sum(m."output_tokens"), 0) AS "output_tokens"
+FROM "definition_messages" m
+JOIN "game_definition_conversations" c ON c."id" = m."conversation_id"
+WHERE m."latency_ms" IS NOT NULL AND m."created_at" >= $1 AND m."created_at" < $2
+GROUP BY 1
+ORDER BY {order}
+LIMIT $3
+"""
+
+
+class UsageReportService:
+    async def agent_usage(self, group_by: UsageGroupBy, since: datetime | None = None, until: datetime | None = None, limit: int = 100) -> dict[str, Any]:
+        """Latency percentiles and token spend of agent runs, grouped by game, agent or UTC day. Defaults to the last 7 days."""
+        until = until or datetime.now(UTC)
+        since = since or until - timedelta(days=7)
+        key, order = _GROUPINGS[group_by]
+
+        rows = await connections.get("default").execute_query_dict(_AGENT_USAGE_QUERY.format(key=key, order=order), [since, until, limit])
+
+        return {"group_by": group_by, "since": since, "until": until, "rows": rows}
@@ -0,0 +1,129 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+from tortoise.transactions import in_transaction
+
+from cluedogpt_backend.ai.agents import generate_warm_game
+from cluedogpt_backend.app_logging import logger
+from cluedogpt_backend.infrastructure.admission import llm_limiter
+from cluedogpt_backend.infrastructure.postgres_db import advisory_lock
+from cluedogpt_backend.models.postgres_models import Game, WarmGame
+from cluedogpt_backend.services.game_init_jobs import game_init_job_queue
+from cluedogpt_backend.services.story_changes import solution_story_fields
+from cluedogpt_backend.settings import settings
+
+
+WARM_POOL_LOCK_ID = 0x7761_726D_706F_6F6C  # "warmpool"
+# A reservation still empty after this long was left behind by a replica that stopped while generating it
+RESERVATION_STALE_SECONDS = 600
+
+
+def is_generic_message(message: str) -> bool:
+    """Whether a first message asks for nothing in particular, so any pre-generated story will do."""
+    normalized = message.strip().strip(".!").lower()
+    return normalized in {generic.lower() for generic in settings().warm_pool_generic_messages}
+
+
+async def claim_warm_game(language: str, locale: str, **game_fields) -> Game | None:
+    """
+    Atomically claim the oldest pool entry for this language and locale, and turn it into a new Game.
+
+    Entries locked by a concurrent claim are skipped rather than waited on, and so are entries without a story or culprit.
+    """
+    async with in_transaction() as connection:
+        entry = await WarmGame.filter(language=language, locale=locale, story__not="", culprit__not="").order_by("created_at").select_for_update(skip_locked=True).using_db(connection).first()
+        if not entry:
+            return None
+
+        game = await Game.create(
+            language=language,
+            locale=locale,
+            story=entry.story,
+            culprit=entry.culprit,
+            weapon=entry.weapon,
+            motive=entry.motive,
+            **solution_story_fields(entry.story),
+            using_db=connection,
+            **game_fields,
+        )
+        await entry.delete(using_db=connection)
+
+    return game
+
+
+class WarmPoolProducer:
+    """
+    Background task that keeps warm_pool_size entries ready for each configured language/locale.
+
+    Refills are throttled: at most one entry is generated per interval, and none while game init jobs are waiting.
+    A slot is reserved with an empty entry, which claims skip, while holding the warm pool advisory lock, so replicas
+    do not overfill the pool between them; the lock is released before the model is called.
+    """
+
+    def __init__(self) -> None:
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if settings().warm_pool_size > 0:
+            self._task = asyncio.create_task(self._run(), name="warm-pool-producer")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings().warm_pool_refill_interval_seconds)
+
+            if game_init_job_queue.pending():
+                continue
+
+            try:
+                await self._refill_one()
+            except Exception:  # noqa: BLE001
+                logger.exception("Warm pool refill failed")
+
+    async def _reserve(self, language: str, locale: str) -> WarmGame | None:
+        """Reserve a slot in the pool with an empty entry; None when the pool is full or another replica is reserving."""
+        async with advisory_lock(WARM_POOL_LOCK_ID) as acquired:
+            if not acquired:
+                return None
+
+            stale_before = datetime.now(UTC) - timedelta(seconds=RESERVATION_STALE_SECONDS)
+            await WarmGame.filter(language=language, locale=locale, story="", created_at__lt=stale_before).delete()
+
+            if await WarmGame.filter(language=language, locale=locale).count() >= settings().warm_pool_size:
+                return None
+
+            return await WarmGame.create(language=language, locale=locale, story="", culprit="", weapon="", motive="")
+
+    async def _refill_one(self) -> None:
+        for variant in settings().warm_pool_variants:
+            language, _, locale = variant.partition(":")
+
+            entry = await self._reserve(language, locale)
+            if entry is None:
+                continue
+
+            filled = False
+            try:
+                async with llm_limiter.slot(background=True):
+                    game = await generate_warm_game(language, locale)
+                if not all((game.story, game.culprit, game.weapon, game.motive)):
+                    logger.warning(f"Discarded an incomplete warm pool story for {language}/{locale}")
+                    return
+
+                entry.story, entry.culprit, entry.weapon, entry.motive = game.story, game.culprit, game.weapon, game.motive
+                await entry.save(update_fields=["story", "culprit", "weapon", "motive"])
+                filled = True
+            finally:
+                if not filled:
+                    await entry.delete()
+
+            logger.info(f"Added a warm pool entry for {language}/{locale}")
+            return
+
+
+warm_pool_producer = WarmPoolProducer()
@@ -0,0 +1,74 @@
+import asyncio
+import base64
+import binascii
+import json
+import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+
+from tortoise.expressions import Q
+from tortoise.models import Model
+from tortoise.queryset import QuerySet
+
+from cluedogpt_backend.api.exceptions import BadRequestError
+
+
+@dataclass
+class Page:
+    items: list[Model]
+    next_cursor: str | None
+
+
+def encode_cursor(sort_value: datetime, row_id: object) -> str:
+    """Opaque cursor for the position just after a row, as URL-safe base64 of its sort value and id."""
+    payload = json.dumps([sort_value.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(sort_value), str(uuid.UUID(row_id))
+    except (binascii.Error, TypeError, ValueError) as exc:
+        raise BadRequestError(error_code="invalid_cursor", message="Invalid pagination cursor") from exc
+
+
+async def keyset_page(query: QuerySet, fields: Sequence[str], sort_field: str, limit: int, cursor: str | None) -> Page:
+    """
+    One page of `query`, newest first by (sort_field, id), as partial models with only `fields` loaded.
+
+    The cursor is turned into a (sort_field, id) < (value, id) condition instead of an OFFSET, so every page costs
+    the same index range scan however deep it is. `fields` must include sort_field and id.
+    """
+    return _page(await _keyset_rows(query, fields, sort_field, limit, cursor), sort_field, limit)
+
+
+async def keyset_union_page(queries: Sequence[QuerySet], fields: Sequence[str], sort_field: str, limit: int, cursor: str | None) -> Page:
+    """
+    Like keyset_page, for the union of several queries of the same model.
+
+    An OR across a join cannot follow the (sort_field, id) order of an index, so each query fetches its own page
+    through its own index, and the pages are merged and deduplicated by id here.
+    """
+    pages = await asyncio.gather(*(_keyset_rows(query, fields, sort_field, limit, cursor) for query in queries))
+    rows = sorted({row.id: row for page in pages for row in page}.values(), key=lambda row: (getattr(row, sort_field), row.id), reverse=True)
+
+    return _page(rows[: limit + 1], sort_field, limit)
+
+
+async def _keyset_rows(query: QuerySet, fields: Sequence[str], sort_field: str, limit: int, cursor: str | None) -> list[Model]:
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        query = query.filter(Q(**{f"{sort_field}__lt": sort_value}) | Q(**{sort_field: sort_value, "id__lt": row_id}))
+
+    # One extra row tells whether there is a next page
+    return await query.order_by(f"-{sort_field}", "-id").limit(limit + 1).only(*fields)
+
+
+def _page(rows: list[Model], sort_field: str, limit: int) -> Page:
+    if len(rows) <= limit:
+        return Page(items=rows, next_cursor=None)
+
+    last = rows[limit - 1]
+    return Page(items=rows[:limit], next_cursor=encode_cursor(getattr(last, sort_field), last.id))
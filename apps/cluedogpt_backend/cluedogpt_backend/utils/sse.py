@@ -0,0 +1,10 @@
+import json
+from typing import Any
+
+
+def format_sse(data: Any, event: str | None = None) -> str:
+    """Format a payload as a single Server-Sent Events message."""
+    message = f"event: {event}\n" if event else ""
+    message += f"data: {json.dumps(data)}\n\n"
+
+    return message
@@ -0,0 +1,24 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "game_init_jobs" (
+    "id" UUID NOT NULL PRIMARY KEY,
+    "message" TEXT NOT NULL,
+    "status" VARCHAR(7) NOT NULL DEFAULT 'queued',
+    "error" TEXT,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "started_at" TIMESTAMPTZ,
+    "finished_at" TIMESTAMPTZ,
+    "game_id" UUID NOT NULL REFERENCES "games" ("id") ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS "idx_game_init_j_game_id_3b1d2e" ON "game_init_jobs" ("game_id");
+CREATE INDEX IF NOT EXISTS "idx_game_init_j_status_8c5f0a" ON "game_init_jobs" ("status", "created_at");
+COMMENT ON COLUMN "game_init_jobs"."status" IS 'QUEUED: queued\nRUNNING: running\nDONE: done\nFAILED: failed';
+COMMENT ON TABLE "game_init_jobs" IS 'A queued game-init iteration (story + solution generation).';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "game_init_jobs";"""
@@ -0,0 +1,18 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "agent_run_cache" (
+    "key" VARCHAR(64) NOT NULL PRIMARY KEY,
+    "responses" JSONB NOT NULL,
+    "expires_at" TIMESTAMPTZ NOT NULL,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS "idx_agent_run_c_expires_5e2a91" ON "agent_run_cache" ("expires_at");
+COMMENT ON TABLE "agent_run_cache" IS 'Persistent tier of the agent run cache.';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "agent_run_cache";"""
@@ -0,0 +1,22 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "warm_games" (
+    "id" UUID NOT NULL PRIMARY KEY,
+    "language" VARCHAR(30) NOT NULL,
+    "locale" VARCHAR(30) NOT NULL,
+    "culprit" VARCHAR(255) NOT NULL,
+    "weapon" VARCHAR(255) NOT NULL,
+    "motive" VARCHAR(255) NOT NULL,
+    "story" TEXT NOT NULL,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS "idx_warm_games_languag_6d0f47" ON "warm_games" ("language", "locale", "created_at");
+COMMENT ON TABLE "warm_games" IS 'A pre-generated story and solution, waiting to be claimed by a new game.';"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "warm_games";"""
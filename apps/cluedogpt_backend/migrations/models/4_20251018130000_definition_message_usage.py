@@ -0,0 +1,19 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "definition_messages" ADD "agent_name" VARCHAR(50);
+ALTER TABLE "definition_messages" ADD "latency_ms" INT;
+ALTER TABLE "definition_messages" ADD "input_tokens" INT;
+ALTER TABLE "definition_messages" ADD "output_tokens" INT;
+CREATE INDEX IF NOT EXISTS "idx_definition__created_32ec83" ON "definition_messages" ("created_at");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_definition__created_32ec83";
+ALTER TABLE "definition_messages" DROP COLUMN "agent_name";
+ALTER TABLE "definition_messages" DROP COLUMN "latency_ms";
+ALTER TABLE "definition_messages" DROP COLUMN "input_tokens";
+ALTER TABLE "definition_messages" DROP COLUMN "output_tokens";"""
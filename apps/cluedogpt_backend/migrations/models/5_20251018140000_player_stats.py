@@ -0,0 +1,35 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "player_stats" (
+    "games_played" INT NOT NULL DEFAULT 0,
+    "games_solved" INT NOT NULL DEFAULT 0,
+    "proposals_count" INT NOT NULL DEFAULT 0,
+    "correct_total" INT NOT NULL DEFAULT 0,
+    "questions_count" INT NOT NULL DEFAULT 0,
+    "updated_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "player_id" UUID NOT NULL PRIMARY KEY REFERENCES "players" ("id") ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS "idx_player_stat_games_s_9dc304" ON "player_stats" ("games_solved", "correct_total");
+COMMENT ON TABLE "player_stats" IS 'Running totals of a player''s activity, so stats and leaderboard reads never scan proposals or game_questions.';
+INSERT INTO "player_stats" ("player_id", "games_played", "games_solved", "proposals_count", "correct_total", "questions_count")
+SELECT
+    p."id",
+    (SELECT COUNT(*) FROM (
+        SELECT "game_id" FROM "proposals" WHERE "player_id" = p."id"
+        UNION
+        SELECT "game_id" FROM "game_questions" WHERE "player_id" = p."id"
+    ) AS played),
+    (SELECT COUNT(DISTINCT "game_id") FROM "proposals" WHERE "player_id" = p."id" AND "correct_count" = 3),
+    (SELECT COUNT(*) FROM "proposals" WHERE "player_id" = p."id"),
+    (SELECT COALESCE(SUM("correct_count"), 0) FROM "proposals" WHERE "player_id" = p."id"),
+    (SELECT COUNT(*) FROM "game_questions" WHERE "player_id" = p."id")
+FROM "players" AS p
+ON CONFLICT ("player_id") DO NOTHING;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "player_stats";"""
@@ -0,0 +1,58 @@
+import os
+
+
+# Settings are read on first use, so the environment has to be in place before the app modules are imported.
+# Tests run against an in-memory SQLite database and never reach a real model provider.
+os.environ["POSTGRES_DSN"] = "sqlite://:memory:"
+os.environ.setdefault("API_HOST", "127.0.0.1")
+os.environ.setdefault("AI_MODEL_API_KEY", "test")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-that-is-long-enough-for-hs256")
+os.environ.setdefault("WARM_POOL_SIZE", "0")
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from tortoise import Tortoise
+
+
+@pytest.fixture
+async def db():
+    """A fresh in-memory database with the app's schema."""
+    from cluedogpt_backend.infrastructure.postgres_db import init_db
+
+    await init_db()
+    await Tortoise.generate_schemas()
+    yield
+    await Tortoise.close_connections()
+
+
+@pytest.fixture
+async def player(db):
+    from cluedogpt_backend.models.postgres_models import Player
+
+    return await Player.create(name="Alice")
+
+
+@pytest.fixture
+def make_game(db):
+    """Create a game owned by the given player; the solution fields are empty unless passed."""
+    from cluedogpt_backend.models.postgres_models import Game
+
+    async def make(owner, **values):
+        values = {"name": "Test game", "expiry_date": datetime.now(UTC) + timedelta(days=1), "culprit": "", "weapon": "", "motive": "", "story": "", **values}
+        return await Game.create(owner=owner, **values)
+
+    return make
+
+
+@pytest.fixture
+def login():
+    """Cookies authenticating the given player."""
+    from cluedogpt_backend.auth.jwt_auth import create_access_token
+    from cluedogpt_backend.dto.user import UserJwt
+
+    def cookies(player) -> dict[str, str]:
+        token, _ = create_access_token(UserJwt(user_id=str(player.id), name=player.name))
+        return {"access_token": token}
+
+    return cookies
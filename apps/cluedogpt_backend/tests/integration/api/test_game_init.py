@@ -0,0 +1,37 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from cluedogpt_backend.api.main import app
+from cluedogpt_backend.models.postgres_models import GameInitJob, Player
+
+
+@pytest.fixture
+async def client(db):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+async def test_job_status_requires_a_login(client, player, make_game):
+    job = await GameInitJob.create(game=await make_game(player), message="A murder on a train")
+
+    response = await client.get(f"/api/v1/game-init/jobs/{job.id}")
+
+    assert response.status_code == 401
+
+
+async def test_job_status_of_the_owners_game(client, player, make_game, login):
+    job = await GameInitJob.create(game=await make_game(player), message="A murder on a train")
+
+    response = await client.get(f"/api/v1/game-init/jobs/{job.id}", cookies=login(player))
+
+    assert response.status_code == 200
+    assert response.json()["job_id"] == str(job.id)
+
+
+async def test_job_status_of_another_players_game_is_not_found(client, player, make_game, login):
+    job = await GameInitJob.create(game=await make_game(player), message="A murder on a train")
+    stranger = await Player.create(name="Mallory")
+
+    response = await client.get(f"/api/v1/game-init/jobs/{job.id}", cookies=login(stranger))
+
+    assert response.status_code == 404
@@ -0,0 +1,48 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from cluedogpt_backend.api.main import app
+from cluedogpt_backend.settings import settings
+
+
+@pytest.fixture
+async def client(db):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+def internal_token(monkeypatch):
+    monkeypatch.setattr(settings(), "internal_api_token", "internal-secret")
+    return "internal-secret"
+
+
+INTERNAL_PATHS = ["/internal/db-pool", "/internal/agent-usage", "/metrics"]
+
+
+@pytest.mark.parametrize("path", INTERNAL_PATHS)
+async def test_internal_endpoints_are_disabled_without_a_token(client, path):
+    response = await client.get(path, headers={"Authorization": "Bearer anything"})
+
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize("path", INTERNAL_PATHS)
+@pytest.mark.parametrize("headers", [{}, {"Authorization": "Bearer wrong"}])
+async def test_internal_endpoints_reject_a_wrong_token(client, internal_token, path, headers):
+    response = await client.get(path, headers=headers)
+
+    assert response.status_code == 401
+
+
+async def test_db_pool_stats_with_the_internal_token(client, internal_token):
+    response = await client.get("/internal/db-pool", headers={"Authorization": f"Bearer {internal_token}"})
+
+    assert response.status_code == 200
+
+
+async def test_metrics_with_the_internal_token(client, internal_token):
+    response = await client.get("/metrics", headers={"Authorization": f"Bearer {internal_token}"})
+
+    assert response.status_code == 200
+    assert "db_pool_connections" in response.text
@@ -0,0 +1,71 @@
+from datetime import UTC, datetime, timedelta
+
+from pydantic_ai.messages import ModelRequest, ModelResponse, TextPart, UserPromptPart
+
+from cluedogpt_backend.ai.cache import AgentRunCache
+from cluedogpt_backend.infrastructure.metrics import agent_cache_lookups_total
+from cluedogpt_backend.models.postgres_models import AgentRunCacheEntry
+from cluedogpt_backend.services.expiry_sweeper import ExpirySweeper
+
+
+RESPONSES = [ModelResponse(parts=[TextPart(content="A storm over the manor.")])]
+KEY = AgentRunCache.key("gpt-4o", "You write stories.", "A murder at the manor")
+
+
+def _lookups() -> dict[str, float]:
+    return {result: agent_cache_lookups_total.value(result=result) for result in ("memory_hit", "persistent_hit", "miss")}
+
+
+def test_key_changes_with_the_model_prompts_and_history():
+    history = [ModelRequest(parts=[UserPromptPart(content="A murder at the manor")]), *RESPONSES]
+
+    assert AgentRunCache.key("gpt-4o", "You write stories.", "A murder at the manor") == KEY
+    assert AgentRunCache.key("gpt-4o-mini", "You write stories.", "A murder at the manor") != KEY
+    assert AgentRunCache.key("gpt-4o", "You write solutions.", "A murder at the manor") != KEY
+    assert AgentRunCache.key("gpt-4o", "You write stories.", "A murder on the train") != KEY
+    assert AgentRunCache.key("gpt-4o", "You write stories.", "A murder at the manor", history) != KEY
+
+
+async def test_memory_hit_and_miss_are_counted():
+    cache = AgentRunCache(max_entries=10, ttl_seconds=60)
+    before = _lookups()
+
+    assert await cache.get(KEY) is None
+    await cache.set(KEY, RESPONSES)
+    assert await cache.get(KEY) == RESPONSES
+
+    after = _lookups()
+    assert after["miss"] - before["miss"] == 1
+    assert after["memory_hit"] - before["memory_hit"] == 1
+
+
+async def test_expired_entries_are_misses():
+    cache = AgentRunCache(max_entries=10, ttl_seconds=0)
+
+    await cache.set(KEY, RESPONSES)
+
+    assert await cache.get(KEY) is None
+
+
+async def test_persistent_tier_serves_other_workers_until_expiry(db):
+    await AgentRunCache(max_entries=10, ttl_seconds=60, persistent=True).set(KEY, RESPONSES)
+    before = _lookups()
+
+    # A fresh in-memory tier, as in another worker
+    responses = await AgentRunCache(max_entries=10, ttl_seconds=60, persistent=True).get(KEY)
+
+    assert [part.content for response in responses for part in response.parts] == ["A storm over the manor."]
+    assert _lookups()["persistent_hit"] - before["persistent_hit"] == 1
+
+    await AgentRunCacheEntry.filter(key=KEY).update(expires_at=datetime.now(UTC) - timedelta(seconds=1))
+    assert await AgentRunCache(max_entries=10, ttl_seconds=60, persistent=True).get(KEY) is None
+
+
+async def test_sweeper_deletes_expired_rows(db):
+    now = datetime.now(UTC)
+    await AgentRunCacheEntry.create(key="expired", responses=[], expires_at=now - timedelta(minutes=1))
+    await AgentRunCacheEntry.create(key="live", responses=[], expires_at=now + timedelta(minutes=1))
+
+    await ExpirySweeper().sweep()
+
+    assert await AgentRunCacheEntry.all().values_list("key", flat=True) == ["live"]
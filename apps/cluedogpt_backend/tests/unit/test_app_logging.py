@@ -0,0 +1,32 @@
+import json
+import logging
+
+import pytest
+
+from cluedogpt_backend.app_logging import logger, setup_logging, shutdown_logging
+
+
+@pytest.fixture
+def root_logger():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield root
+    shutdown_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def test_exceptions_logged_through_the_queue_keep_their_own_json_field(root_logger, tmp_path):
+    log_file = tmp_path / "cluedogpt.log"
+    setup_logging(log_file=str(log_file), console_level="CRITICAL", json_format=True)
+
+    try:
+        raise ValueError("no culprit")
+    except ValueError:
+        logger.exception("Game %s failed", "g1")
+    shutdown_logging()
+
+    entry = json.loads(log_file.read_text().splitlines()[-1])
+    assert entry["message"] == "Game g1 failed"
+    assert entry["exception"].startswith("Traceback")
+    assert "ValueError: no culprit" in entry["exception"]
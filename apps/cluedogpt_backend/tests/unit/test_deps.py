@@ -0,0 +1,51 @@
+from pydantic_ai import Agent
+from pydantic_ai.messages import ModelMessage, ModelResponse, TextPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.usage import RequestUsage
+
+from cluedogpt_backend.ai.deps import GameAgentDeps
+from cluedogpt_backend.ai.history import get_conversation
+from cluedogpt_backend.models.postgres_models import ConversationRole, DefinitionMessage
+
+
+async def test_flushes_starting_from_the_same_idx_append_after_each_other(player, make_game):
+    game = await make_game(player)
+    conversation = await get_conversation(game)
+    first, second = GameAgentDeps(game=game, conversation=conversation), GameAgentDeps(game=game, conversation=conversation)
+
+    for deps, name in ((first, "first"), (second, "second")):
+        deps.add_message(ConversationRole.USER, f"{name} question")
+        deps.add_message(ConversationRole.ASSISTANT, f"{name} answer")
+
+    await second.flush()
+    await first.flush()
+
+    messages = await DefinitionMessage.filter(conversation_id=conversation.id).order_by("idx").values_list("idx", "content")
+    assert messages == [(0, "second question"), (1, "second answer"), (2, "first question"), (3, "first answer")]
+    assert first.next_message_idx == 4
+
+
+async def test_a_run_without_tool_calls_or_user_message_records_its_usage(player, make_game):
+    game = await make_game(player)
+    conversation = await get_conversation(game)
+    deps = GameAgentDeps(game=game, conversation=conversation)
+
+    def reply(_messages: list[ModelMessage], _info: AgentInfo) -> ModelResponse:
+        return ModelResponse(parts=[TextPart(content="Nothing to change.")], usage=RequestUsage(input_tokens=120, output_tokens=4))
+
+    result = await Agent(FunctionModel(reply)).run("Check the solution")
+    deps.add_agent_run("solution_creator", result, 250)
+    await deps.flush()
+
+    rows = await DefinitionMessage.filter(conversation_id=conversation.id).values("role", "tool_name", "content", "agent_name", "latency_ms", "input_tokens", "output_tokens")
+    assert rows == [
+        {
+            "role": ConversationRole.TOOL,
+            "tool_name": None,
+            "content": "Nothing to change.",
+            "agent_name": "solution_creator",
+            "latency_ms": 250,
+            "input_tokens": 120,
+            "output_tokens": 4,
+        },
+    ]
@@ -0,0 +1,97 @@
+import asyncio
+import uuid
+from datetime import UTC, datetime
+
+from cluedogpt_backend.models.postgres_models import Game, GameInitJob, JobStatus
+from cluedogpt_backend.services import game_init_jobs
+from cluedogpt_backend.services.game_init_jobs import GameInitJobQueue
+
+
+async def test_jobs_of_the_same_game_run_one_at_a_time_in_order(player, make_game, monkeypatch):
+    game = await make_game(player)
+    running: list[str] = []
+    started: list[str] = []
+
+    async def agents(deps, message, solution_outdated):
+        running.append(message)
+        started.append(message)
+        assert len(running) == 1
+        await asyncio.sleep(0.01)
+        running.remove(message)
+
+    monkeypatch.setattr(game_init_jobs, "run_game_creation_agents", agents)
+    queue = GameInitJobQueue()
+    await queue.start(worker_count=3)
+    try:
+        for message in ("first", "second", "third"):
+            queue.enqueue(await GameInitJob.create(game=game, message=message))
+        await queue.join()
+    finally:
+        await queue.stop()
+
+    assert started == ["first", "second", "third"]
+    assert set(await GameInitJob.all().values_list("status", flat=True)) == {JobStatus.DONE}
+
+
+async def test_a_failure_outside_the_agents_fails_the_job_and_keeps_the_worker(player, make_game, monkeypatch):
+    game = await make_game(player)
+    get = GameInitJob.get
+
+    def get_or_fail(*args, **kwargs):
+        if kwargs.get("id") == broken.id:
+            raise ConnectionError("database went away")
+        return get(*args, **kwargs)
+
+    async def agents(deps, message, solution_outdated):
+        pass
+
+    monkeypatch.setattr(GameInitJob, "get", get_or_fail)
+    monkeypatch.setattr(game_init_jobs, "run_game_creation_agents", agents)
+    queue = GameInitJobQueue()
+    await queue.start(worker_count=1)
+    try:
+        queue.enqueue(broken := await GameInitJob.create(game=game, message="broken"))
+        queue.enqueue(healthy := await GameInitJob.create(game=game, message="healthy"))
+        await queue.join()
+    finally:
+        await queue.stop()
+
+    broken = await GameInitJob.get_or_none(id=broken.id)
+    assert (broken.status, broken.error) == (JobStatus.FAILED, "database went away")
+    assert (await GameInitJob.get_or_none(id=healthy.id)).status == JobStatus.DONE
+
+
+async def test_a_job_of_a_game_running_elsewhere_is_put_back_in_the_queue(player, make_game, monkeypatch):
+    game = await make_game(player)
+    await GameInitJob.create(game=game, message="elsewhere", status=JobStatus.RUNNING, started_at=datetime.now(UTC), lease_id=uuid.uuid4())
+    waiting = await GameInitJob.create(game=game, message="waiting")
+
+    async def agents(deps, message, solution_outdated):
+        raise AssertionError("the job must not run")
+
+    monkeypatch.setattr(game_init_jobs, "run_game_creation_agents", agents)
+    monkeypatch.setattr(game_init_jobs, "GAME_LOCKED_RETRY_SECONDS", 0)
+    queue = GameInitJobQueue()
+
+    await queue._run(waiting.id, game.id)
+    await asyncio.sleep(0.01)
+
+    assert (await GameInitJob.get(id=waiting.id)).status == JobStatus.QUEUED
+    assert queue._queue.get_nowait() == (waiting.id, game.id)
+
+
+async def test_a_job_that_lost_its_lease_writes_nothing(player, make_game, monkeypatch):
+    game = await make_game(player, story="The original story.")
+    job = await GameInitJob.create(game=game, message="rewrite")
+
+    async def agents(deps, message, solution_outdated):
+        deps.update_game(story="A rewritten story.")
+        # Meanwhile the job was recovered and claimed by another worker
+        await GameInitJob.filter(id=job.id).update(lease_id=uuid.uuid4())
+
+    monkeypatch.setattr(game_init_jobs, "run_game_creation_agents", agents)
+
+    await GameInitJobQueue()._run(job.id, game.id)
+
+    assert (await Game.get(id=game.id)).story == "The original story."
+    assert (await GameInitJob.get(id=job.id)).status == JobStatus.RUNNING
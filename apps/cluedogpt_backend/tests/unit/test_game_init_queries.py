@@ -0,0 +1,54 @@
+import pytest
+from pydantic_ai.messages import ModelMessage, ModelRequest, ModelResponse, TextPart, ToolCallPart, ToolReturnPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from cluedogpt_backend.ai.registry import agent_registry
+from cluedogpt_backend.infrastructure.metrics import RequestQueryStats, request_query_stats
+from cluedogpt_backend.models.postgres_models import DefinitionMessage, GameInitJob, JobStatus
+from cluedogpt_backend.services.game_init_jobs import GameInitJobQueue
+from cluedogpt_backend.settings import settings
+
+
+STORY = "Lord Ashworth is found dead in the library of his manor on a stormy night."
+SOLUTION = {"culprit": "Mr. Green", "weapon": "the candlestick", "motive": "an unpaid debt"}
+
+
+def game_creation_model(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+    """Calls the agent's tool once, then closes the run with a short reply."""
+    last = messages[-1]
+    if isinstance(last, ModelRequest) and any(isinstance(part, ToolReturnPart) for part in last.parts):
+        return ModelResponse(parts=[TextPart("Done.")])
+
+    tool = info.function_tools[0].name
+    args = {"story": STORY} if tool == "create_story" else SOLUTION
+    return ModelResponse(parts=[ToolCallPart(tool, args)])
+
+
+@pytest.fixture
+def function_model(monkeypatch):
+    monkeypatch.setattr(settings(), "agent_cache_enabled", False)
+    agent_registry.use_model(FunctionModel(game_creation_model))
+    yield
+    agent_registry.use_model(None)
+
+
+async def test_one_game_init_iteration_issues_a_fixed_number_of_queries(player, make_game, function_model):
+    game = await make_game(player)
+    job = await GameInitJob.create(game=game, message="A murder in a manor")
+
+    stats = RequestQueryStats()
+    token = request_query_stats.set(stats)
+    try:
+        await GameInitJobQueue()._run(job.id, game.id)
+    finally:
+        request_query_stats.reset(token)
+
+    await job.refresh_from_db()
+    assert job.status == JobStatus.DONE
+    assert await DefinitionMessage.filter(conversation__game_id=game.id).count() == 4
+
+    # Claim the job: lock the game, look for a running job of the game and take the lease (3); load the job and its
+    # game (2); load the conversation (a select and, on the first iteration, an insert), its latest summary, its
+    # replayable messages and the next idx (5); check the lease (1); flush: save the game, lock the conversation,
+    # read the next idx and insert the messages (4); mark the job done (1)
+    assert stats.count == 16
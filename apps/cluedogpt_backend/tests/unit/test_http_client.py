@@ -0,0 +1,35 @@
+import httpx
+
+from cluedogpt_backend.ai import registry
+from cluedogpt_backend.ai.registry import AgentRegistry
+from cluedogpt_backend.infrastructure.http_client import provider_http_client
+from cluedogpt_backend.settings import settings
+
+
+async def test_the_provider_model_is_rebuilt_on_a_new_client_after_close(monkeypatch):
+    built = []
+    monkeypatch.setattr(registry, "_build_provider_model", lambda http_client: built.append(http_client) or http_client)
+    agents = AgentRegistry()
+
+    first = agents.model()
+    assert agents.model() is first
+
+    await provider_http_client.close()
+    second = agents.model()
+
+    assert first.is_closed
+    assert not second.is_closed
+    assert built == [first, second]
+    await provider_http_client.close()
+
+
+async def test_pool_stats_fall_back_to_the_limits_when_the_pool_cannot_be_read(monkeypatch):
+    monkeypatch.setattr(settings(), "ai_http_max_connections", 7)
+    client = provider_http_client.get()
+    # A transport without an httpcore pool, as after an httpx upgrade renaming it
+    monkeypatch.setattr(client, "_transport", httpx.MockTransport(lambda request: httpx.Response(200)))
+
+    stats = provider_http_client.pool_stats()
+
+    assert (stats.max_connections, stats.idle, stats.active) == (7, 0, 0)
+    await provider_http_client.close()
@@ -0,0 +1,68 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+
+# Records every pydantic-ai agent and httpx client constructed while the app module is imported
+IMPORT_PROBE = textwrap.dedent(
+    """
+    import json
+    import sys
+
+    import httpx
+    import pydantic_ai
+
+    built = []
+
+    def recording(cls):
+        init = cls.__init__
+
+        def __init__(self, *args, **kwargs):
+            built.append(cls.__name__)
+            init(self, *args, **kwargs)
+
+        cls.__init__ = __init__
+
+    recording(pydantic_ai.Agent)
+    recording(httpx.AsyncClient)
+
+    import cluedogpt_backend.api.main
+    from cluedogpt_backend.ai.registry import agent_registry
+    from cluedogpt_backend.infrastructure.http_client import provider_http_client
+
+    print(json.dumps({
+        "built": built,
+        "model": agent_registry._model is not None,
+        "http_client": provider_http_client._client is not None,
+        "openai": "openai" in sys.modules,
+    }))
+    """,
+)
+
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+PYTHONPATH = os.pathsep.join([APP_DIR, os.path.join(APP_DIR, "cluedogpt_backend")])
+
+
+def test_importing_the_app_builds_no_agent_or_provider_client():
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE],
+        cwd=APP_DIR,
+        env={**os.environ, "PYTHONPATH": PYTHONPATH},
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=True,
+    )
+
+    assert json.loads(result.stdout.splitlines()[-1]) == {"built": [], "model": False, "http_client": False, "openai": False}
+
+
+def test_the_app_and_the_tortoise_config_import_without_the_environment():
+    # Tooling such as aerich imports these modules before any setting is in place
+    code = "import cluedogpt_backend.api.main, cluedogpt_backend.infrastructure.postgres_db"
+    result = subprocess.run([sys.executable, "-c", code], cwd=APP_DIR, env={"PYTHONPATH": PYTHONPATH}, capture_output=True, text=True, timeout=60, check=False)
+
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,27 @@
+from cluedogpt_backend.auth.jwt_auth import create_access_token, verified_token_cache, verify_token
+from cluedogpt_backend.dto.user import UserJwt
+from cluedogpt_backend.settings import settings
+
+
+USER = UserJwt(user_id="1d7a4c1e-3f5b-4a36-9f0e-5d5b2c1f7a10", name="Alice")
+
+
+def test_signing_key_changes_apply_without_a_restart(monkeypatch):
+    token, _ = create_access_token(USER)
+    assert verify_token(token)["user_id"] == USER.user_id
+
+    monkeypatch.setattr(settings(), "jwt_secret_key", "another-secret-key-that-is-long-enough-for-hs256")
+
+    # The payload cached under the old key is not served for the new one
+    assert verify_token(token) is None
+    assert verify_token(create_access_token(USER)[0])["user_id"] == USER.user_id
+
+
+def test_cache_size_is_read_on_use(monkeypatch):
+    verified_token_cache.clear()
+    monkeypatch.setattr(settings(), "jwt_verified_token_cache_size", 0)
+
+    verify_token(create_access_token(USER)[0])
+
+    assert verified_token_cache.max_entries == 0
+    assert len(verified_token_cache) == 0
@@ -0,0 +1,42 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from cluedogpt_backend.models.postgres_models import Game, Player
+from cluedogpt_backend.services.listing_service import ListingService
+
+
+@pytest.fixture
+async def games(player, make_game):
+    """Games the player owns, joined, or both, interleaved in time; some share a created_at across page boundaries."""
+    other = await Player.create(name="Bob")
+    start = datetime(2026, 1, 1, tzinfo=UTC)
+    created = []
+
+    for i, (owner, joined, minutes) in enumerate(
+        [(player, False, 0), (other, True, 1), (player, True, 1), (other, True, 2), (player, False, 3), (other, False, 3), (other, True, 3), (player, False, 4)]
+    ):
+        game = await make_game(owner, name=f"Game {i}")
+        await Game.filter(id=game.id).update(created_at=start + timedelta(minutes=minutes))
+        if joined:
+            await game.players.add(player)
+        if owner == player or joined:
+            created.append(await Game.get(id=game.id))
+
+    return sorted(created, key=lambda game: (game.created_at, game.id), reverse=True)
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 7, 8])
+async def test_pages_of_owned_and_joined_games_cover_every_game_once(player, games, limit):
+    service = ListingService()
+    listed, cursor = [], None
+
+    while True:
+        page = await service.list_games(str(player.id), limit, cursor)
+        assert len(page.items) <= limit
+        listed.extend(page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert [game.id for game in listed] == [game.id for game in games]
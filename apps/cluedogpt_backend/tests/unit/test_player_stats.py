@@ -0,0 +1,29 @@
+import asyncio
+
+from cluedogpt_backend.api.api_contracts.requests.proposal_requests import ProposalRequest
+from cluedogpt_backend.models.postgres_models import PlayerStats
+from cluedogpt_backend.services.game_question_service import GameQuestionService
+from cluedogpt_backend.services.proposal_service import ProposalService
+
+
+SOLUTION = {"culprit": "Mr. Green", "weapon": "the candlestick", "motive": "an unpaid debt"}
+
+
+async def test_concurrent_first_questions_count_the_game_once(player, make_game):
+    game = await make_game(player, story="A storm over the manor.", **SOLUTION)
+    service = GameQuestionService()
+
+    await asyncio.gather(*(service.ask_question(str(game.id), str(player.id), f"Question {i}?") for i in range(3)))
+
+    stats = await PlayerStats.get(player_id=player.id)
+    assert (stats.games_played, stats.questions_count) == (1, 3)
+
+
+async def test_concurrent_solving_proposals_count_the_game_once(player, make_game):
+    game = await make_game(player, story="A storm over the manor.", **SOLUTION)
+    service = ProposalService()
+
+    await asyncio.gather(*(service.submit(str(game.id), str(player.id), ProposalRequest(**SOLUTION)) for _ in range(2)))
+
+    stats = await PlayerStats.get(player_id=player.id)
+    assert (stats.games_played, stats.games_solved, stats.proposals_count, stats.correct_total) == (1, 1, 2, 6)
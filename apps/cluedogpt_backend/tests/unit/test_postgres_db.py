@@ -0,0 +1,54 @@
+import inspect
+
+import asyncpg
+import pytest
+
+from cluedogpt_backend.infrastructure.postgres_db import asyncpg_connect_kwargs, build_tortoise_config
+from cluedogpt_backend.settings import settings
+
+
+@pytest.fixture
+def dsn(monkeypatch):
+    def use(value: str) -> None:
+        monkeypatch.setattr(settings(), "postgres_dsn", value)
+
+    return use
+
+
+def test_postgres_dsn_keeps_query_parameters(dsn):
+    dsn("postgres://user:p%40ss@db:6543/cluedogpt?sslmode=require&application_name=api&options=-c%20statement_timeout%3D5000&maxsize=4")
+
+    connection = build_tortoise_config()["connections"]["default"]
+    credentials = connection["credentials"]
+
+    assert connection["engine"] == "tortoise.backends.asyncpg"
+    assert (credentials["host"], credentials["port"], credentials["database"], credentials["user"], credentials["password"]) == ("db", 6543, "cluedogpt", "user", "p@ss")
+    assert credentials["ssl"] == "require"
+    assert credentials["application_name"] == "api"
+    assert credentials["server_settings"] == {"statement_timeout": "5000"}
+    # The DSN wins over Settings, which fill in the rest
+    assert credentials["maxsize"] == "4"
+    assert credentials["minsize"] == settings().postgres_min_pool_size
+    assert credentials["statement_cache_size"] == settings().postgres_statement_cache_size
+
+
+def test_other_dialects_are_passed_through(dsn):
+    dsn("sqlite://:memory:")
+
+    connection = build_tortoise_config()["connections"]["default"]
+
+    assert connection["engine"] == "tortoise.backends.sqlite"
+    assert connection["credentials"]["file_path"] == ":memory:"
+    assert "minsize" not in connection["credentials"]
+
+
+def test_asyncpg_connect_kwargs_drop_pool_parameters(dsn):
+    dsn("asyncpg://user:secret@db:6543/cluedogpt?maxsize=4&minsize=2&application_name=api&schema=game&options=-c%20statement_timeout%3D5000")
+
+    kwargs = asyncpg_connect_kwargs()
+
+    # asyncpg.connect takes no **kwargs, so anything it does not know would fail here rather than at the server
+    inspect.signature(asyncpg.connect).bind(**kwargs)
+    assert (kwargs["host"], kwargs["port"], kwargs["database"], kwargs["user"], kwargs["password"]) == ("db", 6543, "cluedogpt", "user", "secret")
+    assert kwargs["server_settings"] == {"statement_timeout": "5000", "search_path": "game", "application_name": "api"}
+    assert kwargs["statement_cache_size"] == settings().postgres_statement_cache_size
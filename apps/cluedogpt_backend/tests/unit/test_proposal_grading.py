@@ -0,0 +1,44 @@
+import pytest
+
+from cluedogpt_backend.services.proposal_grading import Verdict, grade_field
+
+
+@pytest.mark.parametrize(
+    ("guess", "solution"),
+    [
+        ("colonel mustard", "Colonel Mustard"),
+        ("mustard, colonel", "Colonel Mustard"),
+        ("colonel mustrad", "Colonel Mustard"),
+        ("dr ramon saenz", "Dr. Ramón Sáenz"),
+        ("the kitchen knife", "Kitchen knife"),
+        ("revenge for her father", "Revenge for her father's ruin"),
+    ],
+)
+def test_close_guesses_are_accepted(guess, solution):
+    assert grade_field(guess, solution).verdict == Verdict.CORRECT
+
+
+@pytest.mark.parametrize(
+    ("guess", "solution"),
+    [
+        ("mr", "Mr. Green"),
+        ("professor", "Professor Plum"),
+        ("Lady", "Lady Ashworth"),
+        ("money", "To pay off his gambling debts before the money ran out"),
+        ("brother", "Jealousy of his brother's success"),
+        ("mr green or professor plum", "Mr. Green"),
+    ],
+)
+def test_guesses_sharing_only_some_words_are_not_accepted(guess, solution):
+    assert grade_field(guess, solution).verdict != Verdict.CORRECT
+
+
+@pytest.mark.parametrize(
+    ("guess", "solution"),
+    [
+        ("Colonel Mustard", "Mrs. Peacock"),
+        ("rope", "Candlestick"),
+    ],
+)
+def test_unrelated_guesses_are_rejected(guess, solution):
+    assert grade_field(guess, solution).verdict == Verdict.INCORRECT
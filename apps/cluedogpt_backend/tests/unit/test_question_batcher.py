@@ -0,0 +1,36 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from cluedogpt_backend.infrastructure.admission import llm_limiter
+from cluedogpt_backend.models.postgres_models import GameQuestion, QAStatus
+from cluedogpt_backend.services import question_batcher
+from cluedogpt_backend.services.question_batcher import QuestionBatcher
+from cluedogpt_backend.settings import settings
+
+
+async def test_a_batch_of_questions_takes_one_model_slot(player, make_game, monkeypatch):
+    game = await make_game(player, story="A storm over the manor.", culprit="Mr. Green", weapon="the candlestick", motive="an unpaid debt")
+    questions = [await GameQuestion.create(game=game, player=player, question_text=f"Question {i}?") for i in range(3)]
+    slots = 0
+    slot = llm_limiter.slot
+
+    @asynccontextmanager
+    async def counted_slot(*args, **kwargs):
+        nonlocal slots
+        slots += 1
+        async with slot(*args, **kwargs):
+            yield
+
+    async def answer(game, texts):
+        return [f"Answer to {text}" for text in texts]
+
+    monkeypatch.setattr(llm_limiter, "slot", counted_slot)
+    monkeypatch.setattr(question_batcher, "answer_game_master_questions", answer)
+    monkeypatch.setattr(settings(), "question_batch_window_ms", 50)
+
+    batcher = QuestionBatcher()
+    answers = await asyncio.gather(*(batcher.answer(game, question) for question in questions))
+
+    assert answers == [f"Answer to Question {i}?" for i in range(3)]
+    assert slots == 1
+    assert set(await GameQuestion.filter(game_id=game.id).values_list("status", flat=True)) == {QAStatus.ANSWERED}
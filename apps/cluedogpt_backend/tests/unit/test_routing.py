@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+from pydantic_ai import Agent
+from pydantic_ai.exceptions import ModelHTTPError
+from pydantic_ai.messages import ModelMessage, ModelResponse, TextPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from cluedogpt_backend.ai.routing import CircuitBreaker, CircuitState, ProviderRoute, RoutedModel
+from cluedogpt_backend.settings import settings
+
+
+class FakeProvider:
+    """A FunctionModel provider that answers with its name, or fails, after `delay` seconds; counts its calls and cancellations."""
+
+    def __init__(self, name: str, delay: float = 0.0, status_code: int | None = None) -> None:
+        self.name = name
+        self.delay = delay
+        self.status_code = status_code
+        self.calls = 0
+        self.cancelled = 0
+
+    async def respond(self, messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+        if self.status_code is not None:
+            raise ModelHTTPError(self.status_code, self.name)
+        return ModelResponse(parts=[TextPart(self.name)])
+
+    def route(self) -> ProviderRoute:
+        return ProviderRoute(self.name, FunctionModel(self.respond, model_name=self.name))
+
+
+@pytest.fixture(autouse=True)
+def routing_settings(monkeypatch):
+    monkeypatch.setattr(settings(), "ai_circuit_min_calls", 2)
+    monkeypatch.setattr(settings(), "ai_circuit_failure_rate", 0.5)
+    monkeypatch.setattr(settings(), "ai_circuit_open_seconds", 60)
+    monkeypatch.setattr(settings(), "ai_hedge_enabled", False)
+
+
+async def ask(model: RoutedModel) -> str:
+    return (await Agent(model).run("Who did it?")).output
+
+
+async def test_a_failing_provider_fails_over_to_the_next_one():
+    primary, fallback = FakeProvider("primary", status_code=503), FakeProvider("fallback")
+
+    assert await ask(RoutedModel([primary.route(), fallback.route()])) == "fallback"
+    assert (primary.calls, fallback.calls) == (1, 1)
+
+
+async def test_client_errors_are_not_failed_over():
+    primary, fallback = FakeProvider("primary", status_code=400), FakeProvider("fallback")
+
+    with pytest.raises(ModelHTTPError):
+        await ask(RoutedModel([primary.route(), fallback.route()]))
+    assert fallback.calls == 0
+
+
+async def test_the_circuit_opens_and_skips_the_failing_provider():
+    primary, fallback = FakeProvider("primary", status_code=503), FakeProvider("fallback")
+    model = RoutedModel([primary.route(), fallback.route()])
+
+    for _ in range(2):
+        await ask(model)
+    assert model.routes[0].breaker.state == CircuitState.OPEN
+
+    assert await ask(model) == "fallback"
+    assert primary.calls == 2
+
+
+def test_an_open_circuit_lets_one_trial_call_through_after_open_seconds(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("cluedogpt_backend.ai.routing.time.monotonic", lambda: now)
+    breaker = CircuitBreaker("primary", window=10, min_calls=2, failure_rate=0.5, slow_call_seconds=60, open_seconds=30)
+
+    breaker.record(breaker.allow(), ok=False)
+    breaker.record(breaker.allow(), ok=False)
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.allow() is None
+
+    now += 30
+    trial = breaker.allow()
+    assert trial is not None
+    assert breaker.state == CircuitState.HALF_OPEN
+    # Only one trial call at a time
+    assert breaker.allow() is None
+
+    breaker.record(trial, ok=False)
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.allow() is None
+
+    now += 30
+    breaker.record(breaker.allow(), ok=True, seconds=1)
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow() is not None
+
+
+def test_only_the_trial_call_decides_or_releases_the_half_open_circuit(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("cluedogpt_backend.ai.routing.time.monotonic", lambda: now)
+    breaker = CircuitBreaker("primary", window=10, min_calls=2, failure_rate=0.5, slow_call_seconds=60, open_seconds=30)
+
+    # A call sent while the circuit was still closed
+    late = breaker.allow()
+    breaker.record(breaker.allow(), ok=False)
+    breaker.record(breaker.allow(), ok=False)
+
+    now += 30
+    trial = breaker.allow()
+    breaker.release(late)
+    breaker.record(late, ok=True, seconds=1)
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow() is None
+
+    breaker.release(trial)
+    assert breaker.allow() is not None
+
+
+async def test_a_slow_call_is_hedged_and_the_loser_is_cancelled(monkeypatch):
+    monkeypatch.setattr(settings(), "ai_hedge_enabled", True)
+    monkeypatch.setattr(settings(), "ai_hedge_min_delay_seconds", 0.05)
+    monkeypatch.setattr(settings(), "ai_hedge_max_delay_seconds", 0.05)
+    primary, fallback = FakeProvider("primary", delay=5), FakeProvider("fallback", delay=0.01)
+    model = RoutedModel([primary.route(), fallback.route()])
+
+    assert await asyncio.wait_for(ask(model), timeout=2) == "fallback"
+    assert (primary.calls, primary.cancelled) == (1, 1)
+    # The cancelled call has no outcome, so it does not count against the provider
+    assert model.routes[0].breaker.state == CircuitState.CLOSED
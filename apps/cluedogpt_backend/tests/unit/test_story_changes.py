@@ -0,0 +1,57 @@
+from cluedogpt_backend.ai.deps import GameAgentDeps
+from cluedogpt_backend.models.postgres_models import Game
+from cluedogpt_backend.services.story_changes import StoryChange, detect_story_change, record_solution_story, solution_outdated, solution_story_fields
+
+
+SOLUTION = {"culprit": "Mr. Green", "weapon": "the candlestick", "motive": "an unpaid debt"}
+STORY = " ".join(f"clue{i}" for i in range(60)) + " Mr. Green struck with the candlestick over an unpaid debt."
+
+
+def _edit(story: str, step: int) -> str:
+    # Reword two words per iteration, never the same ones twice
+    words = story.split()
+    for position in (step * 2, step * 2 + 30):
+        words[position] = f"reworded{step}"
+    return " ".join(words)
+
+
+async def test_unchanged_story_keeps_the_solution(db):
+    game = Game(story=f"  {STORY}\n", **SOLUTION, **solution_story_fields(STORY))
+
+    assert detect_story_change(STORY, game) == (StoryChange.UNCHANGED, 0.0)
+
+
+async def test_small_edits_add_up_to_a_rewrite(db):
+    deps = GameAgentDeps(game=Game(story=STORY, **SOLUTION, **solution_story_fields(STORY)))
+
+    outdated = []
+    for step in range(10):
+        previous_story = deps.game.story
+        deps.game.story = _edit(previous_story, step)
+        # Each edit on its own is small...
+        assert detect_story_change(previous_story, Game(story=deps.game.story, **SOLUTION))[0] is StoryChange.MINOR_EDIT
+        outdated.append(solution_outdated(previous_story, deps))
+
+    # ...but together they rewrite the story the solution was written for
+    assert outdated[0] is False
+    assert outdated[-1] is True
+    assert deps.game.solution_story_drift > 0
+
+
+async def test_a_new_solution_resets_the_drift(db):
+    deps = GameAgentDeps(game=Game(story=STORY, **SOLUTION, solution_story_drift=0.5))
+
+    record_solution_story(deps)
+    assert deps.game.solution_story_drift == 0.5
+
+    deps.update_game(culprit="Mrs. Peacock")
+    record_solution_story(deps)
+    assert deps.game.solution_story_drift == 0.0
+    assert detect_story_change(STORY, deps.game)[0] is StoryChange.UNCHANGED
+
+
+async def test_games_without_a_fingerprint_compare_with_the_previous_story(db):
+    game = Game(story=_edit(STORY, 0), **SOLUTION)
+
+    assert detect_story_change(STORY, game)[0] is StoryChange.MINOR_EDIT
+    assert detect_story_change("A different story altogether.", game)[0] is StoryChange.REWRITTEN
@@ -0,0 +1,62 @@
+from datetime import UTC, datetime, timedelta
+
+from cluedogpt_backend.models.postgres_models import Game, WarmGame
+from cluedogpt_backend.services import warm_pool
+from cluedogpt_backend.services.warm_pool import WarmPoolProducer, claim_warm_game
+from cluedogpt_backend.settings import settings
+
+
+SOLUTION = {"culprit": "Mr. Green", "weapon": "the candlestick", "motive": "an unpaid debt"}
+
+
+async def test_claim_skips_entries_without_a_story(player, db):
+    await WarmGame.create(language="english", locale="us", story="", **SOLUTION)
+    await WarmGame.create(language="english", locale="us", story="A storm over the manor.", **SOLUTION)
+
+    game = await claim_warm_game("english", "us", name="Warm", owner_id=player.id, expiry_date=player.created_at)
+
+    assert game.story == "A storm over the manor."
+    assert await WarmGame.filter(story="").count() == 1
+
+
+async def test_refill_discards_an_incomplete_generation(db, monkeypatch):
+    async def generate(language, locale):
+        return Game(language=language, locale=locale, story="A storm over the manor.", culprit="Mr. Green")
+
+    monkeypatch.setattr(warm_pool, "generate_warm_game", generate)
+    monkeypatch.setattr(settings(), "warm_pool_size", 1)
+
+    await WarmPoolProducer()._refill_one()
+
+    assert await WarmGame.all().count() == 0
+
+
+async def test_refill_keeps_a_complete_generation(db, monkeypatch):
+    async def generate(language, locale):
+        return Game(language=language, locale=locale, story="A storm over the manor.", **SOLUTION)
+
+    monkeypatch.setattr(warm_pool, "generate_warm_game", generate)
+    monkeypatch.setattr(settings(), "warm_pool_size", 1)
+
+    await WarmPoolProducer()._refill_one()
+
+    assert await WarmGame.all().values_list("culprit", flat=True) == ["Mr. Green"]
+
+
+async def test_reservations_count_towards_the_pool_size_until_stale(db, monkeypatch):
+    async def generate(language, locale):
+        return Game(language=language, locale=locale, story="A storm over the manor.", **SOLUTION)
+
+    monkeypatch.setattr(warm_pool, "generate_warm_game", generate)
+    monkeypatch.setattr(settings(), "warm_pool_size", 1)
+    # Another replica is generating the only entry the pool may hold
+    reservation = await WarmGame.create(language="english", locale="us", story="", culprit="", weapon="", motive="")
+
+    await WarmPoolProducer()._refill_one()
+    assert await WarmGame.all().count() == 1
+
+    # That replica stopped before filling it in
+    await WarmGame.filter(id=reservation.id).update(created_at=datetime.now(UTC) - timedelta(seconds=warm_pool.RESERVATION_STALE_SECONDS + 1))
+
+    await WarmPoolProducer()._refill_one()
+    assert await WarmGame.all().values_list("story", flat=True) == ["A storm over the manor."]